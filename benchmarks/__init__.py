@@ -0,0 +1,8 @@
+"""
+Performance benchmarks for prompt-ast.
+
+    python -m benchmarks run --output baseline.json
+    python -m benchmarks compare baseline.json --threshold 0.15
+
+Standalone micro-benchmarks live next to the suite (``bench_*.py``).
+"""
@@ -0,0 +1,61 @@
+"""
+Ambiguity detection cost as the rule registry grows.
+
+Synthetic rules that never fire are appended to `AMBIGUITY_RULES`; with the
+token index the per-prompt cost should stay flat as the registry grows.
+
+    python benchmarks/bench_ambiguities.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prompt_ast.parse import heuristic  # noqa: E402
+from tests.fixtures import FIXTURES  # noqa: E402
+
+RULE_COUNTS = [0, 100, 1_000, 10_000]
+
+
+def _synthetic_rules(count: int) -> tuple[heuristic.AmbiguityRule, ...]:
+    return tuple(
+        heuristic.AmbiguityRule(
+            message=f"Synthetic rule {i}",
+            triggers=((f"term{i}a", f"term{i}b"), (f"term{i}c",)),
+            suppressors=(f"term{i}d",),
+        )
+        for i in range(count)
+    )
+
+
+def main() -> None:
+    asts = [heuristic.parse_prompt_heuristic(f["prompt"]) for f in FIXTURES]
+    base_rules = heuristic.AMBIGUITY_RULES
+    print(f"{'rules':>8} {'us/prompt':>12}")
+    try:
+        for count in RULE_COUNTS:
+            rules = base_rules + _synthetic_rules(count)
+            heuristic.AMBIGUITY_RULES = rules
+            heuristic._AMBIGUITY_INDEX = heuristic._index_ambiguity_rules(rules)
+            heuristic._MAX_TERM_CHARS = max(map(len, heuristic._AMBIGUITY_INDEX))
+            heuristic._token_refs.cache_clear()
+            rounds = 200
+            start = time.perf_counter()
+            for _ in range(rounds):
+                for ast in asts:
+                    heuristic._infer_ambiguities(ast.raw, ast)
+            per_prompt = (time.perf_counter() - start) / (rounds * len(asts))
+            print(f"{len(rules):>8} {per_prompt * 1e6:>12.2f}")
+    finally:
+        heuristic.AMBIGUITY_RULES = base_rules
+        heuristic._AMBIGUITY_INDEX = heuristic._index_ambiguity_rules(base_rules)
+        heuristic._MAX_TERM_CHARS = max(map(len, heuristic._AMBIGUITY_INDEX))
+        heuristic._token_refs.cache_clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Throughput of heuristic constraint inference as prompt length grows.
+
+Run from the repository root:
+
+    python benchmarks/bench_constraints.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prompt_ast.parse.heuristic import _infer_constraints  # noqa: E402
+from tests.fixtures import FIXTURES  # noqa: E402
+
+SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+FILLER = (
+    "The quarterly review covered revenue, hiring, and the roadmap for the "
+    "platform team. "
+)
+
+
+def _corpus(size: int, dense: bool) -> str:
+    """Fixture prompts (dense: many rule hits) or plain prose (sparse) of ~size chars."""
+    seed = "\n".join(f["prompt"] for f in FIXTURES) if dense else FILLER
+    return (seed * (size // len(seed) + 1))[:size]
+
+
+def _time_per_call(text: str, budget: float = 0.5) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        _infer_constraints(text)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= budget:
+            return elapsed / calls
+
+
+def main() -> None:
+    print(f"{'corpus':<8} {'chars':>10} {'us/call':>12} {'MB/s':>10}")
+    for dense in (False, True):
+        for size in SIZES:
+            text = _corpus(size, dense)
+            per_call = _time_per_call(text)
+            mb_s = len(text) / per_call / 1e6
+            label = "dense" if dense else "sparse"
+            print(f"{label:<8} {size:>10} {per_call * 1e6:>12.1f} {mb_s:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Per-helper cost of the heuristic parser over the golden fixtures.
+
+Besides the fixture prompts themselves, a large multi-section prompt (the
+fixtures joined together) exercises the per-line paths.
+
+    python -m benchmarks.bench_heuristic_stages
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Callable
+
+from prompt_ast.parse import heuristic as h
+from tests.fixtures import FIXTURES
+
+PROMPTS = [f["prompt"].strip() for f in FIXTURES]
+LARGE = "\n".join(PROMPTS * 25)
+
+
+def _per_call_us(fn: Callable[[str], object], texts: list[str], budget: float) -> float:
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < budget:
+        for text in texts:
+            fn(text)
+        calls += len(texts)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def main(budget: float = 0.5) -> None:
+    asts = {p: h.parse_prompt_heuristic(p) for p in PROMPTS + [LARGE]}
+    stages: list[tuple[str, Callable[[str], object]]] = [
+        ("_infer_role", h._infer_role),
+        ("_split_labeled_sections", h._split_labeled_sections),
+        ("_infer_task", h._infer_task),
+        ("_lines_to_items", h._lines_to_items),
+        ("_infer_output_format", lambda t: h._infer_output_format(t.lower())),
+        ("_infer_constraints", h._infer_constraints),
+        ("_extract_output_structure", h._extract_output_structure),
+        ("_infer_ambiguities", lambda t: h._infer_ambiguities(t, asts[t])),
+        ("parse_prompt_heuristic", h.parse_prompt_heuristic),
+    ]
+    print(f"{'stage':<28} {'fixtures us':>12} {'large us':>12}")
+    for name, fn in stages:
+        small = _per_call_us(fn, PROMPTS, budget)
+        large = _per_call_us(fn, [LARGE], budget)
+        print(f"{name:<28} {small:>12.2f} {large:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Memory per AST and construction time: PromptASTLite vs the pydantic PromptAST.
+
+Run from the repository root:
+
+    python benchmarks/bench_lite.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prompt_ast import PromptAST, PromptASTLite  # noqa: E402
+from prompt_ast.parse import (  # noqa: E402
+    parse_prompt_heuristic,
+    parse_prompt_heuristic_lite,
+)
+from tests.fixtures import FIXTURES  # noqa: E402
+
+COUNT = 20_000
+# Distinct raw strings, as in a real corpus, so nothing is shared by accident
+PROMPTS = [f"{f['prompt']} #{i}" for i in range(COUNT // len(FIXTURES)) for f in FIXTURES]
+
+
+def _measure(parse: Callable[[str], object]) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = [parse(p) for p in PROMPTS]
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return elapsed / len(PROMPTS), current / len(PROMPTS)
+
+
+def main() -> None:
+    print(f"{'representation':<16} {'us/parse':>10} {'bytes/AST':>10}")
+    for label, parse in (
+        ("PromptAST", parse_prompt_heuristic),
+        ("PromptASTLite", parse_prompt_heuristic_lite),
+    ):
+        per_parse, per_ast = _measure(parse)
+        print(f"{label:<16} {per_parse * 1e6:>10.1f} {per_ast:>10.0f}")
+
+    # Construction alone, from already-extracted fields
+    lite = parse_prompt_heuristic_lite(PROMPTS[0])
+    lite_fields = {name: getattr(lite, name) for name in PromptASTLite.__slots__}
+    ast_fields = lite.to_ast().to_dict()
+    for label, build in (
+        ("PromptAST", lambda: PromptAST(**ast_fields)),
+        ("PromptASTLite", lambda: PromptASTLite(**lite_fields)),
+    ):
+        start = time.perf_counter()
+        for _ in range(COUNT):
+            build()
+        elapsed = (time.perf_counter() - start) / COUNT
+        print(f"{label:<16} {elapsed * 1e6:>10.2f} us/construct")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Tail latency of one backend vs a hedged `LLMRouter` over two backends.
+
+Each simulated backend answers in ~`BASE_MS` but spikes to `SPIKE_MS` on a
+`SPIKE_RATE` share of requests, like a gateway with tail spikes. Run from the
+repository root:
+
+    python benchmarks/bench_router.py
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prompt_ast.llm.router import LLMRouter  # noqa: E402
+
+REQUESTS = 400
+BASE_MS = 20.0
+SPIKE_MS = 400.0
+SPIKE_RATE = 0.04
+REPLY = json.dumps({"role": None, "task": "Summarize", "constraints": []})
+
+
+class SpikyLLM:
+    def __init__(self, seed: int):
+        self.random = random.Random(seed)
+
+    def complete(self, prompt: str) -> str:
+        spike = self.random.random() < SPIKE_RATE
+        time.sleep((SPIKE_MS if spike else BASE_MS * self.random.uniform(0.8, 1.2)) / 1000)
+        return REPLY
+
+
+def _percentiles(llm: object) -> tuple[float, float, float]:
+    latencies = []
+    for _ in range(REQUESTS):
+        start = time.perf_counter()
+        llm.complete("prompt")  # type: ignore[attr-defined]
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return tuple(latencies[int(q * len(latencies))] for q in (0.5, 0.95, 0.99))  # type: ignore[return-value]
+
+
+def main() -> None:
+    print(f"{'client':<16} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'hedged':>7}")
+    p50, p95, p99 = _percentiles(SpikyLLM(1))
+    print(f"{'single backend':<16} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {'-':>7}")
+    with LLMRouter([SpikyLLM(2), SpikyLLM(3)], initial_hedge_delay=BASE_MS * 2 / 1000) as router:
+        p50, p95, p99 = _percentiles(router)
+        hedged = router.stats()["hedged"]
+    print(f"{'hedged router':<16} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {hedged:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Load generator for `prompt-ast serve`: per-request latency of a warm server
+against the cost of one CLI invocation.
+
+Run from the repository root:
+
+    python benchmarks/bench_serve.py [--clients 8] [--requests 500] [--workers 8]
+
+Starts an in-process server on a free port unless `--url` points at a running one.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import threading
+import time
+from http.client import HTTPConnection
+from pathlib import Path
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prompt_ast.server import create_server  # noqa: E402
+
+PROMPTS = [
+    "Act as a CTO. Be concise. Explain risks of migrating MySQL to RDS.",
+    "Context: Internal API.\nTask: Review the auth flow.\nConstraints:\n- Be concise",
+    "Write a blog post about remote work with sections: Intro, Tips, Summary. Use markdown.",
+    "You are a data analyst. Build a dashboard for churn. Return JSON.",
+]
+
+
+def _client(host: str, port: int, count: int, offset: int, latencies: list[float]) -> None:
+    conn = HTTPConnection(host, port, timeout=30)
+    headers = {"Content-Type": "application/json"}
+    for i in range(count):
+        # Distinct prompts so the parse cache does not answer every request
+        prompt = f"{PROMPTS[i % len(PROMPTS)]} (request {offset + i})"
+        body = json.dumps({"prompt": prompt})
+        start = time.perf_counter()
+        conn.request("POST", "/parse", body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+    conn.close()
+
+
+def _cli_seconds() -> float:
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "prompt_ast.cli", "normalize", PROMPTS[0], "--format", "compact"],
+        check=True,
+        capture_output=True,
+    )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=500, help="per client")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--url", help="benchmark a running server instead")
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        parts = urlsplit(args.url)
+        host, port = parts.hostname or "127.0.0.1", parts.port or 80
+    else:
+        server = create_server("127.0.0.1", 0, workers=args.workers)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address[:2]
+
+    latencies: list[float] = []
+    threads = [
+        threading.Thread(
+            target=_client, args=(host, port, args.requests, n * args.requests, latencies)
+        )
+        for n in range(args.clients)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{args.clients} clients x {args.requests} requests in {elapsed:.2f}s")
+    print(f"throughput: {total / elapsed:,.0f} req/s")
+    for label, q in (("p50", 0.5), ("p90", 0.9), ("p99", 0.99)):
+        print(f"{label}: {latencies[min(total - 1, int(q * total))] * 1000:.2f} ms")
+    print(f"one CLI invocation: {_cli_seconds() * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Peak memory and throughput of streaming vs whole-string heuristic parsing.
+
+Run from the repository root:
+
+    python benchmarks/bench_stream.py
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterator
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from prompt_ast.parse import parse_prompt_heuristic, parse_prompt_stream  # noqa: E402
+
+SIZES_MB = [1, 5, 20]
+FILLER = (
+    "The quarterly review covered revenue, hiring, and the roadmap for the\n"
+    "platform team. Keep it concise and use bullet points for the risks.\n"
+)
+
+
+def _lines(size: int) -> Iterator[str]:
+    """~size chars of prose, one line at a time, as read from a file."""
+    lines = FILLER.splitlines(keepends=True)
+    for _ in range(size // len(FILLER) + 1):
+        yield from lines
+
+
+def _measure(parse: Callable[[], object]) -> tuple[float, float]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    parse()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    print(f"{'MB':>4} {'mode':<10} {'seconds':>8} {'peak MB':>9}")
+    for size_mb in SIZES_MB:
+        size = size_mb * 2**20
+        seconds, peak = _measure(lambda: parse_prompt_stream(_lines(size)))
+        print(f"{size_mb:>4} {'stream':<10} {seconds:>8.2f} {peak:>9.1f}")
+        # The whole-string parser also needs the joined prompt in memory
+        seconds, peak = _measure(lambda: parse_prompt_heuristic("".join(_lines(size))))
+        print(f"{size_mb:>4} {'heuristic':<10} {seconds:>8.2f} {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
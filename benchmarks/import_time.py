@@ -0,0 +1,118 @@
+"""
+Cold-start import cost of common entry points, measured with `python -X importtime`.
+
+Run from the repository root:
+
+    python -m benchmarks.import_time
+
+Each scenario runs in a fresh interpreter. The reported time is the cumulative
+import time of the modules the statement loads on top of a bare interpreter.
+`tests/test_import_time.py` checks that no scenario loads its `forbidden`
+modules (via `loaded_modules`) and that the best of three runs stays within
+`budget_ms`, which is set generously to tolerate slow machines.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("typer", "rich", "yaml", "httpx", "multiprocessing", "concurrent.futures")
+LLM_MODULES = ("prompt_ast.parse.llm", "prompt_ast.parse.hybrid", "prompt_ast.llm.openai_compat")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    statement: str
+    budget_ms: float
+    # Modules the statement must not load
+    forbidden: tuple[str, ...] = ()
+
+
+SCENARIOS = (
+    Scenario("import", "import prompt_ast", 40, ("pydantic", *HEAVY, *LLM_MODULES)),
+    Scenario(
+        "heuristic_lite",
+        "from prompt_ast.parse import parse_prompt_heuristic_lite as p; p('Act as a chef.')",
+        60,
+        ("pydantic", *HEAVY, *LLM_MODULES),
+    ),
+    Scenario(
+        "heuristic",
+        "import prompt_ast; prompt_ast.parse_prompt('Act as a chef.', mode='heuristic')",
+        400,
+        (*HEAVY, *LLM_MODULES),
+    ),
+    Scenario(
+        "cli",
+        "import prompt_ast.cli",
+        400,
+        ("pydantic", "rich", "yaml", "httpx", "multiprocessing", *LLM_MODULES),
+    ),
+)
+
+
+def measure(statement: str) -> tuple[float, set[str]]:
+    """Import time in ms attributable to `statement`, and the modules it loaded."""
+    baseline = _importtime("pass")
+    loaded = _importtime(statement)
+    # Top-level entries (no nesting) not already imported by a bare interpreter
+    total_us = sum(
+        cumulative
+        for name, (cumulative, depth) in loaded.items()
+        if depth == 0 and name not in baseline
+    )
+    return total_us / 1000, set(loaded) - set(baseline)
+
+
+def loaded_modules(statement: str) -> set[str]:
+    """Modules in `sys.modules` after running `statement` in a fresh interpreter."""
+    code = f"{statement}\nimport json, sys; print(json.dumps(sorted(sys.modules)))"
+    proc = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+def _importtime(statement: str) -> dict[str, tuple[int, int]]:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: dict[str, tuple[int, int]] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header line
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(cumulative), depth)
+    return modules
+
+
+def main() -> int:
+    failed = False
+    print(f"{'scenario':<16} {'ms':>8} {'budget':>8}  forbidden modules loaded")
+    results = {}
+    for scenario in SCENARIOS:
+        ms, loaded = measure(scenario.statement)
+        bad = sorted(m for m in scenario.forbidden if m in loaded)
+        failed |= ms > scenario.budget_ms or bool(bad)
+        results[scenario.name] = {"ms": ms, "forbidden_loaded": bad}
+        print(f"{scenario.name:<16} {ms:>8.1f} {scenario.budget_ms:>8.0f}  {', '.join(bad) or '-'}")
+    if "--json" in sys.argv:
+        print(json.dumps(results))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,218 @@
+"""
+Benchmark suite covering heuristic parsing, serialization and LLM-mode overhead.
+
+Heuristic cases parse one prompt of the given size per op; serialize/llm/hybrid
+cases process all fixture prompts per op. Every case reports throughput (ops/s; MB/s where input size matters) and latency
+percentiles. `run` writes the results as JSON; `compare` re-runs the suite (or
+loads `--current`) and exits non-zero when any case's throughput drops more
+than `--threshold` below the baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from prompt_ast.formats import serialize, serialize_many
+from prompt_ast.parse import parse_prompt_heuristic_lite
+from prompt_ast.parse.heuristic import parse_prompt_heuristic
+from prompt_ast.parse.hybrid import parse_prompt_hybrid
+from prompt_ast.parse.llm import parse_prompt_llm
+from tests.fixtures import FIXTURES
+
+SIZES = [100, 1_000, 10_000, 100_000, 1_000_000, 5_000_000]
+FIXTURE_PROMPTS = [f["prompt"] for f in FIXTURES]
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], Any]
+    # Bytes processed per call, for MB/s reporting (0 when not meaningful).
+    nbytes: int = 0
+
+
+class StubLLM:
+    """Canned `LLMClient` so llm/hybrid cases measure local overhead only."""
+
+    def __init__(self) -> None:
+        self.response = json.dumps(
+            {
+                "version": "0.1",
+                "raw": "ignored",
+                "role": "analyst",
+                "task": "Summarize the report",
+                "constraints": ["Be concise"],
+                "output_spec": {"format": "markdown", "structure": [], "language": None},
+                "metadata": {"confidence": 0.9, "extracted_by": "llm"},
+            }
+        )
+
+    def complete(self, prompt: str) -> str:
+        return self.response
+
+
+def corpus(size: int) -> str:
+    """Fixture prompts repeated and trimmed to `size` characters."""
+    seed = "\n\n".join(FIXTURE_PROMPTS)
+    return (seed * (size // len(seed) + 1))[:size]
+
+
+def build_cases(max_size: int) -> list[Case]:
+    cases: list[Case] = []
+    for size in SIZES:
+        if size > max_size:
+            continue
+        text = corpus(size)
+        cases.append(
+            Case(f"heuristic/{size}", lambda t=text: parse_prompt_heuristic(t), size)
+        )
+
+    asts = [parse_prompt_heuristic(p) for p in FIXTURE_PROMPTS]
+    for fmt in ("dict", "json", "yaml", "compact"):
+        cases.append(
+            Case(
+                f"serialize/{fmt}",
+                lambda f=fmt: [serialize(ast, fmt=f) for ast in asts],
+            )
+        )
+    lites = [parse_prompt_heuristic_lite(p) for p in FIXTURE_PROMPTS]
+    for batch_fmt in ("jsonl", "json"):
+        cases.append(
+            Case(
+                f"serialize_many/{batch_fmt}",
+                lambda f=batch_fmt: serialize_many(asts, fmt=f),
+            )
+        )
+    cases.append(Case("serialize_many/lite", lambda: serialize_many(lites)))
+
+    llm = StubLLM()
+    cases.append(
+        Case("llm/stub", lambda: [parse_prompt_llm(p, llm=llm) for p in FIXTURE_PROMPTS])
+    )
+    cases.append(
+        Case(
+            "hybrid/stub",
+            lambda: [parse_prompt_hybrid(p, llm=llm) for p in FIXTURE_PROMPTS],
+        )
+    )
+    return cases
+
+
+def measure(case: Case, budget: float, min_rounds: int = 3) -> dict[str, float]:
+    samples: list[float] = []
+    started = time.perf_counter()
+    while len(samples) < min_rounds or time.perf_counter() - started < budget:
+        t0 = time.perf_counter()
+        case.fn()
+        samples.append(time.perf_counter() - t0)
+
+    samples.sort()
+    total = sum(samples)
+    result = {
+        "rounds": len(samples),
+        "ops_per_sec": len(samples) / total,
+        "mean_ms": statistics.fmean(samples) * 1e3,
+        "p50_ms": _percentile(samples, 50) * 1e3,
+        "p95_ms": _percentile(samples, 95) * 1e3,
+        "p99_ms": _percentile(samples, 99) * 1e3,
+    }
+    if case.nbytes:
+        result["mb_per_sec"] = case.nbytes * len(samples) / total / 1e6
+    return result
+
+
+def _percentile(sorted_samples: list[float], pct: float) -> float:
+    idx = round(pct / 100 * (len(sorted_samples) - 1))
+    return sorted_samples[idx]
+
+
+def run_suite(
+    max_size: int, budget: float, pattern: str | None = None
+) -> dict[str, Any]:
+    results: dict[str, dict[str, float]] = {}
+    for case in build_cases(max_size):
+        if pattern and pattern not in case.name:
+            continue
+        results[case.name] = measure(case, budget)
+        _print_row(case.name, results[case.name])
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[str]:
+    """Return one message per case whose throughput regressed past `threshold`."""
+    regressions = []
+    for name, base in baseline["results"].items():
+        now = current["results"].get(name)
+        if now is None:
+            continue
+        ratio = now["ops_per_sec"] / base["ops_per_sec"]
+        if ratio < 1 - threshold:
+            regressions.append(
+                f"{name}: {base['ops_per_sec']:.1f} -> {now['ops_per_sec']:.1f} ops/s "
+                f"({(ratio - 1) * 100:+.1f}%)"
+            )
+    return regressions
+
+
+def _print_row(name: str, r: dict[str, float]) -> None:
+    mbs = f"{r['mb_per_sec']:8.1f} MB/s" if "mb_per_sec" in r else " " * 13
+    print(
+        f"{name:<20} {r['ops_per_sec']:10.1f} ops/s {mbs}"
+        f"  p50 {r['p50_ms']:9.3f}ms  p95 {r['p95_ms']:9.3f}ms  p99 {r['p99_ms']:9.3f}ms"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    def add_run_options(p: argparse.ArgumentParser) -> None:
+        p.add_argument("--max-size", type=int, default=SIZES[-1])
+        p.add_argument("--budget", type=float, default=1.0, help="seconds per case")
+        p.add_argument("-k", dest="pattern", help="only cases containing this text")
+
+    run = sub.add_parser("run", help="run the suite and write results")
+    add_run_options(run)
+    run.add_argument("--output", type=Path, help="write results JSON here")
+
+    cmp_ = sub.add_parser("compare", help="fail if throughput regressed")
+    add_run_options(cmp_)
+    cmp_.add_argument("baseline", type=Path)
+    cmp_.add_argument("--current", type=Path, help="results JSON instead of re-running")
+    cmp_.add_argument("--threshold", type=float, default=0.15)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compare" and args.current is not None:
+        current = json.loads(args.current.read_text())
+    else:
+        current = run_suite(args.max_size, args.budget, args.pattern)
+
+    if args.command == "run":
+        if args.output is not None:
+            args.output.write_text(json.dumps(current, indent=2) + "\n")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    regressions = compare(baseline, current, args.threshold)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
@@ -1,30 +1,138 @@
 from __future__ import annotations
 
-from typing import Literal
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Literal
 
-from .ast import PromptAST
 from .errors import LLMNotConfiguredError
-from .parse import parse_prompt_heuristic, parse_prompt_hybrid, parse_prompt_llm
+
+if TYPE_CHECKING:
+    from .ast import PromptAST
+    from .batch import parse_prompts
+    from .lite import PromptASTLite
+    from .llm.base import AsyncLLMClient
+    from .parse.mapped import parse_prompt_file
+    from .parse.memo import HeuristicParseCache
+    from .parse.stream import parse_prompt_stream
 
 Mode = Literal["heuristic", "llm", "hybrid"]
 
+# Resolved on first access so `import prompt_ast` stays cheap: pydantic, the
+# process pool and the LLM/hybrid modules load only when something needs them.
+_LAZY_ATTRS = {
+    "PromptAST": ".ast",
+    "PromptASTLite": ".lite",
+    "HeuristicParseCache": ".parse.memo",
+    "parse_prompts": ".batch",
+    "parse_prompt_stream": ".parse.stream",
+    "parse_prompt_file": ".parse.mapped",
+    "AsyncLLMClient": ".llm.base",
+    "parse_prompt_heuristic": ".parse.heuristic",
+    "parse_prompt_llm": ".parse.llm",
+    "parse_prompt_llm_async": ".parse.llm",
+    "parse_prompt_llm_stream": ".parse.llm",
+    "parse_prompt_llm_stream_async": ".parse.llm",
+    "parse_prompts_llm": ".parse.llm",
+    "parse_prompts_llm_async": ".parse.llm",
+    "parse_prompt_hybrid": ".parse.hybrid",
+    "parse_prompt_hybrid_async": ".parse.hybrid",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        if not name.startswith("__"):
+            # Submodules stay reachable as attributes, e.g. `prompt_ast.parse`
+            try:
+                return import_module(f".{name}", __name__)
+            except ModuleNotFoundError as e:
+                if e.name != f"{__name__}.{name}":
+                    raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
+
+
+def parse_prompt(
+    text: str,
+    mode: Mode = "hybrid",
+    llm=None,
+    cache: HeuristicParseCache | None = None,
+    threshold: float | None = None,
+) -> PromptAST:
+    """
+    Parse `text` into a PromptAST.
 
-def parse_prompt(text: str, mode: Mode = "hybrid", llm=None) -> PromptAST:
+    In hybrid mode, `threshold` skips the LLM when the heuristic confidence is
+    at or above it (see `parse_prompt_hybrid`).
+    """
     text = text.strip()
 
     if mode == "heuristic":
+        if cache is not None:
+            return cache.parse(text)
+        from .parse.heuristic import parse_prompt_heuristic
+
         return parse_prompt_heuristic(text)
 
     if llm is None:
         raise LLMNotConfiguredError("LLM client required for mode='llm' or 'hybrid'.")
 
     if mode == "llm":
+        from .parse.llm import parse_prompt_llm
+
         return parse_prompt_llm(text, llm=llm)
 
     if mode == "hybrid":
-        return parse_prompt_hybrid(text, llm=llm)
+        from .parse.hybrid import parse_prompt_hybrid
+
+        return parse_prompt_hybrid(text, llm=llm, threshold=threshold)
+
+    raise ValueError(f"Unknown mode: {mode}")
+
+
+async def parse_prompt_async(
+    text: str,
+    mode: Mode = "hybrid",
+    llm: AsyncLLMClient | None = None,
+    threshold: float | None = None,
+) -> PromptAST:
+    text = text.strip()
+
+    if mode == "heuristic":
+        from .parse.heuristic import parse_prompt_heuristic
+
+        return parse_prompt_heuristic(text)
+
+    if llm is None:
+        raise LLMNotConfiguredError("LLM client required for mode='llm' or 'hybrid'.")
+
+    if mode == "llm":
+        from .parse.llm import parse_prompt_llm_async
+
+        return await parse_prompt_llm_async(text, llm=llm)
+
+    if mode == "hybrid":
+        from .parse.hybrid import parse_prompt_hybrid_async
+
+        return await parse_prompt_hybrid_async(text, llm=llm, threshold=threshold)
 
     raise ValueError(f"Unknown mode: {mode}")
 
 
-__all__ = ["PromptAST", "parse_prompt", "LLMNotConfiguredError"]
+__all__ = [
+    "PromptAST",
+    "PromptASTLite",
+    "HeuristicParseCache",
+    "parse_prompt",
+    "parse_prompt_async",
+    "parse_prompts",
+    "parse_prompt_stream",
+    "parse_prompt_file",
+    "LLMNotConfiguredError",
+]
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Literal
+from typing import Any
 from pydantic import BaseModel, Field
 
+from .lite import SchemaVersion
 
-SchemaVersion = Literal["0.1"]
+__all__ = ["OutputSpec", "PromptAST", "SchemaVersion"]
 
 
 class OutputSpec(BaseModel):
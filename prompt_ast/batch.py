@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import os
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator, Literal, overload
+
+from .ast import PromptAST
+from .parse.heuristic import parse_prompt_heuristic
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+
+
+@overload
+def parse_prompts(
+    texts: Iterable[str],
+    *,
+    workers: int | None = ...,
+    chunksize: int = ...,
+    ordered: Literal[True] = ...,
+) -> Iterator[PromptAST]: ...
+
+
+@overload
+def parse_prompts(
+    texts: Iterable[str],
+    *,
+    workers: int | None = ...,
+    chunksize: int = ...,
+    ordered: Literal[False],
+) -> Iterator[tuple[int, PromptAST]]: ...
+
+
+def parse_prompts(
+    texts: Iterable[str],
+    *,
+    workers: int | None = None,
+    chunksize: int = 64,
+    ordered: bool = True,
+) -> Iterator[PromptAST] | Iterator[tuple[int, PromptAST]]:
+    """
+    Parse many prompts in heuristic mode across a process pool.
+
+    `texts` is consumed lazily in chunks of `chunksize`; at most two chunks per
+    worker are in flight, so arbitrarily long iterables run in bounded memory.
+    With `ordered=True` ASTs are yielded in input order. With `ordered=False`
+    `(index, ast)` pairs are yielded as soon as their chunk completes.
+
+    `workers` defaults to the CPU count; `workers=1` parses in-process.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be >= 1")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+
+    chunks = _chunked(texts, chunksize)
+    if workers == 1:
+        results = (ast for chunk in chunks for ast in _parse_chunk(chunk))
+        return results if ordered else enumerate(results)
+    if ordered:
+        return _parse_ordered(chunks, workers)
+    return _parse_unordered(chunks, workers)
+
+
+def _parse_chunk(texts: list[str]) -> list[PromptAST]:
+    return [parse_prompt_heuristic(text.strip()) for text in texts]
+
+
+def _chunked(texts: Iterable[str], size: int) -> Iterator[list[str]]:
+    it = iter(texts)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def _parse_ordered(chunks: Iterator[list[str]], workers: int) -> Iterator[PromptAST]:
+    # multiprocessing is slow to import; load it only when a pool is needed
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future[list[PromptAST]]] = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_parse_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _parse_unordered(
+    chunks: Iterator[list[str]], workers: int
+) -> Iterator[tuple[int, PromptAST]]:
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: dict[Future[list[PromptAST]], int] = {}
+        offset = 0
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < workers * 2:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                    break
+                pending[pool.submit(_parse_chunk, chunk)] = offset
+                offset += len(chunk)
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                start = pending.pop(future)
+                for i, ast in enumerate(future.result()):
+                    yield start + i, ast
@@ -1,17 +1,32 @@
 from __future__ import annotations
-from typing import Optional
+import json
+import sys
+from collections import deque
+from contextlib import ExitStack
+from functools import cache
+from typing import TYPE_CHECKING, Iterator, Literal, Optional, TextIO
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
 from pathlib import Path
 
 from . import Mode, parse_prompt
-from .formats import Format, serialize
+from .formats import Format, serialize, to_compact_json
 from .errors import LLMNotConfiguredError
 
+if TYPE_CHECKING:
+    from rich.console import Console
+
 app = typer.Typer(add_completion=False)
-console = Console()
+
+InputFormat = Literal["jsonl", "lines"]
+
+
+@cache
+def _console(stderr: bool = False) -> Console:
+    # rich is only needed once something is printed
+    from rich.console import Console
+
+    return Console(stderr=stderr)
 
 
 @app.callback()
@@ -31,54 +46,77 @@ def normalize(
         help="Read prompt from file (alternative to text argument)",
     ),
     mode: Mode = typer.Option("heuristic", help="heuristic|llm|hybrid"),
-    fmt: Format = typer.Option("json", "--format", help="json|yaml"),
+    fmt: Format = typer.Option(
+        "json", "--format", help="json|yaml|compact (compact prints one bare JSON line)"
+    ),
     use_openai: bool = typer.Option(
         False, help="Use OpenAI-compatible API via env vars"
     ),
+    max_size: float = typer.Option(
+        5.0,
+        "--max-size",
+        min=0.0,
+        help="Largest accepted --file size in MB (0 = no limit)",
+    ),
+    raw: bool = typer.Option(
+        True, "--raw/--no-raw", help="Include the prompt text in the AST's raw field"
+    ),
+    threshold: Optional[float] = typer.Option(
+        None,
+        "--threshold",
+        min=0.0,
+        max=1.0,
+        help="Hybrid mode: skip the LLM when heuristic confidence is at least this",
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Print per-stage parse timings to stderr"
+    ),
 ):
     """
     Normalize and parse prompt text into an AST.
 
-    Provide prompt either as text argument or via --file option.
+    Provide prompt either as text argument or via --file option. In heuristic
+    mode the file is memory-mapped and parsed incrementally; with --no-raw it is
+    never decoded as a whole.
     """
 
     if file is not None and text is not None:
-        console.print(
+        _console().print(
             "[red]Error: Cannot specify both text argument and --file option[/red]"
         )
         raise typer.Exit(1)
 
-    prompt_text: str
+    prompt_text: str | None = None
     if file is not None:
         file = file.expanduser()
 
         if not file.exists():
-            console.print(f"[red]Error: File '{file}' does not exist[/red]")
+            _console().print(f"[red]Error: File '{file}' does not exist[/red]")
             raise typer.Exit(1)
 
         # Verify the file is not a directory
         if not file.is_file():
-            console.print(f"[red]Error: '{file}' is not a file[/red]")
+            _console().print(f"[red]Error: '{file}' is not a file[/red]")
             raise typer.Exit(1)
 
-        # Verify the size (max 5MB)
+        # Verify the size against --max-size
         file_size = file.stat().st_size
-        max_size = 5 * 1024 * 1024
-        if file_size > max_size:
-            console.print(
-                f"[red]Error: File'{file}' is too large ({file_size / 1024 / 1024:.1f}MB). Maximum size is 5MB[/red]"
+        if max_size > 0 and file_size > max_size * 1024 * 1024:
+            _console().print(
+                f"[red]Error: File'{file}' is too large ({file_size / 1024 / 1024:.1f}MB). Maximum size is {max_size:g}MB[/red]"
             )
             raise typer.Exit(1)
 
-        try:
-            prompt_text = file.read_text(encoding="utf-8")
-        except Exception as e:
-            console.print(f"[red]Error reading file: {e}[/red]")
-            raise typer.Exit(1)
+        if mode != "heuristic":
+            try:
+                prompt_text = file.read_text(encoding="utf-8")
+            except Exception as e:
+                _console().print(f"[red]Error reading file: {e}[/red]")
+                raise typer.Exit(1)
     elif text is not None:
         prompt_text = text
     else:
-        console.print(
+        _console().print(
             "[red]Error: Must provide either text argument or --file option[/red]"
         )
         raise typer.Exit(1)
@@ -91,12 +129,198 @@ def normalize(
 
         llm = OpenAICompatClient()
 
-    ast = parse_prompt(prompt_text, mode=mode, llm=llm)
-    out = serialize(ast, fmt=fmt)  # returns str for json/yaml
-    console.print(
+    timings = None
+    with ExitStack() as stack:
+        if profile:
+            from .profiling import profile_stages
+
+            timings = stack.enter_context(profile_stages())
+        if prompt_text is None:
+            from .parse.mapped import parse_prompt_file
+
+            try:
+                ast = parse_prompt_file(file, keep_raw=raw)
+            except (OSError, ValueError) as e:
+                _console().print(f"[red]Error reading file: {e}[/red]")
+                raise typer.Exit(1)
+        else:
+            ast = parse_prompt(prompt_text, mode=mode, llm=llm, threshold=threshold)
+            if not raw:
+                ast.raw = ""
+    if timings is not None:
+        _console(stderr=True).print(timings.format_table(), markup=False, highlight=False)
+    out = serialize(ast, fmt=fmt)  # returns str for json/yaml/compact
+    if fmt == "compact":
+        # Machine-readable: skip the rich panel
+        sys.stdout.write(f"{out}\n")
+        return
+    from rich.panel import Panel
+
+    _console().print(
         Panel.fit(out if isinstance(out, str) else str(out), title="Prompt AST")
     )
 
 
+@app.command()
+def batch(
+    file: Optional[Path] = typer.Option(
+        None,
+        "--file",
+        "-f",
+        help="Read prompts from file instead of stdin",
+    ),
+    input_format: InputFormat = typer.Option(
+        "jsonl",
+        "--input-format",
+        help="jsonl (one JSON object or string per line) | lines (one prompt per line)",
+    ),
+    field: str = typer.Option(
+        "prompt", help="Key holding the prompt text in JSONL objects"
+    ),
+    workers: int = typer.Option(1, min=1, help="Worker processes for parsing"),
+    chunksize: int = typer.Option(256, min=1, help="Prompts per worker task"),
+):
+    """
+    Stream prompts from stdin or --file and write one compact JSON AST per line.
+
+    Input is read lazily, so memory stays bounded regardless of input size.
+    Parsing uses heuristic mode. Output line N always answers input line N:
+    blank and malformed lines get an `{"line": N, "error": ...}` record instead
+    of an AST. Malformed lines are also reported on stderr and make the exit
+    code 1.
+    """
+    from .batch import parse_prompts
+
+    if file is not None:
+        file = file.expanduser()
+        if not file.is_file():
+            _console(stderr=True).print(f"[red]Error: '{file}' is not a file[/red]")
+            raise typer.Exit(1)
+
+    skipped = 0
+    # One entry per input line, in order: None for a prompt sent to the parser,
+    # else the error record written in its place
+    slots: deque[str | None] = deque()
+
+    def prompts(stream: TextIO) -> Iterator[str]:
+        nonlocal skipped
+        for lineno, line in enumerate(stream, start=1):
+            if not line.strip():
+                slots.append(_error_record(lineno, "blank line"))
+                continue
+            if input_format == "lines":
+                slots.append(None)
+                yield line
+                continue
+            try:
+                prompt = _prompt_from_jsonl(line, field)
+            except ValueError as e:
+                skipped += 1
+                slots.append(_error_record(lineno, str(e)))
+                _console(stderr=True).print(f"[red]line {lineno}: {e}[/red]")
+                continue
+            slots.append(None)
+            yield prompt
+
+    def write_errors() -> None:
+        while slots and slots[0] is not None:
+            out.write(slots.popleft() + "\n")  # type: ignore[operator]
+
+    stream = file.open(encoding="utf-8") if file is not None else sys.stdin
+    try:
+        out = sys.stdout
+        for ast in parse_prompts(
+            prompts(stream), workers=workers, chunksize=chunksize
+        ):
+            # The parser reads ahead, so the slot for this AST is already queued
+            write_errors()
+            slots.popleft()
+            out.write(to_compact_json(ast))
+            out.write("\n")
+        write_errors()
+    finally:
+        if file is not None:
+            stream.close()
+
+    if skipped:
+        raise typer.Exit(1)
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Interface to bind"),
+    port: int = typer.Option(8000, help="Port to listen on (0 picks a free one)"),
+    workers: int = typer.Option(8, min=1, help="Requests parsed concurrently"),
+    mode: Mode = typer.Option("heuristic", help="Default parse mode: heuristic|llm|hybrid"),
+    use_openai: bool = typer.Option(
+        False, help="Use OpenAI-compatible API via env vars (llm/hybrid)"
+    ),
+    threshold: Optional[float] = typer.Option(
+        None,
+        "--threshold",
+        min=0.0,
+        max=1.0,
+        help="Hybrid mode: skip the LLM when heuristic confidence is at least this",
+    ),
+    cache_size: int = typer.Option(4096, min=1, help="Heuristic parse cache entries"),
+    max_size: float = typer.Option(
+        5.0, "--max-size", min=0.0, help="Largest accepted request body in MB (0 = no limit)"
+    ),
+):
+    """
+    Serve POST /parse and /parse/batch over HTTP, plus GET /healthz and /metrics.
+
+    Rules, caches and the pooled LLM client stay warm between requests, so a
+    request costs parse time only.
+    """
+    from .server import ParseService, create_server
+
+    llm = None
+    if use_openai:
+        from .llm.openai_compat import OpenAICompatClient
+        from .llm.scheduler import ScheduledLLMClient
+
+        llm = ScheduledLLMClient(OpenAICompatClient(max_connections=workers))
+    elif mode != "heuristic":
+        raise LLMNotConfiguredError("Use --use-openai for llm/hybrid in CLI MVP.")
+
+    service = ParseService(mode=mode, llm=llm, threshold=threshold, cache_size=cache_size)
+    server = create_server(
+        host,
+        port,
+        service=service,
+        workers=workers,
+        max_body_bytes=int(max_size * 1024 * 1024),
+    )
+    bound_host, bound_port = server.server_address[:2]
+    _console(stderr=True).print(
+        f"Serving prompt-ast on http://{bound_host}:{bound_port} ({mode}, {workers} workers)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if llm is not None:
+            llm.llm.close()
+
+
+def _prompt_from_jsonl(line: str, field: str) -> str:
+    try:
+        obj = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"invalid JSON ({e})") from e
+    if isinstance(obj, str):
+        return obj
+    if isinstance(obj, dict) and isinstance(obj.get(field), str):
+        return obj[field]
+    raise ValueError(f"expected a JSON string or an object with a '{field}' string")
+
+
+def _error_record(lineno: int, message: str) -> str:
+    return json.dumps({"line": lineno, "error": message}, separators=(",", ":"))
+
+
 if __name__ == "__main__":
     app()
@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import json
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Literal
+
+from .ast import PromptAST
+from .lite import PromptASTLite, _plain_metadata
+
+ColumnarFormat = Literal["parquet", "jsonl"]
+
+COLUMNAR_JSONL_MAGIC = "prompt-ast-columnar"
+COLUMNAR_JSONL_VERSION = 1
+DEFAULT_ROW_GROUP_SIZE = 65_536
+
+# Scalar string columns, in schema order
+_STRING_COLUMNS = ("version", "raw", "role", "context", "task")
+_LIST_COLUMNS = ("constraints", "assumptions", "ambiguities")
+# Low-cardinality columns stored dictionary-encoded
+_DICTIONARY_COLUMNS = frozenset({"version", "role", "output_spec.format"})
+
+
+def write_columnar(
+    asts: Iterable[PromptAST | PromptASTLite],
+    path: str | Path,
+    fmt: ColumnarFormat = "parquet",
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> int:
+    """
+    Write ASTs to `path` in a columnar layout and return the row count.
+
+    `constraints`, `assumptions` and `ambiguities` become list columns,
+    `output_spec` a struct column, and `version`, `role` and `output_spec.format`
+    are dictionary-encoded. `metadata` is free-form, so it is stored as a JSON
+    string column.
+
+    `fmt="parquet"` needs pyarrow (`pip install prompt-ast[parquet]`).
+    `fmt="jsonl"` uses only the standard library. It writes a header line,
+    then one JSON object per row group holding every column as an array.
+    Input is consumed `row_group_size` ASTs at a time.
+    """
+    if row_group_size < 1:
+        raise ValueError("row_group_size must be >= 1")
+    groups = _row_groups(asts, row_group_size)
+    path = Path(path).expanduser()
+    if fmt == "parquet":
+        return _write_parquet(groups, path)
+    if fmt == "jsonl":
+        return _write_jsonl(groups, path)
+    raise ValueError(f"Unsupported columnar format: {fmt}")
+
+
+def read_columnar(path: str | Path, fmt: ColumnarFormat = "parquet") -> Iterator[PromptAST]:
+    """Yield the ASTs stored by `write_columnar`, one row group at a time."""
+    path = Path(path).expanduser()
+    if fmt == "parquet":
+        return _read_parquet(path)
+    if fmt == "jsonl":
+        return _read_jsonl(path)
+    raise ValueError(f"Unsupported columnar format: {fmt}")
+
+
+def _row_groups(
+    asts: Iterable[PromptAST | PromptASTLite], size: int
+) -> Iterator[dict[str, Any]]:
+    it = iter(asts)
+    while batch := list(islice(it, size)):
+        yield _to_columns(batch)
+
+
+def _to_columns(batch: list[PromptAST | PromptASTLite]) -> dict[str, Any]:
+    """Plain Python columns for one row group (struct fields as nested dicts)."""
+    columns: dict[str, Any] = {
+        name: [getattr(ast, name) for ast in batch] for name in _STRING_COLUMNS
+    }
+    for name in _LIST_COLUMNS:
+        columns[name] = [list(getattr(ast, name)) for ast in batch]
+    specs = [_output_spec(ast) for ast in batch]
+    columns["output_spec"] = {
+        "format": [spec[0] for spec in specs],
+        "structure": [spec[1] for spec in specs],
+        "language": [spec[2] for spec in specs],
+    }
+    # Heuristic ASTs share one metadata mapping; encode each distinct one once
+    encoded: dict[int, str] = {}
+    columns["metadata"] = [
+        encoded.get(id(ast.metadata))
+        or encoded.setdefault(
+            id(ast.metadata), json.dumps(_plain_metadata(ast.metadata), separators=(",", ":"))
+        )
+        for ast in batch
+    ]
+    return columns
+
+
+def _output_spec(ast: PromptAST | PromptASTLite) -> tuple[str | None, list[str], str | None]:
+    if isinstance(ast, PromptASTLite):
+        return ast.output_format, list(ast.output_structure), ast.output_language
+    spec = ast.output_spec
+    return spec.format, list(spec.structure), spec.language
+
+
+def _from_columns(columns: dict[str, Any]) -> Iterator[PromptAST]:
+    spec = columns["output_spec"]
+    for i, raw in enumerate(columns["raw"]):
+        yield PromptAST(
+            version=columns["version"][i],
+            raw=raw,
+            role=columns["role"][i],
+            context=columns["context"][i],
+            task=columns["task"][i],
+            constraints=columns["constraints"][i],
+            assumptions=columns["assumptions"][i],
+            ambiguities=columns["ambiguities"][i],
+            output_spec={
+                "format": spec["format"][i],
+                "structure": spec["structure"][i],
+                "language": spec["language"][i],
+            },
+            metadata=json.loads(columns["metadata"][i]),
+        )
+
+
+# --- stdlib column-chunked JSONL -------------------------------------------
+
+
+def _dictionary_encode(values: list[str | None]) -> dict[str, list[Any]]:
+    """Distinct values plus per-row indices into them (None stays None)."""
+    positions: dict[str, int] = {}
+    indices = [
+        None if v is None else positions.setdefault(v, len(positions)) for v in values
+    ]
+    return {"dictionary": list(positions), "indices": indices}
+
+
+def _dictionary_decode(encoded: dict[str, list[Any]]) -> list[str | None]:
+    dictionary = encoded["dictionary"]
+    return [None if i is None else dictionary[i] for i in encoded["indices"]]
+
+
+def _write_jsonl(groups: Iterator[dict[str, Any]], path: Path) -> int:
+    rows = 0
+    with path.open("w", encoding="utf-8") as f:
+        header = {"format": COLUMNAR_JSONL_MAGIC, "version": COLUMNAR_JSONL_VERSION}
+        f.write(json.dumps(header) + "\n")
+        for columns in groups:
+            for name in ("version", "role"):
+                columns[name] = _dictionary_encode(columns[name])
+            spec = columns["output_spec"]
+            spec["format"] = _dictionary_encode(spec["format"])
+            count = len(columns["raw"])
+            group = {"rows": count, "columns": columns}
+            f.write(json.dumps(group, ensure_ascii=False, separators=(",", ":")) + "\n")
+            rows += count
+    return rows
+
+
+def _read_jsonl(path: Path) -> Iterator[PromptAST]:
+    with path.open(encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if header.get("format") != COLUMNAR_JSONL_MAGIC:
+            raise ValueError(f"'{path}' is not a prompt-ast columnar JSONL file")
+        if header.get("version") != COLUMNAR_JSONL_VERSION:
+            raise ValueError(
+                f"Unsupported columnar JSONL version: {header.get('version')}"
+            )
+        for line in f:
+            columns = json.loads(line)["columns"]
+            for name in ("version", "role"):
+                columns[name] = _dictionary_decode(columns[name])
+            spec = columns["output_spec"]
+            spec["format"] = _dictionary_decode(spec["format"])
+            yield from _from_columns(columns)
+
+
+# --- Parquet (optional pyarrow) --------------------------------------------
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow as pa  # type: ignore
+        import pyarrow.parquet as pq  # type: ignore
+    except ImportError as e:
+        raise ImportError(
+            "Install Parquet support: pip install prompt-ast[parquet]"
+        ) from e
+    return pa, pq
+
+
+def _arrow_schema(pa: Any) -> Any:
+    def string(name: str) -> Any:
+        if name in _DICTIONARY_COLUMNS:
+            return pa.dictionary(pa.int32(), pa.string())
+        return pa.string()
+
+    return pa.schema(
+        [pa.field(name, string(name)) for name in _STRING_COLUMNS]
+        + [pa.field(name, pa.list_(pa.string())) for name in _LIST_COLUMNS]
+        + [
+            pa.field(
+                "output_spec",
+                pa.struct(
+                    [
+                        pa.field("format", string("output_spec.format")),
+                        pa.field("structure", pa.list_(pa.string())),
+                        pa.field("language", pa.string()),
+                    ]
+                ),
+            ),
+            pa.field("metadata", pa.string()),
+        ]
+    )
+
+
+def _write_parquet(groups: Iterator[dict[str, Any]], path: Path) -> int:
+    pa, pq = _require_pyarrow()
+    schema = _arrow_schema(pa)
+    rows = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for columns in groups:
+            spec = columns["output_spec"]
+            columns["output_spec"] = [
+                {"format": fmt, "structure": structure, "language": language}
+                for fmt, structure, language in zip(
+                    spec["format"], spec["structure"], spec["language"]
+                )
+            ]
+            table = pa.Table.from_pydict(columns, schema=schema)
+            writer.write_table(table)
+            rows += table.num_rows
+    return rows
+
+
+def _read_parquet(path: Path) -> Iterator[PromptAST]:
+    _, pq = _require_pyarrow()
+    parquet = pq.ParquetFile(path)
+    for i in range(parquet.num_row_groups):
+        columns = parquet.read_row_group(i).to_pydict()
+        spec = columns["output_spec"]
+        columns["output_spec"] = {
+            key: [row[key] for row in spec] for key in ("format", "structure", "language")
+        }
+        yield from _from_columns(columns)
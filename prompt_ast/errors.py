@@ -8,3 +8,7 @@ class LLMNotConfiguredError(PromptAstError):
 
 class ParseError(PromptAstError):
     """Raised when parsing fails (e.g., LLM output not valid JSON)."""
+
+
+class NoBackendAvailableError(PromptAstError):
+    """Raised when every backend of an LLM router has an open circuit."""
@@ -1,9 +1,43 @@
 from __future__ import annotations
 
-from typing import Literal
-from .ast import PromptAST
+from functools import cache
+from typing import TYPE_CHECKING, Any, Iterable, Literal
 
-Format = Literal["json", "yaml", "dict"]
+from .lite import PromptASTLite
+
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
+
+    from .ast import PromptAST
+
+Format = Literal["json", "yaml", "dict", "compact"]
+BatchFormat = Literal["jsonl", "json"]
+
+
+# pydantic-core serializers are built on first use and shared by every call after
+@cache
+def _ast_serializer() -> Any:
+    from .ast import PromptAST
+
+    return PromptAST.__pydantic_serializer__
+
+
+@cache
+def _ast_list_adapter() -> TypeAdapter[list[PromptAST]]:
+    from pydantic import TypeAdapter
+
+    from .ast import PromptAST
+
+    return TypeAdapter(list[PromptAST])
+
+
+@cache
+def _orjson() -> Any:
+    try:
+        import orjson  # type: ignore
+    except ImportError:  # optional: pip install prompt-ast[orjson]
+        return None
+    return orjson
 
 
 def serialize(ast: PromptAST, fmt: Format) -> str | dict:
@@ -11,6 +45,44 @@ def serialize(ast: PromptAST, fmt: Format) -> str | dict:
         return ast.to_dict()
     if fmt == "json":
         return ast.to_json()
+    if fmt == "compact":
+        return to_compact_json(ast)
     if fmt == "yaml":
         return ast.to_yaml()
     raise ValueError(f"Unsupported format: {fmt}")
+
+
+def to_compact_json(ast: PromptAST | PromptASTLite) -> str:
+    """Single-line JSON with no whitespace, same content as `PromptAST.to_json()`."""
+    if isinstance(ast, PromptASTLite):
+        return _dumps(ast.to_dict())
+    return _ast_serializer().to_json(ast).decode()
+
+
+def serialize_many(
+    asts: Iterable[PromptAST | PromptASTLite], fmt: BatchFormat = "jsonl"
+) -> str:
+    """
+    Compact JSON for many ASTs: one line per AST (`jsonl`) or one JSON array.
+
+    `PromptAST`s go through pydantic-core's compiled serializer directly (an
+    array in a single call); `PromptASTLite`s are dumped with orjson when it is
+    installed, else pydantic-core's generic `to_json`.
+    """
+    if fmt == "jsonl":
+        return "".join(to_compact_json(ast) + "\n" for ast in asts)
+    if fmt == "json":
+        items = list(asts)
+        if not any(isinstance(ast, PromptASTLite) for ast in items):
+            return _ast_list_adapter().dump_json(items).decode()  # type: ignore[arg-type]
+        return "[" + ",".join(to_compact_json(ast) for ast in items) + "]"
+    raise ValueError(f"Unsupported batch format: {fmt}")
+
+
+def _dumps(data: dict[str, Any]) -> str:
+    orjson = _orjson()
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    from pydantic_core import to_json
+
+    return to_json(data).decode()
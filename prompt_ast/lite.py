@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Literal, Mapping
+
+if TYPE_CHECKING:
+    from .ast import PromptAST
+
+SchemaVersion = Literal["0.1"]
+
+
+_EMPTY_METADATA: Mapping[str, Any] = MappingProxyType({})
+
+
+def _plain_metadata(metadata: Mapping[str, Any]) -> dict[str, Any]:
+    """Mutable deep copy of `metadata`: nested mappings become dicts, tuples lists."""
+    return {key: _plain(value) for key, value in metadata.items()}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
+
+
+def _frozen(value: Any) -> Any:
+    """Read-only deep copy of `value`: mappings become proxies, lists tuples."""
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _frozen(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_frozen(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class PromptASTLite:
+    """
+    Compact, immutable counterpart of `PromptAST` for holding many ASTs in memory.
+
+    Lists become tuples (empty ones share a single instance), the output spec is
+    flattened into `output_*` fields and no validation runs on construction.
+    `metadata` may be a shared read-only mapping; `from_ast()` freezes nested
+    mappings and lists too, so nothing is shared with the source. Convert with `to_ast()` and
+    `from_ast()` when the pydantic model is needed.
+    """
+
+    raw: str
+    role: str | None = None
+    context: str | None = None
+    task: str | None = None
+
+    constraints: tuple[str, ...] = ()
+    assumptions: tuple[str, ...] = ()
+    ambiguities: tuple[str, ...] = ()
+
+    output_format: str | None = None
+    output_structure: tuple[str, ...] = ()
+    output_language: str | None = None
+
+    metadata: Mapping[str, Any] = field(default=_EMPTY_METADATA)
+    version: SchemaVersion = "0.1"
+
+    def to_ast(self) -> PromptAST:
+        from .ast import OutputSpec, PromptAST
+
+        return PromptAST(
+            version=self.version,
+            raw=self.raw,
+            role=self.role,
+            context=self.context,
+            task=self.task,
+            constraints=list(self.constraints),
+            assumptions=list(self.assumptions),
+            ambiguities=list(self.ambiguities),
+            output_spec=OutputSpec(
+                format=self.output_format,
+                structure=list(self.output_structure),
+                language=self.output_language,
+            ),
+            metadata=_plain_metadata(self.metadata),
+        )
+
+    @classmethod
+    def from_ast(cls, ast: PromptAST) -> PromptASTLite:
+        return cls(
+            raw=ast.raw,
+            role=ast.role,
+            context=ast.context,
+            task=ast.task,
+            constraints=tuple(ast.constraints),
+            assumptions=tuple(ast.assumptions),
+            ambiguities=tuple(ast.ambiguities),
+            output_format=ast.output_spec.format,
+            output_structure=tuple(ast.output_spec.structure),
+            output_language=ast.output_spec.language,
+            metadata=_frozen(ast.metadata),
+            version=ast.version,
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        """Same shape as `PromptAST.to_dict()`."""
+        return {
+            "version": self.version,
+            "raw": self.raw,
+            "role": self.role,
+            "context": self.context,
+            "task": self.task,
+            "constraints": list(self.constraints),
+            "assumptions": list(self.assumptions),
+            "ambiguities": list(self.ambiguities),
+            "output_spec": {
+                "format": self.output_format,
+                "structure": list(self.output_structure),
+                "language": self.output_language,
+            },
+            "metadata": _plain_metadata(self.metadata),
+        }
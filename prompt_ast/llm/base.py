@@ -1,7 +1,42 @@
 from __future__ import annotations
-from typing import Protocol
+
+import json
+from typing import AsyncIterator, Iterator, Protocol
 
 
 class LLMClient(Protocol):
     def complete(self, prompt: str) -> str:
         ...
+
+
+class AsyncLLMClient(Protocol):
+    async def complete(self, prompt: str) -> str:
+        ...
+
+
+class StreamingLLMClient(LLMClient, Protocol):
+    def stream(self, prompt: str) -> Iterator[str]:
+        ...
+
+
+class AsyncStreamingLLMClient(AsyncLLMClient, Protocol):
+    def stream(self, prompt: str) -> AsyncIterator[str]:
+        ...
+
+
+def json_reply(reply: str) -> bool:
+    """Whether a completion holds a JSON object or array, possibly wrapped in prose."""
+    try:
+        json.loads(reply)
+        return True
+    except ValueError:
+        pass
+    for opening, closing in ("{}", "[]"):
+        start, end = reply.find(opening), reply.rfind(closing)
+        if start != -1 and end > start:
+            try:
+                json.loads(reply[start : end + 1])
+                return True
+            except ValueError:
+                continue
+    return False
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Protocol
+
+from .base import AsyncLLMClient, LLMClient, json_reply
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> str | None:
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        ...
+
+
+class MemoryCache:
+    """In-process LRU cache with optional time-to-live (seconds)."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """On-disk cache shared across processes and restarts, with optional TTL."""
+
+    def __init__(self, path: str | Path, ttl: float | None = None):
+        self.path = Path(path).expanduser()
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, stored_at = row
+            if self.ttl is not None and time.time() - stored_at > self.ttl:
+                with self._conn:
+                    self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                return None
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, stored_at) VALUES (?, ?, ?)",
+                (key, value, time.time()),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class _CacheLayer:
+    def __init__(
+        self,
+        llm: Any,
+        cache: CacheBackend | None,
+        model: str | None,
+        temperature: float | None,
+        validate: Callable[[str], bool] | None,
+    ):
+        self.llm = llm
+        self.validate = validate
+        self.cache = cache if cache is not None else MemoryCache()
+        self.model = model if model is not None else getattr(llm, "model", None)
+        self.temperature = (
+            temperature if temperature is not None else getattr(llm, "temperature", None)
+        )
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def cache_key(self, prompt: str) -> str:
+        material = json.dumps([self.model, self.temperature, prompt])
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> str | None:
+        """Cached response for `key`, counted as a hit or a miss."""
+        cached = self.cache.get(key)
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return cached
+
+    def store(self, key: str, response: str) -> None:
+        """Cache `response` unless it fails `validate`, so a bad reply is retried."""
+        if self.validate is None or self.validate(response):
+            self.cache.set(key, response)
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+
+class CachedLLMClient(_CacheLayer):
+    """
+    `LLMClient` wrapper that serves repeated prompts from a cache.
+
+    Entries are keyed on a SHA-256 of (model, temperature, full prompt); model and
+    temperature default to the wrapped client's attributes. Only responses passing
+    `validate` (by default: the reply holds JSON) are cached; anything else is
+    returned once and requested again next time.
+    """
+
+    def __init__(
+        self,
+        llm: LLMClient,
+        cache: CacheBackend | None = None,
+        model: str | None = None,
+        temperature: float | None = None,
+        validate: Callable[[str], bool] | None = json_reply,
+    ):
+        super().__init__(llm, cache, model, temperature, validate)
+
+    def complete(self, prompt: str) -> str:
+        key = self.cache_key(prompt)
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached
+        response = self.llm.complete(prompt)
+        self.store(key, response)
+        return response
+
+
+class AsyncCachedLLMClient(_CacheLayer):
+    """Async counterpart of `CachedLLMClient` for `AsyncLLMClient` backends."""
+
+    def __init__(
+        self,
+        llm: AsyncLLMClient,
+        cache: CacheBackend | None = None,
+        model: str | None = None,
+        temperature: float | None = None,
+        validate: Callable[[str], bool] | None = json_reply,
+    ):
+        super().__init__(llm, cache, model, temperature, validate)
+
+    async def complete(self, prompt: str) -> str:
+        key = self.cache_key(prompt)
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached
+        response = await self.llm.complete(prompt)
+        self.store(key, response)
+        return response
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import asyncio
+import json
 import os
+from typing import Any, AsyncIterator, Iterator
+
 import httpx
 from ..errors import LLMNotConfiguredError
 
 
-class OpenAICompatClient:
-    """
-    Minimal OpenAI-compatible Chat Completions client.
-    Works for OpenAI or compatible gateways (via OPENAI_BASE_URL).
-    """
+# Sentinel data line closing an OpenAI streaming response
+SSE_DONE = "[DONE]"
+
+
+class _OpenAICompatConfig:
+    """Shared configuration and request shape for the sync and async clients."""
 
     def __init__(
         self,
@@ -24,11 +29,12 @@ class OpenAICompatClient:
         )
         self.model = model
         self.timeout = timeout
+        self.temperature = 0.0
 
         if not self.api_key:
             raise LLMNotConfiguredError("OPENAI_API_KEY not set")
 
-    def complete(self, prompt: str) -> str:
+    def _request(self, prompt: str) -> tuple[str, dict[str, str], dict[str, Any]]:
         url = f"{self.base_url}/chat/completions"
         headers = {"Authorization": f"Bearer {self.api_key}"}
         payload = {
@@ -37,11 +43,162 @@ class OpenAICompatClient:
                 {"role": "system", "content": "You output ONLY valid JSON. No prose."},
                 {"role": "user", "content": prompt},
             ],
-            "temperature": 0.0,
+            "temperature": self.temperature,
         }
+        return url, headers, payload
+
+    @staticmethod
+    def _content(data: dict[str, Any]) -> str:
+        return data["choices"][0]["message"]["content"]
+
+    @staticmethod
+    def _sse_data(line: str) -> str | None:
+        """Payload of a server-sent-events `data:` line (None for other lines)."""
+        if not line.startswith("data:"):
+            return None
+        return line[5:].strip() or None
+
+    @staticmethod
+    def _delta(data: str) -> str:
+        choices = json.loads(data).get("choices") or [{}]
+        return (choices[0].get("delta") or {}).get("content") or ""
+
+
+class OpenAICompatClient(_OpenAICompatConfig):
+    """
+    Minimal OpenAI-compatible Chat Completions client.
+    Works for OpenAI or compatible gateways (via OPENAI_BASE_URL).
+
+    A single pooled `httpx.Client` is kept for the lifetime of the instance so
+    TCP/TLS connections are reused across calls. Use it as a context manager or
+    call `close()` to release the pool. `http2=True` needs `prompt-ast[http2]`.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        model: str = "gpt-4o-mini",
+        timeout: float = 30.0,
+        max_connections: int = 10,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+    ):
+        super().__init__(api_key=api_key, base_url=base_url, model=model, timeout=timeout)
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        try:
+            self._client = httpx.Client(timeout=timeout, limits=limits, http2=http2)
+        except ImportError as e:
+            raise ImportError(
+                "Install HTTP/2 support: pip install prompt-ast[http2]"
+            ) from e
+
+    def complete(self, prompt: str) -> str:
+        url, headers, payload = self._request(prompt)
+
+        r = self._client.post(url, headers=headers, json=payload)
+        r.raise_for_status()
+        return self._content(r.json())
+
+    def stream(self, prompt: str) -> Iterator[str]:
+        """
+        Yield the completion's content deltas from a `stream: true` request.
+
+        Closing the iterator early closes the response, so the rest of the
+        completion is neither downloaded nor waited for.
+        """
+        url, headers, payload = self._request(prompt)
+        payload["stream"] = True
 
-        with httpx.Client(timeout=self.timeout) as client:
-            r = client.post(url, headers=headers, json=payload)
+        with self._client.stream("POST", url, headers=headers, json=payload) as r:
             r.raise_for_status()
-            data = r.json()
-            return data["choices"][0]["message"]["content"]
+            for line in r.iter_lines():
+                data = self._sse_data(line)
+                if data == SSE_DONE:
+                    return
+                if data and (content := self._delta(data)):
+                    yield content
+
+    def close(self) -> None:
+        self._client.close()
+
+    def __enter__(self) -> OpenAICompatClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class AsyncOpenAICompatClient(_OpenAICompatConfig):
+    """
+    Async OpenAI-compatible Chat Completions client.
+
+    One `httpx.AsyncClient` is shared across calls; `max_concurrency` bounds the
+    number of requests in flight, however many parses are awaiting it.
+    Use as an async context manager or call `aclose()` when done.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        base_url: str | None = None,
+        model: str = "gpt-4o-mini",
+        timeout: float = 30.0,
+        max_concurrency: int = 16,
+    ):
+        super().__init__(api_key=api_key, base_url=base_url, model=model, timeout=timeout)
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client: httpx.AsyncClient | None = None
+
+    async def complete(self, prompt: str) -> str:
+        url, headers, payload = self._request(prompt)
+
+        async with self._semaphore:
+            r = await self._http().post(url, headers=headers, json=payload)
+        r.raise_for_status()
+        return self._content(r.json())
+
+    async def stream(self, prompt: str) -> AsyncIterator[str]:
+        """Async counterpart of `OpenAICompatClient.stream`; holds a concurrency slot."""
+        url, headers, payload = self._request(prompt)
+        payload["stream"] = True
+
+        async with self._semaphore:
+            async with self._http().stream(
+                "POST", url, headers=headers, json=payload
+            ) as r:
+                r.raise_for_status()
+                async for line in r.aiter_lines():
+                    data = self._sse_data(line)
+                    if data == SSE_DONE:
+                        return
+                    if data and (content := self._delta(data)):
+                        yield content
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            limits = httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            )
+            self._client = httpx.AsyncClient(timeout=self.timeout, limits=limits)
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def __aenter__(self) -> AsyncOpenAICompatClient:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
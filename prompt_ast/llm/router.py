@@ -0,0 +1,494 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Sequence
+
+from ..errors import NoBackendAvailableError, ParseError
+from .base import json_reply
+
+# Hedge delays use each backend's latency over this many recent successes
+LATENCY_WINDOW = 256
+# Until a backend has this many samples, `initial_hedge_delay` is used instead
+HEDGE_MIN_SAMPLES = 20
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit: opens after `failure_threshold` consecutive
+    failures, and after `reset_timeout` seconds lets one trial request
+    through (half open). The trial's success closes the circuit, its
+    failure opens it again.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be >= 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if self.clock() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def available(self) -> bool:
+        """Whether a request may be sent now; does not claim the half-open trial."""
+        with self._lock:
+            state = self._state()
+            return state == CLOSED or (state == HALF_OPEN and not self._trial)
+
+    def acquire(self) -> str | None:
+        """
+        Claim permission to send one request: the state it was granted in
+        (`HALF_OPEN` for the trial, which the request then owns), or None.
+        """
+        with self._lock:
+            state = self._state()
+            if state == HALF_OPEN and not self._trial:
+                self._trial = True
+                return HALF_OPEN
+            return CLOSED if state == CLOSED else None
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial or self.failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+            self._trial = False
+
+    def release(self) -> None:
+        """Give back a claimed trial whose request was cancelled unanswered."""
+        with self._lock:
+            self._trial = False
+
+
+class Backend:
+    """
+    One LLM client behind a router, with its weight and health state.
+
+    Without a `breaker`, the router gives the backend one built from its own
+    `failure_threshold`, `reset_timeout` and `clock`.
+    """
+
+    def __init__(
+        self,
+        llm: Any,
+        weight: float = 1.0,
+        name: str | None = None,
+        breaker: CircuitBreaker | None = None,
+    ):
+        if weight <= 0:
+            raise ValueError("weight must be > 0")
+        self.llm = llm
+        self.weight = weight
+        self.name = name or _backend_name(llm)
+        self.breaker = breaker
+        self.latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.requests = 0
+        self.failures = 0
+        self.wins = 0
+        # Smooth weighted round-robin state
+        self._current = 0.0
+
+
+def _quantile(samples: list[float], q: float) -> float | None:
+    """Latency quantile of `samples`, or None without enough of them."""
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    samples.sort()
+    return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+def _backend_name(llm: Any) -> str:
+    parts = [getattr(llm, "base_url", None), getattr(llm, "model", None)]
+    named = [str(p) for p in parts if p]
+    return " ".join(named) if named else type(llm).__name__
+
+
+class _Router:
+    """Backend selection, hedge timing and counters shared by the sync and async routers."""
+
+    def __init__(
+        self,
+        backends: Sequence[Any],
+        hedge: bool,
+        hedge_quantile: float,
+        initial_hedge_delay: float,
+        failure_threshold: int,
+        reset_timeout: float,
+        validate: Callable[[str], bool] | None,
+        clock: Callable[[], float],
+    ):
+        if not backends:
+            raise ValueError("at least one backend is required")
+        if not 0.0 < hedge_quantile <= 1.0:
+            raise ValueError("hedge_quantile must be in (0, 1]")
+        self.backends = [b if isinstance(b, Backend) else Backend(b) for b in backends]
+        for backend in self.backends:
+            if backend.breaker is None:
+                backend.breaker = CircuitBreaker(failure_threshold, reset_timeout, clock)
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.initial_hedge_delay = initial_hedge_delay
+        self.validate = validate
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def candidates(self) -> list[Backend]:
+        """
+        Backends to try for one request, in order: the weighted round-robin
+        pick first, then the other available backends, fastest tail first.
+        """
+        with self._lock:
+            self.requests += 1
+            available = [b for b in self.backends if b.breaker.available()]
+            if not available:
+                raise NoBackendAvailableError(
+                    "Every LLM backend has an open circuit; retry later."
+                )
+            total = sum(b.weight for b in available)
+            for backend in available:
+                backend._current += backend.weight
+            primary = max(available, key=lambda b: b._current)
+            primary._current -= total
+        others = sorted(
+            (b for b in available if b is not primary), key=self.hedge_delay
+        )
+        return [primary, *others]
+
+    def hedge_delay(self, backend: Backend) -> float:
+        """How long to wait for `backend` before sending a duplicate elsewhere."""
+        with self._lock:
+            samples = list(backend.latencies)
+        delay = _quantile(samples, self.hedge_quantile)
+        return self.initial_hedge_delay if delay is None else delay
+
+    def checked(self, backend: Backend, reply: str) -> str:
+        if self.validate is not None and not self.validate(reply):
+            raise ParseError(f"LLM backend {backend.name} returned an invalid reply")
+        return reply
+
+    def record(self, backend: Backend, elapsed: float | None) -> None:
+        """Outcome of one request: its latency on success, None on failure."""
+        with self._lock:
+            backend.requests += 1
+            if elapsed is None:
+                backend.failures += 1
+            else:
+                backend.latencies.append(elapsed)
+        if elapsed is None:
+            backend.breaker.record_failure()
+        else:
+            backend.breaker.record_success()
+
+    def hedge_after(self, backend: Backend | None, remaining: list[Backend]) -> float | None:
+        """Seconds to wait on `backend`'s request before hedging it, or None for no hedge."""
+        if not self.hedge or backend is None or not remaining:
+            return None
+        return self.hedge_delay(backend)
+
+    def hedge_deadline(self, backend: Backend | None, remaining: list[Backend]) -> float | None:
+        """Monotonic time to hedge `backend`'s request, or None for no hedge."""
+        delay = self.hedge_after(backend, remaining)
+        return None if delay is None else time.monotonic() + delay
+
+    def won(
+        self, backend: Backend, hedge_backend: Backend | None, failed_over: bool
+    ) -> None:
+        """Count the request answered by `backend`."""
+        with self._lock:
+            backend.wins += 1
+            self.hedged += hedge_backend is not None
+            self.hedge_wins += backend is hedge_backend
+            self.failovers += failed_over
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            backends = [
+                {
+                    "name": b.name,
+                    "weight": b.weight,
+                    "state": b.breaker.state,
+                    "requests": b.requests,
+                    "failures": b.failures,
+                    "wins": b.wins,
+                    "p95_ms": _ms(_quantile(list(b.latencies), 0.95)),
+                }
+                for b in self.backends
+            ]
+            return {
+                "requests": self.requests,
+                "hedged": self.hedged,
+                "hedge_wins": self.hedge_wins,
+                "failovers": self.failovers,
+                "backends": backends,
+            }
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+class LLMRouter(_Router):
+    """
+    `LLMClient` spreading requests over several backends (base URLs or models).
+
+    Each request goes to a backend picked by smooth weighted round-robin. If
+    it has not answered within its recent `hedge_quantile` latency (p95 by
+    default; `initial_hedge_delay` until it has `HEDGE_MIN_SAMPLES`
+    successes), a duplicate is sent to the next backend and the first valid
+    reply wins. Errors and replies failing `validate` (by default: not JSON)
+    fail over to the next backend at once. A backend's circuit opens after
+    `failure_threshold` consecutive failures and it is routed around until a
+    trial request succeeds, `reset_timeout` seconds later.
+
+    Backend calls run on a thread pool of `max_workers`; the hedge delay
+    counts from when a call starts there, not from when it was queued. A
+    losing hedge is left to finish, its outcome still counted. `stats()`
+    reports per-backend state, latency and hedge counters.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[Any],
+        *,
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        initial_hedge_delay: float = 1.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        validate: Callable[[str], bool] | None = json_reply,
+        clock: Callable[[], float] = time.monotonic,
+        max_workers: int = 32,
+    ):
+        super().__init__(
+            backends,
+            hedge,
+            hedge_quantile,
+            initial_hedge_delay,
+            failure_threshold,
+            reset_timeout,
+            validate,
+            clock,
+        )
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="prompt-ast-router")
+
+    def complete(self, prompt: str) -> str:
+        candidates = self.candidates()
+        pending: dict[Future[str], Backend] = {}
+        # When the call to hedge started (set by `_call`) and how long to give it
+        hedge_timer: tuple[Future[float], float] | None = None
+        hedge_backend: Backend | None = None
+        failed_over = False
+        error: Exception | None = None
+
+        def launch() -> Backend | None:
+            nonlocal hedge_timer
+            while candidates:
+                backend = candidates.pop(0)
+                if backend.breaker.acquire():
+                    started: Future[float] = Future()
+                    pending[self._pool.submit(self._call, backend, prompt, started)] = backend
+                    delay = self.hedge_after(backend, candidates)
+                    hedge_timer = None if delay is None else (started, delay)
+                    return backend
+            hedge_timer = None
+            return None
+
+        launch()
+        while pending:
+            waiting: list[Future[Any]] = list(pending)
+            timeout = None
+            if hedge_timer is not None:
+                started, delay = hedge_timer
+                if started.done():
+                    timeout = max(0.0, started.result() + delay - time.monotonic())
+                else:
+                    waiting.append(started)  # still queued: no hedge clock yet
+            done, _ = wait(waiting, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedge_backend = launch()
+                hedge_timer = None
+                continue
+            for future in done:
+                if future not in pending:
+                    continue  # the call to hedge has started
+                backend = pending.pop(future)
+                try:
+                    reply = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                self.won(backend, hedge_backend, failed_over)
+                return reply
+            if not pending and candidates:
+                failed_over = True
+                launch()
+                if hedge_backend is not None:
+                    hedge_timer = None
+        raise error or NoBackendAvailableError(
+            "Every LLM backend has an open circuit; retry later."
+        )
+
+    def _call(self, backend: Backend, prompt: str, started: Future[float]) -> str:
+        began = time.monotonic()
+        started.set_result(began)
+        try:
+            reply = self.checked(backend, backend.llm.complete(prompt))
+        except Exception:
+            self.record(backend, None)
+            raise
+        self.record(backend, time.monotonic() - began)
+        return reply
+
+    def close(self) -> None:
+        """Stop the thread pool and close the backends' clients."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        for backend in self.backends:
+            close = getattr(backend.llm, "close", None)
+            if close is not None:
+                close()
+
+    def __enter__(self) -> LLMRouter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+class AsyncLLMRouter(_Router):
+    """
+    Async counterpart of `LLMRouter` for `AsyncLLMClient` backends.
+
+    Requests run as tasks on the caller's event loop; once one reply wins,
+    the other in-flight requests are cancelled.
+    """
+
+    def __init__(
+        self,
+        backends: Sequence[Any],
+        *,
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        initial_hedge_delay: float = 1.0,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        validate: Callable[[str], bool] | None = json_reply,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        super().__init__(
+            backends,
+            hedge,
+            hedge_quantile,
+            initial_hedge_delay,
+            failure_threshold,
+            reset_timeout,
+            validate,
+            clock,
+        )
+
+    async def complete(self, prompt: str) -> str:
+        candidates = self.candidates()
+        pending: dict[asyncio.Future[str], Backend] = {}
+        hedge_backend: Backend | None = None
+        failed_over = False
+        error: Exception | None = None
+
+        def launch() -> Backend | None:
+            while candidates:
+                backend = candidates.pop(0)
+                granted = backend.breaker.acquire()
+                if granted:
+                    trial = granted == HALF_OPEN
+                    pending[asyncio.ensure_future(self._call(backend, prompt, trial))] = backend
+                    return backend
+            return None
+
+        hedge_at = self.hedge_deadline(launch(), candidates)
+        try:
+            while pending:
+                timeout = None if hedge_at is None else max(0.0, hedge_at - time.monotonic())
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    hedge_backend, hedge_at = launch(), None
+                    continue
+                for task in done:
+                    backend = pending.pop(task)
+                    try:
+                        reply = task.result()
+                    except Exception as e:
+                        error = e
+                        continue
+                    self.won(backend, hedge_backend, failed_over)
+                    return reply
+                if not pending and candidates:
+                    failed_over = True
+                    launched = launch()
+                    hedge_at = None if hedge_backend else self.hedge_deadline(launched, candidates)
+        finally:
+            for task in pending:
+                task.cancel()
+        raise error or NoBackendAvailableError(
+            "Every LLM backend has an open circuit; retry later."
+        )
+
+    async def _call(self, backend: Backend, prompt: str, trial: bool) -> str:
+        started = time.perf_counter()
+        try:
+            reply = self.checked(backend, await backend.llm.complete(prompt))
+        except asyncio.CancelledError:
+            if trial:  # only the trial's owner may give it back
+                backend.breaker.release()
+            raise
+        except Exception:
+            self.record(backend, None)
+            raise
+        self.record(backend, time.perf_counter() - started)
+        return reply
+
+    async def aclose(self) -> None:
+        """Close the backends' clients."""
+        for backend in self.backends:
+            aclose = getattr(backend.llm, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    async def __aenter__(self) -> AsyncLLMRouter:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.aclose()
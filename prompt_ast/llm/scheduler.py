@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, ContextManager, Iterator
+
+import httpx
+
+from ..tokens import estimate_tokens
+from .base import AsyncLLMClient, LLMClient
+
+# Statuses worth retrying: throttling, timeouts and transient gateway errors
+RETRYABLE_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate_per_minute`, holding at most
+    `capacity` (default: one minute's worth).
+
+    `reserve()` never blocks: it takes the tokens immediately, letting the
+    balance go negative, and returns how long the caller must wait before
+    using them, so concurrent callers are served in reservation order.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be > 0")
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        if self.capacity <= 0:
+            raise ValueError("capacity must be > 0")
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float = 1.0) -> float:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= amount
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+def retry_after_seconds(response: Any, now: float | None = None) -> float | None:
+    """Delay requested by a `Retry-After` header (seconds or HTTP date), if any."""
+    headers = getattr(response, "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, when.timestamp() - now)
+
+
+class _Scheduler:
+    """Rate limits, retry policy and counters shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        llm: Any,
+        requests_per_minute: float | None,
+        tokens_per_minute: float | None,
+        max_retries: int,
+        base_delay: float,
+        max_delay: float,
+        jitter: bool,
+        estimate: Callable[[str], int],
+        clock: Callable[[], float],
+    ):
+        if max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+        if base_delay < 0 or max_delay < 0:
+            raise ValueError("base_delay and max_delay must be >= 0")
+        self.llm = llm
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.estimate = estimate
+        self.clock = clock
+        self.request_bucket = (
+            TokenBucket(requests_per_minute, clock=clock) if requests_per_minute else None
+        )
+        self.token_bucket = (
+            TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute else None
+        )
+        # A throttling reply pauses every caller, not only the one that got it
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.failures = 0
+        self.wait_seconds = 0.0
+
+    def admission_delay(self, prompt: str) -> float:
+        """Seconds to wait before sending `prompt`, reserving its rate-limit budget."""
+        delay = max(0.0, self._paused_until - self.clock())
+        if self.request_bucket is not None:
+            delay = max(delay, self.request_bucket.reserve(1))
+        if self.token_bucket is not None:
+            delay = max(delay, self.token_bucket.reserve(self.estimate(prompt)))
+        return delay
+
+    def retry_delay(self, exc: Exception, attempt: int) -> float | None:
+        """Backoff before retry number `attempt + 1`, or None if `exc` is final."""
+        delay = self._backoff(exc, attempt)
+        if delay is None:
+            with self._lock:
+                self.failures += 1
+        return delay
+
+    def _backoff(self, exc: Exception, attempt: int) -> float | None:
+        if isinstance(exc, httpx.HTTPStatusError):
+            status: int | None = exc.response.status_code
+            if status not in RETRYABLE_STATUSES:
+                return None
+            requested = retry_after_seconds(exc.response)
+        elif isinstance(exc, httpx.TransportError):
+            status = requested = None
+        else:
+            return None
+        if attempt >= self.max_retries:
+            return None
+
+        if requested is not None:
+            delay = min(self.max_delay, requested)
+        else:
+            delay = min(self.max_delay, self.base_delay * 2**attempt)
+            if self.jitter:
+                delay = random.uniform(0, delay)
+        with self._lock:
+            self.retries += 1
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                self._paused_until = max(self._paused_until, self.clock() + delay)
+        return delay
+
+    @contextmanager
+    def _counted(self, counter: str) -> Iterator[None]:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        try:
+            yield
+        finally:
+            with self._lock:
+                setattr(self, counter, getattr(self, counter) - 1)
+
+    def queued_slot(self) -> ContextManager[None]:
+        """Counts the caller in `queue_depth` while it waits for admission or a retry."""
+        return self._counted("queued")
+
+    def in_flight_slot(self, waited: float) -> ContextManager[None]:
+        with self._lock:
+            self.requests += 1
+            self.wait_seconds += waited
+        return self._counted("in_flight")
+
+    def stats(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "queue_depth": self.queued,
+                "in_flight": self.in_flight,
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "failures": self.failures,
+                "wait_seconds": self.wait_seconds,
+            }
+
+
+class ScheduledLLMClient(_Scheduler):
+    """
+    `LLMClient` wrapper that paces requests and retries transient failures.
+
+    Requests are admitted through optional token buckets for requests/min and
+    (estimated) tokens/min. `httpx` transport errors and 408/429/5xx replies are
+    retried up to `max_retries` times with exponential backoff (full jitter),
+    or after the reply's `Retry-After` when present; a 429/503 also pauses
+    every other caller for that long. Other errors propagate at once.
+    `stats()` reports queue depth, in-flight requests and retry counters.
+    """
+
+    def __init__(
+        self,
+        llm: LLMClient,
+        *,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        jitter: bool = True,
+        estimate: Callable[[str], int] = estimate_tokens,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        super().__init__(
+            llm,
+            requests_per_minute,
+            tokens_per_minute,
+            max_retries,
+            base_delay,
+            max_delay,
+            jitter,
+            estimate,
+            clock,
+        )
+        self.sleep = sleep
+
+    def complete(self, prompt: str) -> str:
+        attempt = 0
+        while True:
+            with self.queued_slot():
+                delay = self.admission_delay(prompt)
+                if delay > 0:
+                    self.sleep(delay)
+            with self.in_flight_slot(delay):
+                try:
+                    return self.llm.complete(prompt)
+                except Exception as e:
+                    backoff = self.retry_delay(e, attempt)
+                    if backoff is None:
+                        raise
+            with self.queued_slot():
+                self.sleep(backoff)
+            attempt += 1
+
+
+class AsyncScheduledLLMClient(_Scheduler):
+    """Async counterpart of `ScheduledLLMClient` for `AsyncLLMClient` backends."""
+
+    def __init__(
+        self,
+        llm: AsyncLLMClient,
+        *,
+        requests_per_minute: float | None = None,
+        tokens_per_minute: float | None = None,
+        max_retries: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        jitter: bool = True,
+        estimate: Callable[[str], int] = estimate_tokens,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Any] = asyncio.sleep,
+    ):
+        super().__init__(
+            llm,
+            requests_per_minute,
+            tokens_per_minute,
+            max_retries,
+            base_delay,
+            max_delay,
+            jitter,
+            estimate,
+            clock,
+        )
+        self.sleep = sleep
+
+    async def complete(self, prompt: str) -> str:
+        attempt = 0
+        while True:
+            with self.queued_slot():
+                delay = self.admission_delay(prompt)
+                if delay > 0:
+                    await self.sleep(delay)
+            with self.in_flight_slot(delay):
+                try:
+                    return await self.llm.complete(prompt)
+                except Exception as e:
+                    backoff = self.retry_delay(e, attempt)
+                    if backoff is None:
+                        raise
+            with self.queued_slot():
+                await self.sleep(backoff)
+            attempt += 1
@@ -1,5 +1,63 @@
-from .heuristic import parse_prompt_heuristic
-from .llm import parse_prompt_llm
-from .hybrid import parse_prompt_hybrid
+from __future__ import annotations
 
-__all__ = ["parse_prompt_heuristic", "parse_prompt_llm", "parse_prompt_hybrid"]
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .heuristic import parse_prompt_heuristic, parse_prompt_heuristic_lite
+    from .hybrid import parse_prompt_hybrid, parse_prompt_hybrid_async
+    from .llm import (
+        parse_prompt_llm,
+        parse_prompt_llm_async,
+        parse_prompt_llm_stream,
+        parse_prompt_llm_stream_async,
+        parse_prompts_llm,
+        parse_prompts_llm_async,
+    )
+    from .mapped import parse_prompt_file
+    from .stream import parse_prompt_stream
+
+# Parsers are imported on first access, so loading one mode does not pull in the others.
+_LAZY_ATTRS = {
+    "parse_prompt_heuristic": ".heuristic",
+    "parse_prompt_heuristic_lite": ".heuristic",
+    "parse_prompt_llm": ".llm",
+    "parse_prompt_llm_async": ".llm",
+    "parse_prompt_llm_stream": ".llm",
+    "parse_prompt_llm_stream_async": ".llm",
+    "parse_prompts_llm": ".llm",
+    "parse_prompts_llm_async": ".llm",
+    "parse_prompt_hybrid": ".hybrid",
+    "parse_prompt_hybrid_async": ".hybrid",
+    "parse_prompt_stream": ".stream",
+    "parse_prompt_file": ".mapped",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
+
+
+__all__ = [
+    "parse_prompt_heuristic",
+    "parse_prompt_heuristic_lite",
+    "parse_prompt_llm",
+    "parse_prompt_llm_async",
+    "parse_prompt_llm_stream",
+    "parse_prompt_llm_stream_async",
+    "parse_prompts_llm",
+    "parse_prompts_llm_async",
+    "parse_prompt_hybrid",
+    "parse_prompt_hybrid_async",
+    "parse_prompt_stream",
+    "parse_prompt_file",
+]
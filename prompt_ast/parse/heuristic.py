@@ -1,7 +1,17 @@
 from __future__ import annotations
 
 import re
-from ..ast import PromptAST
+import string
+from dataclasses import dataclass
+from functools import cache, lru_cache
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from ..lite import PromptASTLite
+
+if TYPE_CHECKING:
+    # pydantic loads only once a PromptAST is built (see PromptASTLite.to_ast)
+    from ..ast import PromptAST
 
 
 ROLE_PATTERNS = [
@@ -10,69 +20,262 @@ ROLE_PATTERNS = [
     r"(?:(?:^|[.\n])\s*)as a(n)? (?P<role>[^,\n.]+)",
 ]
 
+# IGNORECASE disables the regex engine's literal-prefix scan, so ASCII prompts are
+# matched through their lowercase copy with the patterns below (anchored on a
+# literal), and the compiled ROLE_PATTERNS only serve non-ASCII prompts, whose
+# lowercase form may not line up character-for-character with the original.
+_ROLE_RES = [re.compile(p, re.IGNORECASE) for p in ROLE_PATTERNS]
+_ACT_AS_RE = re.compile(r"\bact as (an? )?(?P<role>[^.\n]+)")
+_YOU_ARE_RE = re.compile(r"\byou are (an? )?(?P<role>[^.\n]+)")
+_AS_A_RE = re.compile(r"as a(n)? (?P<role>[^,\n.]+)")
+
+_SECTION_HEADER_RE = re.compile(
+    r"(?im)^(?:#+\s*|\d+\.\s*)?(context|task|constraints|output|result|background|goal|requirements?)\s*:?\s*(.*)$"
+)
+# First characters a (stripped) header line can start with, besides digits.
+_SECTION_HEADER_STARTS = frozenset("#cCtToOrRbBgG")
+_SECTION_ALIASES = {
+    "background": "context",
+    "goal": "task",
+    "requirements": "constraints",
+    "requirement": "constraints",
+}
+
+_SENTENCE_BREAK_RE = re.compile(r"[.!?]\s+")
+_AS_A_PREFIX_RE = re.compile(r"(?i)^as an?\s+")
+_AS_A_CLAUSE_RE = re.compile(r"(?i)^as an?\s+[^,]+,\s*")
+
+_SECTIONS_LIST_RE = re.compile(r"sections?\s*:\s*([^.\n]+)")
+_SECTIONS_LIST_ICASE_RE = re.compile(
+    r"(?:with\s+)?sections?\s*:\s*([^.\n]+)", re.IGNORECASE
+)
+_WITH_LIST_RE = re.compile(r"with\s*:\s*([^.\n]+)")
+_INCLUDE_LIST_RE = re.compile(r"include\s*:\s*([^.\n]+)")
+_WITH_LIST_ICASE_RE = re.compile(r"(?:with|include)\s*:\s*([^.\n]+)", re.IGNORECASE)
+
+# Checked in priority order, not by position in the prompt.
+_OUTPUT_FORMATS = ("json", "yaml", "markdown", "table")
+_OUTPUT_FORMAT_RES = {fmt: re.compile(rf"\b{fmt}\b") for fmt in _OUTPUT_FORMATS}
+
 
 def parse_prompt_heuristic(text: str) -> PromptAST:
+    return parse_prompt_heuristic_lite(text).to_ast()
+
+
+def parse_prompt_heuristic_lite(text: str) -> PromptASTLite:
+    """`parse_prompt_heuristic` without building the pydantic model."""
     raw = text.strip()
-    ast = PromptAST(raw=raw)
 
     # 1) role
-    ast.role = _infer_role(raw)
+    role = _infer_role(raw)
 
-    # 2) labeled sections (Context/Task/Constraints/Output)
+    # 2) labeled sections (Context/Task/Constraints/Output); prefer explicit task
     sections = _split_labeled_sections(raw)
-    if sections.get("context"):
-        ast.context = sections["context"].strip() or None
+    inferred_task = None if sections.get("task") else _infer_task(raw)
+
+    # 3) infer output format + constraints from common phrases
+    fmt = _infer_output_format(raw.lower())
+    constraints = _infer_constraints(raw)
+    structure = _extract_output_structure(raw)
+
+    return _assemble_lite(
+        raw,
+        role=role,
+        sections=sections,
+        inferred_task=inferred_task,
+        fmt=fmt,
+        inferred_constraints=constraints,
+        structure=structure,
+        # 4) infer ambiguities
+        infer_ambiguities=lambda task, context: _ambiguities_in(raw, task, context),
+    )
+
+
+# Per-field confidence by how the field was obtained: an explicit labeled
+# section or phrase beats an inferred sentence, which beats nothing at all.
+# Missing optional fields (role, context, output spec) score near the middle,
+# since many well-formed prompts simply do not state them.
+FIELD_CONFIDENCE = {
+    "role": {"matched": 0.9, "missing": 0.6},
+    "context": {"section": 0.95, "missing": 0.5},
+    "task": {"section": 0.95, "inferred": 0.6, "missing": 0.1},
+    "constraints": {"section": 0.9, "inferred": 0.7, "missing": 0.5},
+    "output_spec": {"format": 0.85, "section": 0.8, "structure": 0.75, "missing": 0.6},
+}
+# Weights of each field in the overall `confidence`
+CONFIDENCE_WEIGHTS = {
+    "role": 1.0,
+    "context": 1.0,
+    "task": 3.0,
+    "constraints": 2.0,
+    "output_spec": 1.0,
+}
+# Each flagged ambiguity lowers the overall confidence, up to the cap
+AMBIGUITY_PENALTY = 0.05
+MAX_AMBIGUITY_PENALTY = 0.2
+
+
+def heuristic_confidence(
+    *,
+    role: str | None,
+    sections: dict[str, str],
+    task: str | None,
+    inferred_constraints: list[str],
+    fmt: str | None,
+    structure: list[str],
+) -> dict[str, float]:
+    """
+    Confidence in each extracted field, from how the heuristic parser found it.
+
+    Keys are those of `FIELD_CONFIDENCE`; see `overall_confidence` for the
+    single score stored in `metadata["confidence"]`.
+    """
+    if sections.get("task"):
+        task_source = "section"
+    else:
+        task_source = "inferred" if task else "missing"
+    if sections.get("constraints"):
+        constraints_source = "section"
+    else:
+        constraints_source = "inferred" if inferred_constraints else "missing"
+    if fmt:
+        output_source = "format"
+    elif sections.get("output") or sections.get("result"):
+        output_source = "section"
+    else:
+        output_source = "structure" if structure else "missing"
+    sources = {
+        "role": "matched" if role else "missing",
+        "context": "section" if sections.get("context") else "missing",
+        "task": task_source,
+        "constraints": constraints_source,
+        "output_spec": output_source,
+    }
+    return {name: FIELD_CONFIDENCE[name][source] for name, source in sources.items()}
+
+
+def overall_confidence(fields: dict[str, float], ambiguities: int = 0) -> float:
+    """Weighted mean of `fields`, less `AMBIGUITY_PENALTY` per ambiguity (capped)."""
+    total = sum(CONFIDENCE_WEIGHTS[name] for name in fields)
+    mean = sum(score * CONFIDENCE_WEIGHTS[name] for name, score in fields.items()) / total
+    penalty = min(ambiguities * AMBIGUITY_PENALTY, MAX_AMBIGUITY_PENALTY)
+    return round(max(mean - penalty, 0.0), 2)
+
+
+@cache
+def _heuristic_metadata(
+    fields: tuple[tuple[str, float], ...], ambiguities: int
+) -> MappingProxyType:
+    # Scores take few distinct values, so ASTs share one read-only mapping per
+    # combination; `PromptASTLite.to_ast()` copies it.
+    return MappingProxyType(
+        {
+            "extracted_by": "heuristic",
+            "confidence": overall_confidence(dict(fields), ambiguities),
+            "field_confidence": MappingProxyType(dict(fields)),
+        }
+    )
+
+
+def _assemble_lite(
+    raw: str,
+    *,
+    role: str | None,
+    sections: dict[str, str],
+    inferred_task: str | None,
+    fmt: str | None,
+    inferred_constraints: list[str],
+    structure: list[str],
+    infer_ambiguities: Callable[[str | None, str | None], list[str]],
+) -> PromptASTLite:
+    """Combine the per-stage results into an AST (shared with streaming parsing)."""
+    context = (sections["context"].strip() or None) if sections.get("context") else None
 
-    # Prefer explicit task, else infer
     if sections.get("task"):
-        ast.task = sections["task"].strip() or None
+        task = sections["task"].strip() or None
     else:
-        ast.task = _infer_task(raw)
+        task = inferred_task
 
     # Constraints
+    constraints: list[str] = []
     if sections.get("constraints"):
-        ast.constraints.extend(_lines_to_items(sections["constraints"]))
+        constraints.extend(_lines_to_items(sections["constraints"]))
 
     # Output section -> usually constraints + output format hints
     if sections.get("output") or sections.get("result"):
         out_text = (sections.get("output") or sections.get("result") or "").strip()
         if out_text and not _contains_format_hint(out_text):
-            ast.constraints.extend(_lines_to_items(out_text))
-
-    # 3) infer output format + constraints from common phrases
-    lowered = raw.lower()
-    fmt = _infer_output_format(lowered)
-    if fmt:
-        ast.output_spec.format = fmt
-
-    ast.constraints.extend(_infer_constraints(raw))
+            constraints.extend(_lines_to_items(out_text))
 
-    # Extract output structure if specified
-    structure = _extract_output_structure(raw)
-    if structure:
-        ast.output_spec.structure = structure
-
-    # 4) infer ambiguities
-    ast.ambiguities.extend(_infer_ambiguities(raw, ast))
+    constraints.extend(inferred_constraints)
 
     # 5) dedupe for stability
-    ast.constraints = _dedupe(ast.constraints)
-    ast.ambiguities = _dedupe(ast.ambiguities)
+    ambiguities = tuple(_dedupe(infer_ambiguities(task, context)))
+    fields = heuristic_confidence(
+        role=role,
+        sections=sections,
+        task=task,
+        inferred_constraints=inferred_constraints,
+        fmt=fmt,
+        structure=structure,
+    )
+    return PromptASTLite(
+        raw=raw,
+        role=role,
+        context=context,
+        task=task,
+        constraints=tuple(_dedupe(constraints)),
+        ambiguities=ambiguities,
+        output_format=fmt or None,
+        output_structure=tuple(structure),
+        metadata=_heuristic_metadata(tuple(fields.items()), len(ambiguities)),
+    )
 
-    # MVP metadata
-    ast.metadata.setdefault("extracted_by", "heuristic")
-    ast.metadata.setdefault("confidence", 0.55)
 
-    return ast
+def _infer_role(text: str) -> str | None:
+    for candidate in _iter_role_candidates(text):
+        if candidate is not None:
+            return candidate[1]
+    return None
 
 
-def _infer_role(text: str) -> str | None:
-    for pat in ROLE_PATTERNS:
-        m = re.search(pat, text, flags=re.IGNORECASE)
-        if m and m.groupdict().get("role"):
-            role = m.group("role").strip().rstrip(".")
-            # Keep original casing roughly by slicing from original text if possible
-            return role
+def _iter_role_candidates(text: str) -> Iterator[tuple[int, str] | None]:
+    """
+    Yield the first match of each of ROLE_PATTERNS as (position, role), or None,
+    in priority order.
+    """
+    finders: tuple[Callable[[], re.Match[str] | None], ...]
+    if text.isascii():
+        lowered = text.lower()
+        finders = (
+            lambda: _match_at_anchor(_ACT_AS_RE, lowered, "act as"),
+            lambda: _match_at_anchor(_YOU_ARE_RE, lowered, "you are"),
+            lambda: _search_sentence_start_role(lowered),
+        )
+    else:
+        finders = tuple(lambda pat=pat: pat.search(text) for pat in _ROLE_RES)
+    for find in finders:
+        m = find()
+        if m is None:
+            yield None
+            continue
+        # Spans line up with the original text, so the role keeps its casing
+        yield m.start(), text[m.start("role") : m.end("role")].strip().rstrip(".")
+
+
+def _search_sentence_start_role(lowered: str) -> re.Match[str] | None:
+    """ASCII fast path for the "as a ..." role pattern, which must open a sentence or line."""
+    pos = lowered.find("as a")
+    while pos != -1:
+        # Walk back over the whitespace run before the candidate.
+        start = pos
+        while start > 0 and lowered[start - 1].isspace():
+            start -= 1
+        if start == 0 or lowered[start - 1] == "." or "\n" in lowered[start:pos]:
+            m = _AS_A_RE.match(lowered, pos)
+            if m:
+                return m
+        pos = lowered.find("as a", pos + 1)
     return None
 
 
@@ -84,51 +287,49 @@ def _split_labeled_sections(text: str) -> dict[str, str]:
     - Numbered: 1. Context: ... / 2. Task: ... / 3. Constraints: ...
     - Aliases: Background→Context, Goal→Task, Requirements→Constraints
     """
-    # Section aliases mapping
-    aliases = {
-        "background": "context",
-        "goal": "task",
-        "requirements": "constraints",
-        "requirement": "constraints",
-    }
+    splitter = _SectionSplitter()
+    for line in text.split("\n"):
+        splitter.feed(line)
+    return splitter.sections()
+
 
-    # Combined pattern for all formats with optional inline content.
-    # Matches: "Context:", "Context: ...", "## Context", "1. Context:", "Background:", etc.
-    pattern = r"(?im)^(?:#+\s*|\d+\.\s*)?(context|task|constraints|output|result|background|goal|requirements?)\s*:?\s*(.*)$"
+class _SectionSplitter:
+    """Line-at-a-time state machine behind `_split_labeled_sections`."""
 
-    lines = text.split("\n")
-    sections: dict[str, list[str]] = {}
-    current_section: str | None = None
+    def __init__(self) -> None:
+        self._sections: dict[str, list[str]] = {}
+        self._current: list[str] | None = None
 
-    for line in lines:
+    def feed(self, line: str) -> None:
+        stripped = line.strip()
         # Check if this line is a section header
-        match = re.match(pattern, line.strip())
+        match = None
+        if stripped and (
+            stripped[0] in _SECTION_HEADER_STARTS or stripped[0].isdecimal()
+        ):
+            match = _SECTION_HEADER_RE.match(stripped)
         if match:
             section_name = match.group(1).lower()
             # Apply alias mapping
-            section_name = aliases.get(section_name, section_name)
+            section_name = _SECTION_ALIASES.get(section_name, section_name)
 
             # Start new section, preserving inline content if present
-            current_section = section_name
-            if current_section not in sections:
-                sections[current_section] = []
+            self._current = self._sections.setdefault(section_name, [])
 
             inline = match.group(2).strip()
             if inline:
-                sections[current_section].append(inline)
-        elif current_section:
-            # Add content to current section
-            stripped = line.strip()
-            if stripped:  # Only add non-empty lines
-                sections[current_section].append(line)
-
-    # Join multi-line sections
-    out: dict[str, str] = {}
-    for section, lines_list in sections.items():
-        if lines_list:
-            out[section] = "\n".join(lines_list).strip()
+                self._current.append(inline)
+        elif self._current is not None and stripped:
+            # Add non-empty content lines to the current section
+            self._current.append(line)
 
-    return out
+    def sections(self) -> dict[str, str]:
+        # Join multi-line sections
+        out: dict[str, str] = {}
+        for section, lines_list in self._sections.items():
+            if lines_list:
+                out[section] = "\n".join(lines_list).strip()
+        return out
 
 
 def _infer_task(text: str) -> str | None:
@@ -136,29 +337,46 @@ def _infer_task(text: str) -> str | None:
     MVP task inference:
     - first meaningful line that is not only persona-setting
     """
-    sentences = re.split(r"(?<=[.!?])\s+", text.strip())
-    for sentence in sentences:
-        striped = sentence.strip()
-        if not striped:
-            continue
-        lower = striped.lower()
-        if "act as" in lower or "you are" in lower:
-            continue
-        if re.match(r"(?i)^as an?\s+", striped):
-            stripped = re.sub(r"(?i)^as an?\s+[^,]+,\s*", "", striped)
-            if stripped:
-                return stripped
-        return striped
+    for sentence in _iter_sentences(text.strip()):
+        task = _task_from_sentence(sentence)
+        if task is not None:
+            return task
     return None
 
 
+def _task_from_sentence(sentence: str) -> str | None:
+    """The task a sentence states, or None if it is empty or only sets a persona."""
+    striped = sentence.strip()
+    if not striped:
+        return None
+    lower = striped.lower()
+    if "act as" in lower or "you are" in lower:
+        return None
+    if _AS_A_PREFIX_RE.match(striped):
+        stripped = _AS_A_CLAUSE_RE.sub("", striped, count=1)
+        if stripped:
+            return stripped
+    return striped
+
+
+def _iter_sentences(text: str) -> Iterator[str]:
+    """Lazily split after sentence punctuation followed by whitespace."""
+    start = 0
+    for m in _SENTENCE_BREAK_RE.finditer(text):
+        yield text[start : m.start() + 1]
+        start = m.end()
+    yield text[start:]
+
+
 def _lines_to_items(text: str) -> list[str]:
     items = []
     for line in text.splitlines():
         s = line.strip()
         if not s:
             continue
-        s = re.sub(r"^[-*•]\s*", "", s)
+        # Drop one leading bullet marker and the whitespace after it
+        if s[0] in "-*•":
+            s = s[1:].lstrip()
         items.append(s)
     return items
 
@@ -170,20 +388,57 @@ def _extract_output_structure(text: str) -> list[str]:
     - 'include: X, Y, Z'
     - 'Output: ... with: P, Q, R'
     """
+    sections_list, with_list = _find_structure_lists(text)
+    return _structure_from_lists(sections_list, with_list)
+
+
+def _find_structure_lists(
+    text: str, with_fallback: bool = False
+) -> tuple[tuple[int, str] | None, tuple[int, str] | None]:
+    """
+    Position and captured text of the first "sections: ..." list and of the first
+    "with:/include: ..." list. The latter is only searched when there is no
+    sections list, unless `with_fallback` asks for it regardless.
+    """
+    if text.isascii():
+        lowered = text.lower()
+        sections_match = _SECTIONS_LIST_RE.search(lowered)
+        with_match = None
+        if with_fallback or not sections_match:
+            candidates = [
+                m
+                for m in (
+                    _WITH_LIST_RE.search(lowered),
+                    _INCLUDE_LIST_RE.search(lowered),
+                )
+                if m
+            ]
+            with_match = min(candidates, key=lambda m: m.start(), default=None)
+    else:
+        sections_match = _SECTIONS_LIST_ICASE_RE.search(text)
+        with_match = None
+        if with_fallback or not sections_match:
+            with_match = _WITH_LIST_ICASE_RE.search(text)
+
+    def captured(m: re.Match[str] | None) -> tuple[int, str] | None:
+        return (m.start(), text[m.start(1) : m.end(1)]) if m else None
+
+    return captured(sections_match), captured(with_match)
+
+
+def _structure_from_lists(
+    sections_list: tuple[int, str] | None, with_list: tuple[int, str] | None
+) -> list[str]:
     structure = []
 
     # Pattern: "with sections: A, B, C" or "sections: A, B, C"
-    sections_match = re.search(
-        r"(?:with\s+)?sections?\s*:\s*([^.\n]+)", text, re.IGNORECASE
-    )
-    if sections_match:
-        parts = sections_match.group(1).split(",")
+    if sections_list:
+        parts = sections_list[1].split(",")
         structure.extend([p.strip() for p in parts if p.strip()])
 
-    # Pattern: "with: A, B, C" or "include: A, B, C"
-    with_match = re.search(r"(?:with|include)\s*:\s*([^.\n]+)", text, re.IGNORECASE)
-    if with_match and not sections_match:  # Don't double-count
-        parts = with_match.group(1).split(",")
+    # Pattern: "with: A, B, C" or "include: A, B, C" (only without sections)
+    elif with_list:
+        parts = with_list[1].split(",")
         # Only add if they look like section names (capitalized, short)
         potential = [p.strip() for p in parts if p.strip()]
         if all(len(p.split()) <= 4 and p[0].isupper() for p in potential if p):
@@ -193,14 +448,9 @@ def _extract_output_structure(text: str) -> list[str]:
 
 
 def _infer_output_format(lowered: str) -> str | None:
-    if re.search(r"\bjson\b", lowered):
-        return "json"
-    if re.search(r"\byaml\b", lowered):
-        return "yaml"
-    if re.search(r"\bmarkdown\b", lowered):
-        return "markdown"
-    if re.search(r"\btable\b", lowered):
-        return "table"
+    for fmt in _OUTPUT_FORMATS:
+        if _match_at_anchor(_OUTPUT_FORMAT_RES[fmt], lowered, fmt):
+            return fmt
     return None
 
 
@@ -209,55 +459,122 @@ def _contains_format_hint(text: str) -> bool:
     return any(fmt in lowered for fmt in ["json", "yaml", "markdown", "table", "text"])
 
 
+# Keyword constraints: the earliest occurrence of any keyword anchors the constraint.
+CONSTRAINT_KEYWORDS: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("Be concise", ("concise", "brief")),
+    ("Be detailed", ("detailed",)),
+    # Audience specifications
+    ("For beginners", ("for beginners", "beginner")),
+    ("For experts", ("for experts", "expert")),
+    ("Explain like I'm 5", ("eli5", "like i'm 5", "like i'm five")),
+    # Tone requirements
+    ("Professional tone", ("professional tone", "professionally")),
+    ("Casual tone", ("casual",)),
+    ("Engaging", ("engaging",)),
+    ("Creative", ("creative",)),
+    ("Catchy", ("catchy",)),
+    ("Interactive", ("interactive",)),
+    ("Minimize downtime", ("minimize downtime",)),
+)
+
+# Patterns run against the lowercased prompt. Every pattern starts with a literal
+# (or is searched via its anchor literal) so the regex engine can skip ahead with
+# a fast substring scan instead of attempting a match at every position.
+_STEP_BY_STEP_RE = re.compile(r"step[-\s]by[-\s]step")
+_USE_BULLETS_RE = re.compile(r"\buse\s+bullet")
+_SET_IN_RE = re.compile(r"\bset in ([^.\n]+)")
+_LIST_N_RE = re.compile(r"(?:^|[.!?]\s+)(list\s+\d+\s+[^.\n]+)")
+_LIST_N_ANCHOR_RE = re.compile(r"list\s+\d")
+_WORD_LIMIT_RE = re.compile(r"(in|under|within)\s+(\d+)\s+words?")
+_CHAR_LIMIT_RE = re.compile(r"(in|under|within)\s+(\d+)\s+characters?")
+_BUDGET_RE = re.compile(r"budget[:\s]+\$?([\d,]+k?)")
+_TIMELINE_RE = re.compile(r"timeline[:\s]+(\d+)\s+(months?|weeks?|days?)")
+
+# Case-insensitive variants for prompts whose lowercased form does not line up
+# character-for-character with the original (non-ASCII input).
+_SET_IN_ICASE_RE = re.compile(r"\bset in ([^.\n]+)", re.IGNORECASE)
+_LIST_N_ICASE_RE = re.compile(
+    r"(?:^|[.!?]\s+)(List\s+\d+\s+[^.\n]+)", re.IGNORECASE
+)
+
+# Ties between constraints found at the same position keep this rule order.
+_CONSTRAINT_RULE_RANK = {
+    rule: rank
+    for rank, rule in enumerate(
+        [value for value, _ in CONSTRAINT_KEYWORDS]
+        + [
+            "step_by_step",
+            "bullets",
+            "set_in",
+            "list",
+            "word_limit",
+            "char_limit",
+            "no_code",
+            "troubleshooting",
+            "budget",
+            "timeline",
+        ]
+    )
+}
+
+
 def _infer_constraints(text: str) -> list[str]:
     lowered = text.lower()
-    matches: list[tuple[int, str]] = []
+    return _order_constraints(
+        _scan_constraints(text),
+        no_code_examples_needed="no code examples needed" in lowered,
+        mentions_include="include" in lowered,
+    )
 
-    def add(pos: int | None, value: str) -> None:
-        if pos is not None and pos >= 0:
-            matches.append((pos, value))
 
-    def find_first(substrings: list[str]) -> int | None:
-        positions = [lowered.find(s) for s in substrings if lowered.find(s) != -1]
-        return min(positions) if positions else None
+def _scan_constraints(text: str, at_start: bool = True) -> dict[str, tuple[int, str]]:
+    """
+    First occurrence of each constraint rule in `text`, keyed by rule name.
 
-    # Step-by-step
-    m = re.search(r"step[-\s]by[-\s]step", lowered)
-    add(m.start() if m else None, "Use step-by-step instructions")
+    "No code examples" and troubleshooting are recorded unconditionally; the
+    prompt-wide conditions on them are applied by `_order_constraints`.
+    `at_start=False` marks `text` as a window that does not begin the prompt.
+    """
+    lowered = text.lower()
+    found: dict[str, tuple[int, str]] = {}
 
-    # Concision/detail
-    add(find_first(["concise", "brief"]), "Be concise")
-    add(lowered.find("detailed") if "detailed" in lowered else None, "Be detailed")
+    def add(rule: str, pos: int | None, value: str) -> None:
+        if pos is not None and pos >= 0:
+            found[rule] = (pos, value)
 
-    # Bullets (only when explicitly requested)
-    m = re.search(r"\buse\s+bullet", lowered)
-    add(m.start() if m else None, "Use bullet points")
+    for value, keywords in CONSTRAINT_KEYWORDS:
+        add(value, _find_first(lowered, keywords), value)
 
-    # Audience specifications
-    add(find_first(["for beginners", "beginner"]), "For beginners")
-    add(find_first(["for experts", "expert"]), "For experts")
-    add(find_first(["eli5", "like i'm 5", "like i'm five"]), "Explain like I'm 5")
+    # Step-by-step
+    m = _STEP_BY_STEP_RE.search(lowered)
+    add("step_by_step", m.start() if m else None, "Use step-by-step instructions")
 
-    # Tone requirements
-    add(find_first(["professional tone", "professionally"]), "Professional tone")
-    add(lowered.find("casual") if "casual" in lowered else None, "Casual tone")
-    add(lowered.find("engaging") if "engaging" in lowered else None, "Engaging")
-    add(lowered.find("creative") if "creative" in lowered else None, "Creative")
-    add(lowered.find("catchy") if "catchy" in lowered else None, "Catchy")
-    add(lowered.find("interactive") if "interactive" in lowered else None, "Interactive")
-
-    # Contextual constraints (e.g., "Set in ...")
-    m = re.search(r"\bset in ([^.\n]+)", text, re.IGNORECASE)
-    if m:
-        add(m.start(), f"Set in {m.group(1).strip().rstrip('.')}")
-
-    # Output quantity directives like "List 5 ..."
-    m = re.search(r"(?:^|[.!?]\s+)(List\s+\d+\s+[^.\n]+)", text, re.IGNORECASE)
-    if m:
-        add(m.start(1), m.group(1).strip().rstrip("."))
+    # Bullets (only when explicitly requested)
+    m = _match_at_anchor(_USE_BULLETS_RE, lowered, "use")
+    add("bullets", m.start() if m else None, "Use bullet points")
+
+    # Contextual constraints (e.g., "Set in ...") and output quantity directives
+    # like "List 5 ..." keep the original casing of the captured text.
+    if text.isascii():
+        m = _match_at_anchor(_SET_IN_RE, lowered, "set in ")
+        if m:
+            add("set_in", m.start(), f"Set in {text[m.start(1):m.end(1)].strip().rstrip('.')}")
+        m = _search_list_directive(lowered, at_start)
+        if m:
+            add("list", m.start(1), text[m.start(1) : m.end(1)].strip().rstrip("."))
+    else:
+        m = _SET_IN_ICASE_RE.search(text)
+        if m:
+            add("set_in", m.start(), f"Set in {m.group(1).strip().rstrip('.')}")
+        m = _LIST_N_ICASE_RE.search(text)
+        if m and not at_start and m.start(1) == 0:
+            # "^" matched the window start, which is not the start of the prompt
+            m = _LIST_N_ICASE_RE.search(text, 1)
+        if m:
+            add("list", m.start(1), m.group(1).strip().rstrip("."))
 
     # Word/character limits
-    word_limit_match = re.search(r"(in|under|within)\s+(\d+)\s+words?", lowered)
+    word_limit_match = _WORD_LIMIT_RE.search(lowered) if "word" in lowered else None
     if word_limit_match:
         qualifier = word_limit_match.group(1)
         number = word_limit_match.group(2)
@@ -266,10 +583,10 @@ def _infer_constraints(text: str) -> list[str]:
             if qualifier in ("under", "within")
             else f"{number} words"
         )
-        add(word_limit_match.start(), constraint)
+        add("word_limit", word_limit_match.start(), constraint)
 
-    char_limit_match = re.search(
-        r"(in|under|within)\s+(\d+)\s+characters?", lowered
+    char_limit_match = (
+        _CHAR_LIMIT_RE.search(lowered) if "character" in lowered else None
     )
     if char_limit_match:
         qualifier = char_limit_match.group(1)
@@ -279,37 +596,96 @@ def _infer_constraints(text: str) -> list[str]:
             if qualifier in ("under", "within")
             else f"{number} characters"
         )
-        add(char_limit_match.start(), constraint)
+        add("char_limit", char_limit_match.start(), constraint)
 
     # Other common constraints
-    if "no code examples needed" not in lowered:
-        add(lowered.find("no code") if "no code" in lowered else None, "No code examples")
-    if "include" in lowered and "troubleshooting" in lowered:
-        add(lowered.find("troubleshooting"), "Include troubleshooting steps")
-    add(
-        lowered.find("minimize downtime") if "minimize downtime" in lowered else None,
-        "Minimize downtime",
-    )
+    add("no_code", lowered.find("no code"), "No code examples")
+    add("troubleshooting", lowered.find("troubleshooting"), "Include troubleshooting steps")
 
     # Extract budget/timeline if mentioned
-    budget_match = re.search(r"budget[:\s]+\$?([\d,]+k?)", lowered)
+    budget_match = _BUDGET_RE.search(lowered)
     if budget_match:
-        add(budget_match.start(), f"Budget: ${budget_match.group(1)}")
+        add("budget", budget_match.start(), f"Budget: ${budget_match.group(1)}")
 
-    timeline_match = re.search(r"timeline[:\s]+(\d+)\s+(months?|weeks?|days?)", lowered)
+    timeline_match = _TIMELINE_RE.search(lowered)
     if timeline_match:
         add(
+            "timeline",
             timeline_match.start(),
             f"Timeline: {timeline_match.group(1)} {timeline_match.group(2)}",
         )
 
-    matches.sort(key=lambda x: x[0])
-    ordered = [value for _, value in matches]
+    return found
+
+
+def _order_constraints(
+    found: dict[str, tuple[int, str]],
+    *,
+    no_code_examples_needed: bool,
+    mentions_include: bool,
+) -> list[str]:
+    """Constraint values in prompt order, audience specifications last."""
+    matches = [
+        (pos, _CONSTRAINT_RULE_RANK[rule], value)
+        for rule, (pos, value) in found.items()
+        if not (rule == "no_code" and no_code_examples_needed)
+        and not (rule == "troubleshooting" and not mentions_include)
+    ]
+    matches.sort()
+    ordered = [value for _, _, value in matches]
     audience = [v for v in ordered if v in ("For beginners", "For experts")]
     ordered = [v for v in ordered if v not in ("For beginners", "For experts")]
     return ordered + audience
 
 
+def _find_first(lowered: str, substrings: tuple[str, ...]) -> int | None:
+    positions = [pos for pos in map(lowered.find, substrings) if pos != -1]
+    return min(positions) if positions else None
+
+
+def _match_at_anchor(
+    pattern: re.Pattern[str], text: str, anchor: str
+) -> re.Match[str] | None:
+    """
+    Equivalent to ``pattern.search(text)`` for patterns whose matches always begin
+    with ``anchor``. Patterns that open with ``\\b`` defeat the regex engine's
+    literal-prefix scan, so candidates are located with ``str.find`` instead.
+    """
+    pos = text.find(anchor)
+    while pos != -1:
+        m = pattern.match(text, pos)
+        if m:
+            return m
+        pos = text.find(anchor, pos + 1)
+    return None
+
+
+def _search_list_directive(
+    lowered: str, at_start: bool = True
+) -> re.Match[str] | None:
+    """
+    First "List N ..." directive that follows a sentence end or, when `at_start`
+    is set, opens the text.
+    """
+    for anchor in _LIST_N_ANCHOR_RE.finditer(lowered):
+        start = anchor.start()
+        # Walk back over the whitespace run to the sentence terminator, if any.
+        pos = start
+        while pos > 0 and lowered[pos - 1].isspace():
+            pos -= 1
+        if start == 0:
+            if not at_start:
+                continue
+            m = _LIST_N_RE.match(lowered)
+        elif pos < start and pos > 0 and lowered[pos - 1] in ".!?":
+            m = _LIST_N_RE.match(lowered, pos - 1)
+        else:
+            continue
+        if m:
+            return m
+    return None
+
+
 def _dedupe(items: list[str]) -> list[str]:
     seen = set()
     out = []
@@ -322,119 +698,192 @@ def _dedupe(items: list[str]) -> list[str]:
     return out
 
 
-def _infer_ambiguities(text: str, ast: PromptAST) -> list[str]:
+@dataclass(frozen=True)
+class AmbiguityRule:
+    """
+    Declarative ambiguity check matched against the prompt's word tokens.
+
+    The rule fires when every trigger group has at least one of its terms in the
+    prompt and none of the suppressor terms appear. Terms are lowercase letters
+    and match anywhere inside a token (so "blog" also matches "blogging"), like
+    a substring search of the whole prompt; with `whole_word_suppressors`, the
+    suppressors must be whole tokens instead.
+    """
+
+    message: str
+    triggers: tuple[tuple[str, ...], ...]
+    suppressors: tuple[str, ...] = ()
+    whole_word_suppressors: bool = False
+    # Skip the rule when the prompt already carries a Context section.
+    unless_context: bool = False
+    # Optional refinement: when `qualifier` matches, group 1 fills `{qualifier}`.
+    qualifier: re.Pattern[str] | None = None
+    qualified_message: str | None = None
+
+    def qualify(self, lowered: str) -> tuple[int, str] | None:
+        """Position and text of the first qualifier match, if the rule has one."""
+        if self.qualifier is None or self.qualified_message is None:
+            return None
+        m = self.qualifier.search(lowered)
+        return (m.start(), m.group(1)) if m else None
+
+    def render(self, qualifier: str | None = None) -> str:
+        if qualifier is not None and self.qualified_message is not None:
+            return self.qualified_message.format(qualifier=qualifier)
+        return self.message
+
+
+AMBIGUITY_RULES: tuple[AmbiguityRule, ...] = (
+    AmbiguityRule(
+        message="Missing details about current onboarding process",
+        triggers=(("onboarding",),),
+        unless_context=True,
+    ),
+    AmbiguityRule(
+        message="Missing specific retention metrics and churn reasons",
+        triggers=(("retention",), ("strategy",)),
+        suppressors=("metric", "rate", "churn", "reason"),
+        whole_word_suppressors=True,
+    ),
+    AmbiguityRule(
+        message="Missing details about monolith size and complexity",
+        triggers=(("migration", "monolith"),),
+        suppressors=("size", "users", "traffic", "complexity"),
+    ),
+    # Missing target audience for content creation
+    AmbiguityRule(
+        message="Missing target audience specification",
+        triggers=(("blog", "article", "post", "content"),),
+        # "explain" often implies audience
+        suppressors=("beginner", "expert", "audience", "reader", "for", "explain"),
+    ),
+    AmbiguityRule(
+        message="Missing context about data structure and volume",
+        triggers=(
+            ("data",),
+            ("analyze", "clean", "visualize", "visualization", "visualisation"),
+        ),
+        suppressors=("csv", "records", "dataset", "customers"),
+        unless_context=True,
+        qualifier=re.compile(r"\b([a-z]+)\s+data\b"),
+        qualified_message="Missing context about {qualifier} data structure and volume",
+    ),
+    # Missing class/lesson details for education
+    AmbiguityRule(
+        message="Missing class duration and student prior knowledge level",
+        triggers=(("lesson", "teach"),),
+        suppressors=("duration", "minutes", "hour", "grade", "age"),
+    ),
+    # Missing CLI/tool details for documentation
+    AmbiguityRule(
+        message="Missing context about which CLI tool and target platforms",
+        triggers=(("cli",), ("tool",)),
+        unless_context=True,
+    ),
+)
+
+
+def _index_ambiguity_rules(
+    rules: tuple[AmbiguityRule, ...],
+) -> dict[str, tuple[tuple[int, int], ...]]:
+    """
+    Map each term to what it satisfies: (rule, trigger group) pairs, and
+    (rule, -1) for a suppressor matched inside tokens.
+    """
+    index: dict[str, list[tuple[int, int]]] = {}
+    for rule_idx, rule in enumerate(rules):
+        for group_idx, group in enumerate(rule.triggers):
+            for term in group:
+                index.setdefault(term, []).append((rule_idx, group_idx))
+        if not rule.whole_word_suppressors:
+            for term in rule.suppressors:
+                index.setdefault(term, []).append((rule_idx, -1))
+    return {term: tuple(refs) for term, refs in index.items()}
+
+
+_AMBIGUITY_INDEX = _index_ambiguity_rules(AMBIGUITY_RULES)
+_MAX_TERM_CHARS = max(map(len, _AMBIGUITY_INDEX))
+
+
+@lru_cache(maxsize=1 << 16)
+def _token_refs(token: str) -> tuple[tuple[int, int], ...]:
+    """
+    Index entries of every term found inside `token`. Its substrings up to the
+    longest term are looked up, so the cost does not grow with the registry;
+    results are cached, as a prompt vocabulary repeats.
+    """
+    n = len(token)
+    terms = {
+        token[start:end]
+        for start in range(n)
+        for end in range(start + 1, min(n, start + _MAX_TERM_CHARS) + 1)
+    }
+    return tuple(ref for term in terms for ref in _AMBIGUITY_INDEX.get(term, ()))
+
+
+# Punctuation is folded to whitespace so `str.split` yields bare word tokens.
+_TOKEN_SEPARATORS = str.maketrans(
+    dict.fromkeys(string.punctuation + "\u2018\u2019\u201c\u201d\u2013\u2014\u2026", " ")
+)
+
+_VAGUE_TASK_RE = re.compile(r"\b(?:help me|fix this|do something|work on this)\b")
+
+
+def _infer_ambiguities(text: str, ast: PromptAST | PromptASTLite) -> list[str]:
+    return _ambiguities_in(text, ast.task, ast.context)
+
+
+def _ambiguities_in(text: str, task: str | None, context: str | None) -> list[str]:
     """
     Detect ambiguities and missing critical information in the prompt.
+
+    Domain rules come from `AMBIGUITY_RULES`; the prompt is tokenized once and
+    only rules with a trigger term inside one of its tokens are examined.
     """
-    ambiguities = []
     lowered = text.lower()
 
-    # Vague task detection
-    vague_patterns = [
-        r"\bhelp me\b",
-        r"\bfix this\b",
-        r"\bdo something\b",
-        r"\bwork on this\b",
-    ]
+    def qualify(rule: AmbiguityRule) -> str | None:
+        found = rule.qualify(lowered)
+        return found[1] if found else None
 
-    if ast.task:
-        task_lower = ast.task.lower()
-        for pattern in vague_patterns:
-            if re.search(pattern, task_lower):
-                ambiguities.append(
-                    "Task is too vague - missing details about what bug, what code, what symptoms"
-                )
-                break
-
-    # Missing scope/boundaries when task exists but no constraints
-    if ast.task and len(ast.constraints) == 0 and len(text.split()) > 15:
-        # Only flag if it's a complex request
-        if any(
-            word in lowered
-            for word in ["design", "create", "develop", "build", "implement", "analyze"]
-        ):
-            pass  # These often imply structured output, check for that instead
-
-    # Missing output format when structured output is implied
-    structured_indicators = ["list", "summarize", "compare", "analyze", "report"]
-    if (
-        any(ind in lowered for ind in structured_indicators)
-        and not ast.output_spec.format
-    ):
-        # Check if structure is mentioned in output_spec
-        if not ast.output_spec.structure:
-            pass  # Don't flag this as it's often clear from context
-
-    # Unclear references (pronouns without antecedents)
-    unclear_refs = [r"\bthis\b", r"\bthat\b", r"\bit\b"]
-    # Only flag if these appear early in the text without prior context
-    first_sentence = text.split(".")[0].lower() if "." in text else lowered
-    for ref_pattern in unclear_refs:
-        if re.search(ref_pattern, first_sentence) and not ast.context:
-            # Check if it's part of a common phrase like "this is"
-            if not re.search(r"\bthis is\b|\bthat is\b|\bit is\b", first_sentence):
-                pass  # Don't flag common constructions
-
-    # Missing details for specific domains
-    if "onboarding" in lowered and not ast.context:
-        ambiguities.append("Missing details about current onboarding process")
-
-    if "retention" in lowered and "strategy" in lowered:
-        if not re.search(r"\b(metric|rate|churn|reason)\b", lowered):
-            ambiguities.append("Missing specific retention metrics and churn reasons")
-
-    if "migration" in lowered or "monolith" in lowered:
-        if not any(
-            word in lowered for word in ["size", "users", "traffic", "complexity"]
-        ):
-            ambiguities.append("Missing details about monolith size and complexity")
+    return _match_ambiguity_rules(task, context, _word_tokens(lowered), qualify)
 
-    # Missing target audience for content creation
-    content_types = ["blog", "article", "post", "content"]
-    if any(ct in lowered for ct in content_types):
-        if not any(
-            aud in lowered
-            for aud in ["beginner", "expert", "audience", "reader", "for"]
-        ):
-            if "explain" not in lowered:  # "explain" often implies audience
-                ambiguities.append("Missing target audience specification")
-
-    # Missing context about data
-    if "data" in lowered and any(
-        word in lowered
-        for word in ["analyze", "clean", "visualize", "visualization", "visualisation"]
-    ):
-        if not ast.context:
-            if not any(
-                detail in lowered
-                for detail in ["csv", "records", "dataset", "customers"]
-            ):
-                qualifier_match = re.search(r"\b([a-z]+)\s+data\b", lowered)
-                qualifier = qualifier_match.group(1) if qualifier_match else None
-                if qualifier:
-                    ambiguities.append(
-                        f"Missing context about {qualifier} data structure and volume"
-                    )
-                else:
-                    ambiguities.append(
-                        "Missing context about data structure and volume"
-                    )
 
-    # Missing class/lesson details for education
-    if "lesson" in lowered or "teach" in lowered:
-        if not any(
-            detail in lowered
-            for detail in ["duration", "minutes", "hour", "grade", "age"]
-        ):
-            ambiguities.append(
-                "Missing class duration and student prior knowledge level"
-            )
+def _word_tokens(lowered: str) -> set[str]:
+    return set(lowered.translate(_TOKEN_SEPARATORS).split())
 
-    # Missing CLI/tool details for documentation
-    if "cli" in lowered and "tool" in lowered:
-        if not ast.context:
-            ambiguities.append(
-                "Missing context about which CLI tool and target platforms"
-            )
+
+def _match_ambiguity_rules(
+    task: str | None,
+    context: str | None,
+    tokens: set[str],
+    qualify: Callable[[AmbiguityRule], str | None],
+) -> list[str]:
+    """Messages for the vague-task check and every rule fired by `tokens`."""
+    ambiguities = []
+
+    # Vague task detection
+    if task and _VAGUE_TASK_RE.search(task.lower()):
+        ambiguities.append(
+            "Task is too vague - missing details about what bug, what code, what symptoms"
+        )
+
+    satisfied: dict[int, set[int]] = {}
+    for token in tokens:
+        for rule_idx, group_idx in _token_refs(token):
+            satisfied.setdefault(rule_idx, set()).add(group_idx)
+
+    for rule_idx in sorted(satisfied):
+        rule = AMBIGUITY_RULES[rule_idx]
+        groups = satisfied[rule_idx]
+        if len(groups - {-1}) < len(rule.triggers):
+            continue
+        if rule.unless_context and context:
+            continue
+        if -1 in groups or (
+            rule.whole_word_suppressors and not tokens.isdisjoint(rule.suppressors)
+        ):
+            continue
+        ambiguities.append(rule.render(qualify(rule)))
 
     return ambiguities
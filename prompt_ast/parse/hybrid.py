@@ -1,9 +1,23 @@
 from __future__ import annotations
 
+import copy
+import json
+from dataclasses import dataclass, field
+from functools import cached_property, partial
+from typing import Any, Callable, Iterable
+
 from ..ast import PromptAST
-from ..llm.base import LLMClient
+from ..errors import ParseError
+from ..llm.base import AsyncLLMClient, LLMClient
+from ..tokens import estimate_tokens
 from .heuristic import parse_prompt_heuristic
-from .llm import parse_prompt_llm
+from .llm import (
+    _ast_from_llm_output,
+    _ast_from_obj,
+    _complete,
+    _complete_async,
+    _safe_json_load,
+)
 
 
 REFINE_PROMPT = """Refine the given Prompt AST based on the original prompt.
@@ -22,24 +36,377 @@ CURRENT AST JSON:
 {ast_json}
 """
 
+COMPACT_REFINE_PROMPT = """Refine the Prompt AST of the original prompt.
+Return ONLY minified JSON with the keys {keys}; a key you leave out keeps its current value.
+output_spec is {{"format","structure","language"}}. Empty fields are omitted below.
+
+Guidance:
+- Keep correct fields.
+- Fill missing fields.
+- Move output formatting requirements into constraints and output_spec.
+- Add ambiguities when key details are missing.
+
+ORIGINAL PROMPT:
+{raw}
+
+CURRENT AST JSON:
+{ast_json}
+"""
+
+PATCH_PROMPT = """Complete the Prompt AST of the original prompt.
+The current AST below is correct except for these fields: {fields}.
+Return ONLY a minified JSON object with new values for those fields
+(a JSON merge patch): omit a field to keep its current value, use null to clear it.
+output_spec is {{"format","structure","language"}}; give only the keys that change.
+
+Guidance:
+- Move output formatting requirements into constraints and output_spec.
+- Add ambiguities when key details are missing.
+
+ORIGINAL PROMPT:
+{raw}
+
+CURRENT AST JSON:
+{ast_json}
+"""
+
+# Patch mode also requests fields the heuristic parser scored below this
+PATCH_FOCUS_BELOW = 0.8
+
+# AST fields the compact request carries: `raw` is already sent as the
+# original prompt, and `version`/`metadata` are reset on the reply anyway
+REFINE_FIELDS = (
+    "role",
+    "context",
+    "task",
+    "constraints",
+    "assumptions",
+    "ambiguities",
+    "output_spec",
+)
+
+
+@dataclass(frozen=True)
+class RefineRequest:
+    """
+    LLM prompt for refining a heuristic AST, with its size report.
+
+    `kept` lists the fields left out of the request because the heuristic
+    parser was confident in them; they are copied from the heuristic AST
+    into the refined one. `patch` lists the fields requested as a JSON merge
+    patch (empty for a full refine). In a `compact` refine, fields missing
+    from the reply keep their heuristic values. `full` builds the full
+    `REFINE_PROMPT` request (None when `prompt` is that request).
+    """
+
+    prompt: str
+    kept: tuple[str, ...] = ()
+    patch: tuple[str, ...] = ()
+    compact: bool = False
+    full: Callable[[], str] | None = field(default=None, repr=False, compare=False)
+
+    @cached_property
+    def report(self) -> dict[str, int]:
+        """
+        The prompt's size against the full request in bytes (UTF-8) and
+        estimated tokens; computed on first access only.
+        """
+        full = self.prompt if self.full is None else self.full()
+        return _size_report(full, self.prompt)
+
+
+def build_refine_request(
+    text: str,
+    base: PromptAST,
+    *,
+    compact: bool = True,
+    focus_below: float | None = None,
+) -> RefineRequest:
+    """
+    Refine prompt for `base`, the heuristic AST of `text`.
+
+    The compact request sends the AST as minified JSON without `raw` (the
+    original prompt is already there), `version`, `metadata` or empty fields.
+    With `focus_below`, fields whose heuristic `field_confidence` is at or
+    above it are left out too (empty or not) and kept as parsed; assumptions
+    and ambiguities have no score and are always sent.
+    """
+    raw = text.strip()
+    if not compact:
+        if focus_below is not None:
+            raise ValueError("focus_below requires compact=True")
+        return RefineRequest(_full_prompt(raw, base))
+
+    kept = _confident_fields(base, focus_below)
+    sent = [name for name in REFINE_FIELDS if name not in kept]
+    prompt = COMPACT_REFINE_PROMPT.format(
+        keys=", ".join(sent),
+        raw=raw,
+        ast_json=_minified(_non_empty(base, sent)),
+    )
+    return RefineRequest(prompt, kept, compact=True, full=partial(_full_prompt, raw, base))
+
 
-def parse_prompt_hybrid(text: str, llm: LLMClient) -> PromptAST:
+def build_patch_request(
+    text: str, base: PromptAST, *, focus_below: float = PATCH_FOCUS_BELOW
+) -> RefineRequest:
+    """
+    Prompt asking only for the fields of `base` that need the LLM.
+
+    Those are the scored fields that are empty or whose heuristic
+    `field_confidence` is below `focus_below`, plus assumptions and ambiguities
+    when empty; the reply is merged with `merge_patch`. When every scored field
+    is filled and confident, `patch` is empty and nothing needs sending.
+    """
+    raw = text.strip()
+    patch = _uncertain_fields(base, focus_below)
+    kept = tuple(name for name in REFINE_FIELDS if name not in patch)
+    prompt = PATCH_PROMPT.format(
+        fields=", ".join(patch),
+        raw=raw,
+        ast_json=_minified(_non_empty(base, REFINE_FIELDS)),
+    )
+    return RefineRequest(prompt, kept, patch, full=partial(_full_prompt, raw, base))
+
+
+def merge_patch(base: PromptAST, patch: dict[str, Any], fields: Iterable[str]) -> PromptAST:
+    """
+    `base` with the LLM's JSON merge patch (RFC 7396) applied to `fields`.
+
+    Precedence, field by field:
+    - fields outside `fields` always keep the heuristic value, whatever the
+      patch says;
+    - a field absent from the patch keeps the heuristic value;
+    - `null` clears the field (None, or an empty list);
+    - any other value replaces the heuristic one, except that `output_spec`
+      is merged key by key under the same rules.
+
+    The result is validated like an LLM parse (`ParseError` when invalid) and
+    marked `extracted_by="hybrid"`, with the fields that changed in
+    `metadata["patched_fields"]`; confidence scores stay the heuristic ones.
+    """
+    data = base.to_dict()
+    patched: list[str] = []
+    for name in fields:
+        if name not in patch:
+            continue
+        value = _merged(data[name], patch[name])
+        if value != data[name]:
+            data[name] = value
+            patched.append(name)
+    data["metadata"] = {**data["metadata"], "extracted_by": "hybrid", "patched_fields": patched}
+    return _ast_from_obj(base.raw, data)
+
+
+def parse_prompt_hybrid(
+    text: str,
+    llm: LLMClient,
+    *,
+    threshold: float | None = None,
+    compact: bool = True,
+    focus_below: float | None = None,
+    patch: bool = False,
+    report: bool = False,
+) -> PromptAST:
+    """
+    Heuristic parse refined by the LLM.
+
+    With `threshold`, the LLM is only consulted when the heuristic
+    `metadata["confidence"]` is below it; otherwise the heuristic AST is returned
+    as is. `metadata["llm_consulted"]` records which path was taken.
+    `compact` and `focus_below` shape the request (see `build_refine_request`);
+    with `report=True` its size report, plus the reply's size, is stored in
+    `metadata["refine_request"]`.
+
+    With `patch=True` the LLM only returns the empty or uncertain fields (see
+    `build_patch_request`, where `focus_below` defaults to `PATCH_FOCUS_BELOW`),
+    merged into the heuristic AST by `merge_patch`; when there are none, the
+    LLM is skipped.
+    """
     base = parse_prompt_heuristic(text)
+    if _confident(base, threshold):
+        return _skip_llm(base)
 
     # Ask LLM to refine the existing AST
-    prompt = REFINE_PROMPT.format(raw=text.strip(), ast_json=base.to_json())
-    refined_text = llm.complete(prompt)
+    request = _request(text, base, compact, focus_below, patch)
+    if request is None:
+        return _skip_llm(base)
+    refined_text = _complete(llm, request.prompt)
+
+    # Validate the refined result with the same path as parse_prompt_llm
+    return _result(text, base, refined_text, request, report)
+
+
+async def parse_prompt_hybrid_async(
+    text: str,
+    llm: AsyncLLMClient,
+    *,
+    threshold: float | None = None,
+    compact: bool = True,
+    focus_below: float | None = None,
+    patch: bool = False,
+    report: bool = False,
+) -> PromptAST:
+    base = parse_prompt_heuristic(text)
+    if _confident(base, threshold):
+        return _skip_llm(base)
+    request = _request(text, base, compact, focus_below, patch)
+    if request is None:
+        return _skip_llm(base)
+    refined_text = await _complete_async(llm, request.prompt)
+    return _result(text, base, refined_text, request, report)
+
+
+def _request(
+    text: str,
+    base: PromptAST,
+    compact: bool,
+    focus_below: float | None,
+    patch: bool,
+) -> RefineRequest | None:
+    """The request to send, or None when a patch would request nothing."""
+    if not patch:
+        return build_refine_request(text, base, compact=compact, focus_below=focus_below)
+    if not compact:
+        raise ValueError("patch requires compact=True")
+    focus = PATCH_FOCUS_BELOW if focus_below is None else focus_below
+    request = build_patch_request(text, base, focus_below=focus)
+    return request if request.patch else None
+
+
+def _result(
+    text: str, base: PromptAST, reply: str, request: RefineRequest, report: bool
+) -> PromptAST:
+    if request.patch:
+        obj = _safe_json_load(reply)
+        if not isinstance(obj, dict):
+            raise ParseError("LLM patch is not a JSON object.")
+        refined = merge_patch(base, obj, request.patch)
+    elif request.compact:
+        refined = _ast_from_obj(text, _filled(base, _safe_json_load(reply)))
+    else:
+        refined = _ast_from_llm_output(text, reply)
+    return _refined(base, refined, request, reply, report)
+
+
+def _confident(base: PromptAST, threshold: float | None) -> bool:
+    if threshold is None:
+        return False
+    if not 0.0 <= threshold <= 1.0:
+        raise ValueError("threshold must be between 0 and 1")
+    return base.metadata["confidence"] >= threshold
+
+
+def _skip_llm(base: PromptAST) -> PromptAST:
+    base.metadata["llm_consulted"] = False
+    return base
+
+
+def _refined(
+    base: PromptAST,
+    refined: PromptAST,
+    request: RefineRequest,
+    reply: str,
+    report: bool,
+) -> PromptAST:
+    for name in request.kept:
+        setattr(refined, name, copy.deepcopy(getattr(base, name)))
+    refined.metadata["llm_consulted"] = True
+    refined.metadata["heuristic_confidence"] = base.metadata["confidence"]
+    if report:
+        refined.metadata["refine_request"] = {
+            **request.report,
+            "reply_bytes": len(reply.encode("utf-8")),
+            "reply_tokens": estimate_tokens(reply),
+        }
+    if request.kept:
+        refined.metadata["heuristic_fields"] = list(request.kept)
+    return refined
+
+
+def _filled(base: PromptAST, reply: dict[str, Any]) -> dict[str, Any]:
+    """`reply` with the refine fields it left out taken from `base`."""
+    data = base.to_dict()
+    for name in REFINE_FIELDS:
+        reply.setdefault(name, data[name])
+    return reply
+
+
+def _confident_fields(base: PromptAST, focus_below: float | None) -> tuple[str, ...]:
+    if focus_below is None:
+        return ()
+    _check_focus(focus_below)
+    scores = base.metadata.get("field_confidence", {})
+    return tuple(
+        name for name in REFINE_FIELDS if scores.get(name, 0.0) >= focus_below
+    )
+
+
+def _uncertain_fields(base: PromptAST, focus_below: float) -> tuple[str, ...]:
+    _check_focus(focus_below)
+    scores = base.metadata.get("field_confidence", {})
+    data = base.to_dict()
+    if not any(
+        _is_empty(data[name]) or score < focus_below for name, score in scores.items()
+    ):
+        return ()
+    # Unscored fields (assumptions, ambiguities) ride along when empty
+    return tuple(
+        name
+        for name in REFINE_FIELDS
+        if _is_empty(data[name]) or scores.get(name, 1.0) < focus_below
+    )
+
+
+def _check_focus(focus_below: float) -> None:
+    if not 0.0 <= focus_below <= 1.0:
+        raise ValueError("focus_below must be between 0 and 1")
+
+
+def _merged(current: Any, value: Any) -> Any:
+    if value is None:
+        return [] if isinstance(current, list) else None
+    if isinstance(current, dict) and isinstance(value, dict):
+        merged = dict(current)
+        for key, item in value.items():
+            if key in merged:
+                merged[key] = _merged(merged[key], item)
+        return merged
+    return value
+
+
+def _is_empty(value: Any) -> bool:
+    if isinstance(value, dict):
+        return all(_is_empty(item) for item in value.values())
+    return value in (None, "", [])
+
+
+def _non_empty(base: PromptAST, names: Iterable[str]) -> dict[str, Any]:
+    data = base.to_dict()
+    body: dict[str, Any] = {}
+    for name in names:
+        value = data[name]
+        if isinstance(value, dict):
+            value = {k: v for k, v in value.items() if not _is_empty(v)}
+        if not _is_empty(value):
+            body[name] = value
+    return body
+
 
-    # parse refined result using same loader/validator
-    # by reusing parse_prompt_llm-style validation
-    return parse_prompt_llm(text, llm=_OverrideClient(refined_text))
+def _minified(data: dict[str, Any]) -> str:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
 
 
-class _OverrideClient:
-    """Tiny adapter so we can reuse parse_prompt_llm validation path."""
+def _full_prompt(raw: str, base: PromptAST) -> str:
+    return REFINE_PROMPT.format(raw=raw, ast_json=base.to_json())
 
-    def __init__(self, fixed_response: str):
-        self.fixed_response = fixed_response
 
-    def complete(self, _prompt: str) -> str:
-        return self.fixed_response
+def _size_report(full: str, sent: str) -> dict[str, int]:
+    full_bytes, sent_bytes = len(full.encode("utf-8")), len(sent.encode("utf-8"))
+    full_tokens, sent_tokens = estimate_tokens(full), estimate_tokens(sent)
+    return {
+        "bytes": sent_bytes,
+        "tokens": sent_tokens,
+        "bytes_saved": full_bytes - sent_bytes,
+        "tokens_saved": full_tokens - sent_tokens,
+    }
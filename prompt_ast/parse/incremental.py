@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+FieldCallback = Callable[[str, Any], None]
+
+
+class IncrementalJSONObject:
+    """
+    Find the first top-level JSON object in text that arrives in chunks.
+
+    Text before the first `{` is skipped, and `feed()` returns True once the
+    object's closing brace has arrived; anything after it is ignored, so the
+    caller can stop reading. Each top-level field is passed to `on_field` as
+    `(key, value)` as soon as its value is complete, before the rest of the
+    object has arrived.
+    """
+
+    def __init__(self, on_field: FieldCallback | None = None):
+        self.on_field = on_field
+        self.complete = False
+        self._text = ""
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        # Top-level key being read, and where its value starts in the object text
+        self._key_start: int | None = None
+        self._key: str | None = None
+        self._value_start: int | None = None
+
+    def feed(self, chunk: str) -> bool:
+        if self.complete:
+            return True
+        if self._depth == 0:
+            start = chunk.find("{")
+            if start == -1:
+                return False
+            chunk = chunk[start:]
+        base = len(self._text)
+        self._text += chunk
+        for i, char in enumerate(chunk):
+            if self._scan(char, base + i):
+                # Drop whatever followed the closing brace
+                self._text = self._text[: base + i + 1]
+                self.complete = True
+                return True
+        return False
+
+    def value(self) -> dict[str, Any]:
+        """The parsed object; only valid once `feed()` returned True."""
+        if not self.complete:
+            raise ValueError("JSON object is not complete yet")
+        return json.loads(self._text)
+
+    def _scan(self, char: str, pos: int) -> bool:
+        """Advance the state machine by one character; True when the object closes."""
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                if self._depth == 1 and self._key_start is not None:
+                    self._key = json.loads(self._text[self._key_start : pos + 1])
+                    self._key_start = None
+            return False
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1 and self._key is None and self._value_start is None:
+                self._key_start = pos
+        elif char in "{[":
+            self._depth += 1
+        elif char in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._end_field(pos)
+                return True
+        elif char == ":" and self._depth == 1:
+            self._value_start = pos + 1
+        elif char == "," and self._depth == 1:
+            self._end_field(pos)
+        return False
+
+    def _end_field(self, pos: int) -> None:
+        key, start = self._key, self._value_start
+        self._key = self._value_start = None
+        if self.on_field is None or key is None or start is None:
+            return
+        try:
+            value = json.loads(self._text[start:pos])
+        except ValueError:
+            return  # malformed; reported when the whole object is validated
+        self.on_field(key, value)
@@ -1,9 +1,18 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from typing import Sequence
+
 from ..ast import PromptAST
 from ..errors import ParseError
-from ..llm.base import LLMClient
+from ..llm.base import (
+    AsyncLLMClient,
+    AsyncStreamingLLMClient,
+    LLMClient,
+    StreamingLLMClient,
+)
+from .incremental import FieldCallback, IncrementalJSONObject
 
 
 EXTRACTION_PROMPT = """Convert the user's prompt into Prompt AST JSON.
@@ -32,11 +41,195 @@ Rules:
 """
 
 
+BATCH_INSTRUCTIONS = """
+You will receive {count} user prompts, each between <<<PROMPT i>>> and <<<END i>>>
+markers, numbered from 0. Convert every prompt independently.
+Return ONLY a JSON array with one Prompt AST object per prompt, in the same order,
+and add an "index" key holding the prompt's number to each object.
+"""
+
+DEFAULT_BATCH_SIZE = 8
+
+
 def parse_prompt_llm(text: str, llm: LLMClient) -> PromptAST:
-    prompt = f"{EXTRACTION_PROMPT}\n\nUSER PROMPT:\n{text.strip()}"
-    raw = llm.complete(prompt)
+    raw = _complete(llm, _extraction_prompt(text))
+    return _ast_from_llm_output(text, raw)
+
+
+async def parse_prompt_llm_async(text: str, llm: AsyncLLMClient) -> PromptAST:
+    raw = await _complete_async(llm, _extraction_prompt(text))
+    return _ast_from_llm_output(text, raw)
+
+
+def parse_prompt_llm_stream(
+    text: str, llm: StreamingLLMClient, *, on_field: FieldCallback | None = None
+) -> PromptAST:
+    """
+    `parse_prompt_llm` over a streamed completion.
+
+    Chunks from `llm.stream()` feed an incremental JSON parser, and the stream
+    is closed as soon as the top-level object is complete, so trailing prose
+    is never waited for. `on_field(key, value)` is called for each top-level
+    field (`role`, `task`, ...) as soon as it has arrived, before validation.
+    """
+    parser = IncrementalJSONObject(on_field)
+    received: list[str] = []
+    chunks = llm.stream(_extraction_prompt(text))
+    try:
+        for chunk in chunks:
+            received.append(chunk)
+            if parser.feed(chunk):
+                break
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+    return _ast_from_stream(text, parser, received)
+
+
+async def parse_prompt_llm_stream_async(
+    text: str, llm: AsyncStreamingLLMClient, *, on_field: FieldCallback | None = None
+) -> PromptAST:
+    parser = IncrementalJSONObject(on_field)
+    received: list[str] = []
+    chunks = llm.stream(_extraction_prompt(text))
+    try:
+        async for chunk in chunks:
+            received.append(chunk)
+            if parser.feed(chunk):
+                break
+    finally:
+        aclose = getattr(chunks, "aclose", None)
+        if aclose is not None:
+            await aclose()
+    return _ast_from_stream(text, parser, received)
+
+
+def _ast_from_stream(
+    text: str, parser: IncrementalJSONObject, received: list[str]
+) -> PromptAST:
+    if not parser.complete:
+        # No complete object arrived; report it like a non-streamed reply
+        return _ast_from_llm_output(text, "".join(received))
+    try:
+        obj = parser.value()
+    except ValueError as e:
+        raise ParseError(f"Could not parse JSON from LLM output: {e}") from e
+    return _ast_from_obj(text, obj)
+
+
+def parse_prompts_llm(
+    texts: Sequence[str], llm: LLMClient, *, batch_size: int = DEFAULT_BATCH_SIZE
+) -> list[PromptAST]:
+    """
+    LLM parse of many prompts, `batch_size` per request.
+
+    Each request carries the extraction instructions once and asks for a JSON
+    array of ASTs. Elements that are missing or fail validation, or every
+    prompt of a batch whose reply is not a JSON array, are re-parsed with
+    individual `parse_prompt_llm` calls. Results are in input order.
+    """
+    _check_batch_size(batch_size)
+    results: list[PromptAST] = []
+    for batch in _batches(texts, batch_size):
+        if len(batch) == 1:
+            results.append(parse_prompt_llm(batch[0], llm=llm))
+            continue
+        parsed = _asts_from_batch_output(batch, _complete(llm, _batch_prompt(batch)))
+        results.extend(
+            ast if ast is not None else parse_prompt_llm(text, llm=llm)
+            for text, ast in zip(batch, parsed)
+        )
+    return results
+
+
+async def parse_prompts_llm_async(
+    texts: Sequence[str], llm: AsyncLLMClient, *, batch_size: int = DEFAULT_BATCH_SIZE
+) -> list[PromptAST]:
+    """`parse_prompts_llm` with every batch (and fallback call) in flight at once."""
+    _check_batch_size(batch_size)
+
+    async def parse_batch(batch: list[str]) -> list[PromptAST]:
+        if len(batch) == 1:
+            return [await parse_prompt_llm_async(batch[0], llm=llm)]
+        parsed = _asts_from_batch_output(
+            batch, await _complete_async(llm, _batch_prompt(batch))
+        )
+        missing = [i for i, ast in enumerate(parsed) if ast is None]
+        retried = await asyncio.gather(
+            *(parse_prompt_llm_async(batch[i], llm=llm) for i in missing)
+        )
+        for i, ast in zip(missing, retried):
+            parsed[i] = ast
+        return parsed  # type: ignore[return-value]
 
-    obj = _safe_json_load(raw)
+    batches = await asyncio.gather(
+        *(parse_batch(batch) for batch in _batches(texts, batch_size))
+    )
+    return [ast for batch in batches for ast in batch]
+
+
+# Every LLM round-trip goes through these, so `profile_stages()` can time them
+def _complete(llm: LLMClient, prompt: str) -> str:
+    return llm.complete(prompt)
+
+
+async def _complete_async(llm: AsyncLLMClient, prompt: str) -> str:
+    return await llm.complete(prompt)
+
+
+def _check_batch_size(batch_size: int) -> None:
+    if batch_size < 1:
+        raise ValueError("batch_size must be >= 1")
+
+
+def _batches(texts: Sequence[str], size: int) -> list[list[str]]:
+    return [list(texts[i : i + size]) for i in range(0, len(texts), size)]
+
+
+def _extraction_prompt(text: str) -> str:
+    return f"{EXTRACTION_PROMPT}\n\nUSER PROMPT:\n{text.strip()}"
+
+
+def _batch_prompt(texts: list[str]) -> str:
+    prompts = "\n".join(
+        f"<<<PROMPT {i}>>>\n{text.strip()}\n<<<END {i}>>>" for i, text in enumerate(texts)
+    )
+    return (
+        f"{EXTRACTION_PROMPT}{BATCH_INSTRUCTIONS.format(count=len(texts))}"
+        f"\nUSER PROMPTS:\n{prompts}"
+    )
+
+
+def _asts_from_batch_output(texts: list[str], raw: str) -> list[PromptAST | None]:
+    """Validated AST per prompt, or None where the element must be re-parsed."""
+    try:
+        items = _safe_json_array_load(raw)
+    except ParseError:
+        return [None] * len(texts)
+    # Trust positions only when the model dropped the "index" keys but kept the count
+    by_position = len(items) == len(texts)
+    results: list[PromptAST | None] = [None] * len(texts)
+    for position, obj in enumerate(items):
+        if not isinstance(obj, dict):
+            continue
+        index = obj.pop("index", position if by_position else None)
+        if not isinstance(index, int) or not 0 <= index < len(texts):
+            continue
+        if results[index] is not None:
+            continue
+        try:
+            results[index] = _ast_from_obj(texts[index], obj)
+        except Exception:
+            pass  # re-parsed with an individual call
+    return results
+
+
+def _ast_from_llm_output(text: str, raw: str) -> PromptAST:
+    return _ast_from_obj(text, _safe_json_load(raw))
+
+
+def _ast_from_obj(text: str, obj: dict) -> PromptAST:
     obj["raw"] = text.strip()
     obj["version"] = "0.1"
     obj.setdefault("metadata", {})
@@ -62,3 +255,21 @@ def _safe_json_load(s: str) -> dict:
             except Exception as e:
                 raise ParseError(f"Could not parse JSON from LLM output: {e}") from e
         raise ParseError("Could not find JSON object in LLM output.")
+
+
+def _safe_json_array_load(s: str) -> list:
+    """`_safe_json_load` for replies holding a JSON array."""
+    try:
+        value = json.loads(s)
+    except Exception:
+        start = s.find("[")
+        end = s.rfind("]")
+        if start == -1 or end <= start:
+            raise ParseError("Could not find JSON array in LLM output.")
+        try:
+            value = json.loads(s[start : end + 1])
+        except Exception as e:
+            raise ParseError(f"Could not parse JSON from LLM output: {e}") from e
+    if not isinstance(value, list):
+        raise ParseError("LLM output is not a JSON array.")
+    return value
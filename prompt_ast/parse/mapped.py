@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import codecs
+import io
+import mmap
+from pathlib import Path
+from typing import Iterator
+
+from ..ast import PromptAST
+from .stream import parse_prompt_stream
+
+DEFAULT_CHUNK_BYTES = 1024 * 1024
+
+
+def iter_mapped_text(
+    path: str | Path, chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> Iterator[str]:
+    """
+    Decode a UTF-8 file through a read-only memory map, `chunk_bytes` at a time.
+
+    Newlines are translated like `Path.read_text()` (universal newlines), and
+    only one chunk is decoded at any moment, so the file is never held as a
+    single Python str.
+    """
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be >= 1")
+    decoder = io.IncrementalNewlineDecoder(
+        codecs.getincrementaldecoder("utf-8")(), translate=True
+    )
+    with open(Path(path).expanduser(), "rb") as f:
+        # mmap refuses zero-length files
+        if f.seek(0, io.SEEK_END) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for start in range(0, len(mapped), chunk_bytes):
+                text = decoder.decode(mapped[start : start + chunk_bytes])
+                if text:
+                    yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def parse_prompt_file(path: str | Path, *, keep_raw: bool = False) -> PromptAST:
+    """Heuristic parse of a prompt file via `parse_prompt_stream` over a memory map."""
+    return parse_prompt_stream(iter_mapped_text(path), keep_raw=keep_raw)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+
+from ..ast import PromptAST
+from .heuristic import parse_prompt_heuristic
+
+
+class HeuristicParseCache:
+    """
+    Bounded LRU memo for `parse_prompt_heuristic`.
+
+    Keys are the stripped prompt text, the same normalization the parser applies,
+    so equal keys always produce equal ASTs. Every call returns a deep copy;
+    callers may mutate the result without touching the cached entry.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, PromptAST] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, text: str) -> PromptAST:
+        key = text.strip()
+        with self._lock:
+            ast = self._entries.get(key)
+            if ast is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if ast is None:
+            ast = parse_prompt_heuristic(key)
+            with self._lock:
+                self._entries[key] = ast
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return ast.model_copy(deep=True)
+
+    def stats(self) -> dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
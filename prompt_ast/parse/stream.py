@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator
+
+from ..ast import PromptAST
+from .heuristic import (
+    _OUTPUT_FORMATS,
+    AMBIGUITY_RULES,
+    AmbiguityRule,
+    _SENTENCE_BREAK_RE,
+    _SectionSplitter,
+    _assemble_lite,
+    _find_structure_lists,
+    _infer_output_format,
+    _iter_role_candidates,
+    _match_ambiguity_rules,
+    _order_constraints,
+    _scan_constraints,
+    _structure_from_lists,
+    _task_from_sentence,
+    _word_tokens,
+)
+
+DEFAULT_WINDOW_CHARS = 64 * 1024
+DEFAULT_OVERLAP_CHARS = 1024
+
+
+def parse_prompt_stream(
+    chunks: Iterable[str],
+    *,
+    lines: bool = False,
+    keep_raw: bool = False,
+    window_chars: int = DEFAULT_WINDOW_CHARS,
+    overlap_chars: int = DEFAULT_OVERLAP_CHARS,
+) -> PromptAST:
+    """
+    Heuristic parse of a prompt supplied as an iterable of text chunks.
+
+    Chunks are concatenated verbatim, so a file object (lines with their newlines)
+    and fixed-size reads both work. With `lines=True` each item is one line, and
+    a missing newline is added: use it for `str.splitlines()` output or other
+    bare lines. Sections, role and task are tracked line by line;
+    constraints, formats, structure lists and ambiguity terms are detected over
+    windows of about `window_chars` whole lines that overlap by `overlap_chars`,
+    so memory stays bounded by the window plus the extracted fields.
+
+    The result matches `parse_prompt_heuristic` on the joined text except that
+    `raw` is empty unless `keep_raw` is set, and a multi-line phrase longer than
+    the overlap can be missed where it crosses a window boundary.
+    """
+    if window_chars < 1:
+        raise ValueError("window_chars must be >= 1")
+    if overlap_chars < 0:
+        raise ValueError("overlap_chars must be >= 0")
+
+    scanner = _StreamScanner(keep_raw)
+    window: list[str] = []
+    window_size = 0
+    offset = 0
+    new_chars = 0
+
+    if lines:
+        chunks = _terminated(chunks)
+    for line in _iter_prompt_lines(chunks):
+        scanner.feed_line(line)
+        window.append(line)
+        size = len(line) + 1
+        window_size += size
+        new_chars += size
+        if new_chars < window_chars:
+            continue
+        accept, carry = _split_overlap(window, overlap_chars)
+        deferred = sum(len(x) + 1 for x in window[accept:])
+        carried = deferred + sum(len(x) + 1 for x in window[carry:accept])
+        scanner.scan("\n".join(window), offset, window_size - deferred)
+        offset += window_size - carried
+        window = window[carry:]
+        window_size = carried
+        new_chars = 0
+
+    scanner.scan("\n".join(window).rstrip(), offset, None)
+    return scanner.result()
+
+
+def _terminated(lines: Iterable[str]) -> Iterator[str]:
+    for line in lines:
+        yield line if line.endswith("\n") else line + "\n"
+
+
+def _iter_prompt_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """Split chunks into lines, dropping leading blank lines like `str.strip`."""
+    partial: list[str] = []
+    started = False
+    for chunk in chunks:
+        *lines, rest = chunk.split("\n")
+        if lines:
+            lines[0] = "".join(partial) + lines[0]
+            partial = []
+        for line in lines:
+            if not started:
+                line = line.lstrip()
+                if not line:
+                    continue
+                started = True
+            yield line
+        if rest:
+            partial.append(rest)
+    last = "".join(partial)
+    if not started:
+        last = last.lstrip()
+    if last or started:
+        yield last
+
+
+def _split_overlap(window: list[str], overlap_chars: int) -> tuple[int, int]:
+    """
+    Index of the first line whose matches are deferred to the next window, and
+    index of the first line carried into it. Deferred matches get re-scanned with
+    at least `overlap_chars` of preceding lines (and one non-blank line) as context.
+    """
+
+    def back(end: int) -> int:
+        # Take at least one line, and never stop on a blank one.
+        size = 0
+        start = end
+        while start > 0 and (
+            start == end or size < overlap_chars or not window[start].strip()
+        ):
+            start -= 1
+            size += len(window[start]) + 1
+        return start
+
+    accept = back(len(window))
+    return accept, back(accept)
+
+
+class _StreamScanner:
+    """Running per-stage state for `parse_prompt_stream`."""
+
+    def __init__(self, keep_raw: bool):
+        self.raw_lines: list[str] | None = [] if keep_raw else None
+        self.sections = _SectionSplitter()
+        # Task inference: the sentence being assembled, once no task was found yet
+        self.task: str | None = None
+        self.task_done = False
+        self.sentence: list[str] = []
+        # Best (priority, role) found so far
+        self.role: tuple[int, str] | None = None
+        self.format_rank: int | None = None
+        self.constraints: dict[str, tuple[int, str]] = {}
+        self.no_code_examples_needed = False
+        self.mentions_include = False
+        self.sections_list: tuple[int, str] | None = None
+        self.with_list: tuple[int, str] | None = None
+        self.tokens: set[str] = set()
+        self.qualifiers: dict[AmbiguityRule, tuple[int, str]] = {}
+
+    def feed_line(self, line: str) -> None:
+        if self.raw_lines is not None:
+            self.raw_lines.append(line)
+        self.sections.feed(line)
+        if not self.task_done:
+            self._feed_sentence(line + "\n")
+
+    def _feed_sentence(self, text: str) -> None:
+        start = 0
+        for m in _SENTENCE_BREAK_RE.finditer(text):
+            self.sentence.append(text[start : m.start() + 1])
+            start = m.end()
+            if self._take_sentence():
+                return
+        self.sentence.append(text[start:])
+
+    def _take_sentence(self) -> bool:
+        task = _task_from_sentence("".join(self.sentence))
+        self.sentence = []
+        if task is not None:
+            self.task = task
+            self.task_done = True
+        return self.task_done
+
+    def scan(self, text: str, offset: int, accept_to: int | None) -> None:
+        """
+        Scan the window starting at `offset` in the prompt; only matches starting
+        before `accept_to` are recorded, later ones are re-scanned by the next window.
+        """
+        lowered = text.lower()
+
+        def accepted(pos: int) -> bool:
+            return accept_to is None or pos < accept_to
+
+        for rank, candidate in enumerate(_iter_role_candidates(text)):
+            if self.role is not None and rank >= self.role[0]:
+                break
+            if candidate is not None and accepted(candidate[0]):
+                self.role = (rank, candidate[1])
+                break
+
+        if self.format_rank != 0:
+            fmt = _infer_output_format(lowered)
+            if fmt is not None:
+                rank = _OUTPUT_FORMATS.index(fmt)
+                if self.format_rank is None or rank < self.format_rank:
+                    self.format_rank = rank
+
+        for rule, (pos, value) in _scan_constraints(text, at_start=offset == 0).items():
+            if rule not in self.constraints and accepted(pos):
+                self.constraints[rule] = (offset + pos, value)
+        self.no_code_examples_needed |= "no code examples needed" in lowered
+        self.mentions_include |= "include" in lowered
+
+        sections_list, with_list = _find_structure_lists(text, with_fallback=True)
+        if self.sections_list is None and sections_list and accepted(sections_list[0]):
+            self.sections_list = sections_list
+        if self.with_list is None and with_list and accepted(with_list[0]):
+            self.with_list = with_list
+
+        self.tokens |= _word_tokens(lowered)
+        for rule in AMBIGUITY_RULES:
+            if rule.qualifier is None or rule in self.qualifiers:
+                continue
+            found = rule.qualify(lowered)
+            if found is not None and accepted(found[0]):
+                self.qualifiers[rule] = found
+
+    def result(self) -> PromptAST:
+        if not self.task_done and self.sentence:
+            self._take_sentence()
+        sections = self.sections.sections()
+        raw = "\n".join(self.raw_lines).rstrip() if self.raw_lines is not None else ""
+
+        def qualify(rule: AmbiguityRule) -> str | None:
+            found = self.qualifiers.get(rule)
+            return found[1] if found else None
+
+        return _assemble_lite(
+            raw,
+            role=self.role[1] if self.role is not None else None,
+            sections=sections,
+            inferred_task=None if sections.get("task") else self.task,
+            fmt=_OUTPUT_FORMATS[self.format_rank] if self.format_rank is not None else None,
+            inferred_constraints=_order_constraints(
+                self.constraints,
+                no_code_examples_needed=self.no_code_examples_needed,
+                mentions_include=self.mentions_include,
+            ),
+            structure=_structure_from_lists(self.sections_list, self.with_list),
+            infer_ambiguities=lambda task, context: _match_ambiguity_rules(
+                task, context, self.tokens, qualify
+            ),
+        ).to_ast()
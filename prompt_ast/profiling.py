@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import sys
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from importlib import import_module
+from typing import Any, Callable, Iterator
+
+# (module, function, stage) for every instrumented call site. Functions are
+# looked up as module globals at call time, so swapping them in their module
+# is enough to time every caller; nothing is wrapped while no profile is active.
+STAGES: tuple[tuple[str, str, str], ...] = (
+    ("prompt_ast.parse.heuristic", "parse_prompt_heuristic_lite", "heuristic"),
+    ("prompt_ast.parse.heuristic", "_infer_role", "heuristic.role"),
+    ("prompt_ast.parse.heuristic", "_split_labeled_sections", "heuristic.sections"),
+    ("prompt_ast.parse.heuristic", "_infer_task", "heuristic.task"),
+    ("prompt_ast.parse.heuristic", "_infer_output_format", "heuristic.format"),
+    ("prompt_ast.parse.heuristic", "_infer_constraints", "heuristic.constraints"),
+    ("prompt_ast.parse.heuristic", "_extract_output_structure", "heuristic.structure"),
+    ("prompt_ast.parse.heuristic", "_ambiguities_in", "heuristic.ambiguities"),
+    ("prompt_ast.parse.llm", "parse_prompt_llm", "llm"),
+    ("prompt_ast.parse.llm", "parse_prompt_llm_async", "llm"),
+    ("prompt_ast.parse.llm", "_complete", "llm.complete"),
+    ("prompt_ast.parse.llm", "_complete_async", "llm.complete"),
+    ("prompt_ast.parse.hybrid", "parse_prompt_hybrid", "hybrid"),
+    ("prompt_ast.parse.hybrid", "parse_prompt_hybrid_async", "hybrid"),
+    ("prompt_ast.parse.hybrid", "_complete", "llm.complete"),
+    ("prompt_ast.parse.hybrid", "_complete_async", "llm.complete"),
+)
+
+# Histogram bucket upper bounds in seconds: 1-2-5 steps from 1 µs to 100 s
+BUCKET_BOUNDS: tuple[float, ...] = tuple(
+    m * 10.0**e for e in range(-6, 3) for m in (1, 2, 5)
+)
+
+StageHook = Callable[[str, float], None]
+
+_lock = threading.Lock()
+_active: list[StageProfile] = []
+# id(wrapper) -> (wrapper, original) for every wrapper currently installed
+_wrappers: dict[int, tuple[Any, Any]] = {}
+
+
+class StageTimings:
+    """Call count, total/min/max and a fixed-bucket histogram for one stage."""
+
+    __slots__ = ("calls", "total", "min", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        # One count per bound, plus one for anything slower than the last bound
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def add(self, seconds: float) -> None:
+        self.calls += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        self.buckets[bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile (capped at `max`)."""
+        target = q * self.calls
+        seen = 0
+        for bound, count in zip(BUCKET_BOUNDS, self.buckets):
+            seen += count
+            if seen >= target and count:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        us = 1e6
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total * 1e3, 3),
+            "mean_us": round(self.total / self.calls * us, 2) if self.calls else 0.0,
+            "min_us": round(self.min * us, 2) if self.calls else 0.0,
+            "p50_us": round(self.percentile(0.5) * us, 2),
+            "p90_us": round(self.percentile(0.9) * us, 2),
+            "p99_us": round(self.percentile(0.99) * us, 2),
+            "max_us": round(self.max * us, 2),
+            # Non-empty buckets as [upper bound in µs (None = above the last), count]
+            "histogram": [
+                [round(bound * us, 2) if bound is not None else None, count]
+                for bound, count in zip((*BUCKET_BOUNDS, None), self.buckets)
+                if count
+            ],
+        }
+
+
+class StageProfile:
+    """Per-stage wall time collected while `profile_stages()` is active."""
+
+    def __init__(self, hook: StageHook | None = None):
+        self.hook = hook
+        self.stages: dict[str, StageTimings] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            timings = self.stages.get(stage)
+            if timings is None:
+                timings = self.stages[stage] = StageTimings()
+            timings.add(seconds)
+        if self.hook is not None:
+            self.hook(stage, seconds)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """Histogram summary per stage, ordered by stage name."""
+        with self._lock:
+            return {name: self.stages[name].summary() for name in sorted(self.stages)}
+
+    def format_table(self) -> str:
+        rows = [
+            f"{'stage':<24} {'calls':>8} {'total ms':>10}"
+            f" {'mean µs':>9} {'p50 µs':>9} {'p99 µs':>9}"
+        ]
+        for name, s in self.summary().items():
+            rows.append(
+                f"{name:<24} {s['calls']:>8} {s['total_ms']:>10.3f} {s['mean_us']:>9.2f}"
+                f" {s['p50_us']:>9.2f} {s['p99_us']:>9.2f}"
+            )
+        return "\n".join(rows)
+
+
+@contextmanager
+def profile_stages(hook: StageHook | None = None) -> Iterator[StageProfile]:
+    """
+    Time the parser stages listed in `STAGES` for the duration of the block.
+
+    Instrumentation is process-wide: calls from every thread are recorded, and
+    nested or concurrent profiles each receive every sample. `hook(stage,
+    seconds)`, if given, is called for each sample, e.g. to feed a metrics
+    system. When no profile is active the original functions run untouched.
+    """
+    profile = StageProfile(hook)
+    with _lock:
+        if not _active:
+            _install()
+        _active.append(profile)
+    try:
+        yield profile
+    finally:
+        with _lock:
+            _active.remove(profile)
+            if not _active:
+                _uninstall()
+
+
+def _record(stage: str, seconds: float) -> None:
+    for profile in list(_active):
+        profile.record(stage, seconds)
+
+
+def _timed(fn: Callable[..., Any], stage: str) -> Callable[..., Any]:
+    perf_counter = time.perf_counter
+
+    if inspect.iscoroutinefunction(fn):
+
+        @functools.wraps(fn)
+        async def timed_async(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                _record(stage, perf_counter() - start)
+
+        return timed_async
+
+    @functools.wraps(fn)
+    def timed(*args: Any, **kwargs: Any) -> Any:
+        start = perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _record(stage, perf_counter() - start)
+
+    return timed
+
+
+def _install() -> None:
+    # Import everything first: a module imported mid-way would copy an
+    # already wrapped function from its sibling and get timed twice
+    modules = {name: import_module(name) for name, _, _ in STAGES}
+    for module_name, attr, stage in STAGES:
+        original = getattr(modules[module_name], attr)
+        wrapper = _timed(original, stage)
+        _wrappers[id(wrapper)] = (wrapper, original)
+        setattr(modules[module_name], attr, wrapper)
+
+
+def _uninstall() -> None:
+    # A wrapper may have been copied while active: lazy package attributes
+    # cache it, and `from ... import` in a module first loaded mid-profile
+    # binds it. Restore every such alias, not only the patched attributes.
+    for name, module in list(sys.modules.items()):
+        if name != "prompt_ast" and not name.startswith("prompt_ast."):
+            continue
+        namespace = vars(module)
+        for attr, value in list(namespace.items()):
+            entry = _wrappers.get(id(value))
+            if entry is not None and entry[0] is value:
+                namespace[attr] = entry[1]
+    _wrappers.clear()
@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from . import Mode
+from .ast import PromptAST
+from .errors import LLMNotConfiguredError, ParseError
+from .formats import serialize_many, to_compact_json
+from .parse.memo import HeuristicParseCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 8
+DEFAULT_MAX_BODY_BYTES = 5 * 1024 * 1024
+# Latency percentiles in /metrics cover this many most recent requests
+LATENCY_WINDOW = 4096
+# Idle keep-alive connections are closed after this many seconds
+KEEPALIVE_TIMEOUT = 5.0
+
+_WARMUP_PROMPT = """Act as a reviewer.
+Context: warm-up
+Task: Summarize the design as JSON with sections: Summary, Risks.
+Constraints:
+- Be concise"""
+
+
+class ParseService:
+    """
+    Parsing state kept warm across requests: heuristic cache, LLM client and
+    request metrics. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        mode: Mode = "heuristic",
+        llm: Any = None,
+        threshold: float | None = None,
+        cache_size: int = 4096,
+        batch_size: int = 8,
+    ):
+        if mode != "heuristic" and llm is None:
+            raise LLMNotConfiguredError("LLM client required for mode='llm' or 'hybrid'.")
+        self.mode = mode
+        self.llm = llm
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.cache = HeuristicParseCache(cache_size)
+        self.started = time.monotonic()
+        self._lock = threading.Lock()
+        self._requests: dict[str, int] = {}
+        self._errors = 0
+        self._in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def warm(self) -> None:
+        """Load pydantic, the serializers and the lazily compiled rules up front."""
+        to_compact_json(self.cache.parse(_WARMUP_PROMPT))
+        self.cache.clear()
+
+    def parse(self, prompt: str, mode: Mode | None = None) -> PromptAST:
+        mode = self.resolve_mode(mode)
+        if mode == "heuristic":
+            return self.cache.parse(prompt)
+        if mode == "llm":
+            from .parse.llm import parse_prompt_llm
+
+            return parse_prompt_llm(prompt.strip(), llm=self.llm)
+        from .parse.hybrid import parse_prompt_hybrid
+
+        return parse_prompt_hybrid(prompt.strip(), llm=self.llm, threshold=self.threshold)
+
+    def parse_batch(self, prompts: list[str], mode: Mode | None = None) -> list[PromptAST]:
+        mode = self.resolve_mode(mode)
+        if mode == "llm":
+            from .parse.llm import parse_prompts_llm
+
+            return parse_prompts_llm(
+                [p.strip() for p in prompts], llm=self.llm, batch_size=self.batch_size
+            )
+        return [self.parse(prompt, mode) for prompt in prompts]
+
+    def resolve_mode(self, mode: Mode | None) -> Mode:
+        """The mode a request asking for `mode` (None: the default) is parsed in."""
+        if mode is None:
+            return self.mode
+        if mode not in ("heuristic", "llm", "hybrid"):
+            raise ValueError(f"Unknown mode: {mode}")
+        if mode != "heuristic" and self.llm is None:
+            raise LLMNotConfiguredError("Server was started without an LLM client.")
+        return mode
+
+    def request_started(self, route: str) -> float:
+        with self._lock:
+            self._requests[route] = self._requests.get(route, 0) + 1
+            self._in_flight += 1
+        return time.perf_counter()
+
+    def request_finished(self, started: float, failed: bool) -> None:
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._in_flight -= 1
+            self._errors += failed
+            self._latencies.append(elapsed)
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            data: dict[str, Any] = {
+                "uptime_seconds": round(time.monotonic() - self.started, 3),
+                "mode": self.mode,
+                "requests": dict(self._requests),
+                "errors": self._errors,
+                "in_flight": self._in_flight,
+                "latency_ms": _latency_summary(latencies),
+            }
+        data["cache"] = self.cache.stats()
+        llm_stats = getattr(self.llm, "stats", None)
+        if callable(llm_stats):
+            data["llm"] = llm_stats()
+        return data
+
+
+def _latency_summary(latencies: list[float]) -> dict[str, float]:
+    if not latencies:
+        return {"count": 0}
+
+    def pct(q: float) -> float:
+        return round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 3)
+
+    return {
+        "count": len(latencies),
+        "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+        "p50": pct(0.50),
+        "p99": pct(0.99),
+        "max": round(latencies[-1] * 1000, 3),
+    }
+
+
+class PromptASTServer(ThreadingHTTPServer):
+    """
+    HTTP/1.1 server with one thread per connection, all sharing one
+    `ParseService`. At most `workers` requests parse at a time; idle or slow
+    keep-alive clients only hold their own thread, so `/healthz` and
+    `/metrics` are never stuck behind them. Request bodies over
+    `max_body_bytes` are refused with 413 (0 = no limit).
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        service: ParseService,
+        workers: int = DEFAULT_WORKERS,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    ):
+        if workers < 1:
+            raise ValueError("workers must be >= 1")
+        if max_body_bytes < 0:
+            raise ValueError("max_body_bytes must be >= 0")
+        self.service = service
+        self.workers = workers
+        self.max_body_bytes = max_body_bytes
+        self.parse_slots = threading.BoundedSemaphore(workers)
+        super().__init__(address, _Handler)
+
+
+def create_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    *,
+    service: ParseService | None = None,
+    workers: int = DEFAULT_WORKERS,
+    max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+    warm: bool = True,
+) -> PromptASTServer:
+    """Bind a `PromptASTServer` (heuristic mode unless `service` says otherwise)."""
+    service = service if service is not None else ParseService()
+    if warm:
+        service.warm()
+    return PromptASTServer((host, port), service, workers, max_body_bytes)
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = KEEPALIVE_TIMEOUT
+    # Headers and body go out in separate writes; with Nagle on, keep-alive
+    # clients would wait out a delayed ACK (~40 ms) on every response
+    disable_nagle_algorithm = True
+    server: PromptASTServer
+    # Parse mode of the request being handled, once resolved
+    mode: Mode | None = None
+
+    def do_GET(self) -> None:
+        self._dispatch({"/healthz": self._health, "/metrics": self._metrics})
+
+    def do_POST(self) -> None:
+        self._dispatch({"/parse": self._parse, "/parse/batch": self._parse_batch})
+
+    def _dispatch(self, routes: dict[str, Any]) -> None:
+        route = self.path.split("?", 1)[0]
+        handler = routes.get(route)
+        service = self.server.service
+        started = service.request_started(route if handler else "other")
+        self.mode = None
+        failed = True
+        try:
+            if handler is None:
+                raise _HTTPError(404, f"No route for {self.command} {route}")
+            self._send(200, handler())
+            failed = False
+        except _HTTPError as e:
+            self._send_error(e.status, str(e))
+        except (ValueError, LLMNotConfiguredError) as e:
+            self._send_error(400, str(e))
+        except ParseError as e:
+            self._send_error(502, str(e))
+        except Exception:  # LLM transport failures and the like
+            logger.exception("%s %s failed", self.command, route)
+            if self.mode not in (None, "heuristic"):
+                self._send_error(502, "LLM request failed")
+            else:
+                self._send_error(500, "Internal server error")
+        finally:
+            service.request_finished(started, failed)
+
+    def _health(self) -> str:
+        return '{"status":"ok"}'
+
+    def _metrics(self) -> str:
+        return json.dumps(self.server.service.metrics(), separators=(",", ":"))
+
+    def _parse(self) -> str:
+        body = self._json_body()
+        prompt = body.get("prompt")
+        if not isinstance(prompt, str):
+            raise _HTTPError(400, "expected a JSON object with a 'prompt' string")
+        self.mode = self.server.service.resolve_mode(body.get("mode"))
+        with self.server.parse_slots:
+            ast = self.server.service.parse(prompt, self.mode)
+        return to_compact_json(ast)
+
+    def _parse_batch(self) -> str:
+        body = self._json_body()
+        prompts = body.get("prompts")
+        if not isinstance(prompts, list) or not all(isinstance(p, str) for p in prompts):
+            raise _HTTPError(400, "expected a JSON object with a 'prompts' list of strings")
+        self.mode = self.server.service.resolve_mode(body.get("mode"))
+        with self.server.parse_slots:
+            asts = self.server.service.parse_batch(prompts, self.mode)
+        return '{"results":' + serialize_many(asts, "json") + "}"
+
+    def _json_body(self) -> dict[str, Any]:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # rfile.read(-1) would block until the client closes the socket
+            self.close_connection = True
+            raise _HTTPError(400, "invalid Content-Length")
+        if 0 < self.server.max_body_bytes < length:
+            # The body is left unread, so this connection cannot be reused
+            self.close_connection = True
+            raise _HTTPError(413, f"Request body exceeds {self.server.max_body_bytes} bytes")
+        try:
+            body = json.loads(self.rfile.read(length) or b"null")
+        except ValueError as e:
+            raise _HTTPError(400, f"invalid JSON ({e})") from e
+        if not isinstance(body, dict):
+            raise _HTTPError(400, "expected a JSON object")
+        return body
+
+    def _send_error(self, status: int, message: str) -> None:
+        self._send(status, json.dumps({"error": message}))
+
+    def _send(self, status: int, body: str) -> None:
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass  # access logs would dominate per-request cost; see /metrics
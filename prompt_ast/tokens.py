@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import math
+import re
+
+# Pieces roughly like a BPE pre-tokenizer: words with their leading space,
+# short digit groups, punctuation runs and whitespace.
+_PIECE_RE = re.compile(r" ?[^\W\d_]+| ?\d{1,3}| ?[^\w\s]+|\s+")
+# Average characters per token inside a long word / punctuation run
+_WORD_CHARS_PER_TOKEN = 6
+_PUNCT_CHARS_PER_TOKEN = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Local estimate of an LLM tokenizer's token count for `text`.
+
+    Common words count as one token and longer ones as one per
+    `_WORD_CHARS_PER_TOKEN` characters; digit groups of up to three count as
+    one; punctuation runs (JSON syntax) as one per two characters; whitespace
+    beyond a word's leading space counts once per newline run. Good enough
+    for budgeting and comparing request sizes, not for exact billing.
+    """
+    tokens = 0
+    for match in _PIECE_RE.finditer(text):
+        piece = match.group()
+        body = piece.lstrip(" ")
+        if not body:
+            continue  # spaces only
+        first = body[0]
+        if first.isspace():
+            tokens += "\n" in body
+        elif first.isdigit():
+            tokens += 1
+        elif first.isalpha():
+            tokens += math.ceil(len(body) / _WORD_CHARS_PER_TOKEN)
+        else:
+            tokens += math.ceil(len(body) / _PUNCT_CHARS_PER_TOKEN)
+    # Characters the pattern skips (e.g. "_") still cost something
+    return max(tokens, 1 if text.strip() else 0)
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+
+class ChatServer:
+    """
+    Local OpenAI-compatible chat-completions endpoint.
+
+    Answers `content` (as server-sent events of `chunks` when the request
+    asks to stream), after replying with the queued `(status, headers)`
+    `failures` first. With `held=True`, replies wait until `release()`.
+    Records each request body in `requests` and counts `connections`.
+    """
+
+    def __init__(
+        self,
+        content: str = "ok",
+        *,
+        failures: list[tuple[int, dict[str, str]]] | None = None,
+        chunks: list[str] | None = None,
+        held: bool = False,
+    ):
+        self.content = content
+        self.failures = list(failures or [])
+        self.chunks = chunks
+        self.requests: list[dict[str, Any]] = []
+        self.connections = 0
+        self._released = threading.Event()
+        if not held:
+            self._released.set()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                server.connections += 1
+
+            def do_POST(self) -> None:
+                request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests.append(request)
+                server._released.wait()
+                if server.failures:
+                    status, headers = server.failures.pop(0)
+                    self._send(status, headers, "application/json", b'{"error": "busy"}')
+                elif request.get("stream"):
+                    self._send(200, {}, "text/event-stream", server._events())
+                else:
+                    body = {"choices": [{"message": {"content": server.content}}]}
+                    self._send(200, {}, "application/json", json.dumps(body).encode())
+
+            def _send(
+                self, status: int, headers: dict[str, str], content_type: str, body: bytes
+            ) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args) -> None:
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.handle_error = lambda *args: None  # abandoned requests hang up early
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def _events(self) -> bytes:
+        events = [{"choices": [{"delta": {"role": "assistant"}}]}]
+        events += [
+            {"choices": [{"delta": {"content": part}}]}
+            for part in (self.chunks if self.chunks is not None else [self.content])
+        ]
+        body = "".join(f"data: {json.dumps(e)}\n\n" for e in events)
+        return (body + ": keep-alive\n\ndata: [DONE]\n\n").encode()
+
+    def release(self) -> None:
+        """Let held replies (and every later one) through."""
+        self._released.set()
+
+    def close(self) -> None:
+        self.release()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def openai_env(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.delenv("HTTP_PROXY", raising=False)
+    monkeypatch.delenv("http_proxy", raising=False)
+
+
+@pytest.fixture
+def chat_server(openai_env):
+    """Factory starting `ChatServer`s, shut down when the test ends."""
+    servers = []
+
+    def start(content: str = "ok", **kwargs: Any) -> ChatServer:
+        server = ChatServer(content, **kwargs)
+        threading.Thread(
+            target=server.httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        ).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.close()
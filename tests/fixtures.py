@@ -35,7 +35,7 @@ Output: Provide a bullet-point list""",
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.88},
         },
     },
     {
@@ -64,7 +64,7 @@ Design a scalable order processing service.
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.85},
         },
     },
     {
@@ -82,7 +82,7 @@ Design a scalable order processing service.
                 "Task is too vague - missing details about what bug, what code, what symptoms"
             ],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.51},
         },
     },
     {
@@ -98,7 +98,7 @@ Design a scalable order processing service.
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": "json", "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.68},
         },
     },
     # Data Analysis (3 prompts)
@@ -115,7 +115,7 @@ Design a scalable order processing service.
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.61},
         },
     },
     {
@@ -135,7 +135,7 @@ Design a scalable order processing service.
                 "structure": ["Data Sources", "Chart Types", "Tools"],
                 "language": None,
             },
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.54},
         },
     },
     {
@@ -153,7 +153,7 @@ Design a scalable order processing service.
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": "markdown", "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.78},
         },
     },
     # Content Creation (3 prompts)
@@ -170,7 +170,7 @@ Design a scalable order processing service.
             "assumptions": [],
             "ambiguities": ["Missing target audience specification"],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.56},
         },
     },
     {
@@ -186,7 +186,7 @@ Design a scalable order processing service.
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.65},
         },
     },
     {
@@ -204,7 +204,7 @@ Design a scalable order processing service.
                 "Missing context about which CLI tool and target platforms"
             ],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.56},
         },
     },
     # Education (2 prompts)
@@ -221,7 +221,7 @@ Design a scalable order processing service.
             "assumptions": [],
             "ambiguities": ["Missing class duration and student prior knowledge level"],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.6},
         },
     },
     {
@@ -237,7 +237,7 @@ Design a scalable order processing service.
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.61},
         },
     },
     # Business (2 prompts)
@@ -256,7 +256,7 @@ Requirements: Focus on product improvements and communication.""",
             "assumptions": [],
             "ambiguities": ["Missing specific retention metrics and churn reasons"],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.8},
         },
     },
     {
@@ -276,7 +276,7 @@ Requirements: Focus on product improvements and communication.""",
                 "structure": ["Current Step", "Issue", "Proposed Solution"],
                 "language": None,
             },
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.54},
         },
     },
     # Creative (2 prompts)
@@ -293,7 +293,7 @@ Requirements: Focus on product improvements and communication.""",
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.61},
         },
     },
     {
@@ -309,7 +309,7 @@ Requirements: Focus on product improvements and communication.""",
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.61},
         },
     },
     # Research (2 prompts)
@@ -331,7 +331,7 @@ Result: Structured summary in JSON""",
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": "json", "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.88},
         },
     },
     {
@@ -347,7 +347,7 @@ Result: Structured summary in JSON""",
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.61},
         },
     },
     # General (2 prompts)
@@ -364,7 +364,7 @@ Result: Structured summary in JSON""",
             "assumptions": [],
             "ambiguities": [],
             "output_spec": {"format": None, "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.56},
         },
     },
     {
@@ -397,7 +397,7 @@ Output: YAML with phases and milestones""",
             "assumptions": [],
             "ambiguities": ["Missing details about monolith size and complexity"],
             "output_spec": {"format": "yaml", "structure": [], "language": None},
-            "metadata": {"extracted_by": "heuristic", "confidence": 0.55},
+            "metadata": {"extracted_by": "heuristic", "confidence": 0.87},
         },
     },
 ]
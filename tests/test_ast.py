@@ -2,6 +2,7 @@ import builtins
 import pytest
 
 from prompt_ast.ast import PromptAST
+from prompt_ast.lite import PromptASTLite
 
 
 def test_ast_json_serialization():
@@ -28,3 +29,58 @@ def test_ast_yaml_missing_dependency_raises(monkeypatch):
     with pytest.raises(ImportError) as excinfo:
         PromptAST(raw="Hello").to_yaml()
     assert "Install YAML support" in str(excinfo.value)
+
+
+def test_ast_lite_round_trip():
+    ast = PromptAST(
+        raw="Hello",
+        task="Say hello",
+        constraints=["Be concise"],
+        output_spec={"format": "json", "structure": ["Greeting"]},
+        metadata={"source": "test"},
+    )
+    lite = PromptASTLite.from_ast(ast)
+
+    assert lite.constraints == ("Be concise",)
+    assert lite.output_structure == ("Greeting",)
+    assert lite.to_dict() == ast.to_dict()
+    assert lite.to_ast() == ast
+
+
+def test_ast_lite_metadata_is_frozen_and_unshared():
+    ast = PromptAST(
+        raw="Hello",
+        metadata={"field_confidence": {"task": 0.6}, "heuristic_fields": ["task"]},
+    )
+    lite = PromptASTLite.from_ast(ast)
+    ast.metadata["field_confidence"]["task"] = 0.0
+    ast.metadata["heuristic_fields"].append("role")
+    assert lite.metadata["field_confidence"]["task"] == 0.6
+    assert lite.metadata["heuristic_fields"] == ("task",)
+    with pytest.raises(TypeError):
+        lite.metadata["field_confidence"]["task"] = 0.0
+
+    copy = lite.to_ast()
+    copy.metadata["field_confidence"]["task"] = 1.0
+    assert lite.to_dict()["metadata"] == {
+        "field_confidence": {"task": 0.6},
+        "heuristic_fields": ["task"],
+    }
+
+
+def test_ast_lite_is_immutable_and_slotted():
+    lite = PromptASTLite(raw="Hello")
+    with pytest.raises(AttributeError):
+        lite.task = "x"
+    assert not hasattr(lite, "__dict__")
+    assert lite.to_dict() == PromptAST(raw="Hello").to_dict()
+
+
+def test_heuristic_lite_matches_heuristic():
+    from prompt_ast.parse import parse_prompt_heuristic, parse_prompt_heuristic_lite
+
+    text = "Act as a tutor. Explain recursion step by step in JSON."
+    lite = parse_prompt_heuristic_lite(text)
+
+    assert lite.to_ast() == parse_prompt_heuristic(text)
+    assert lite.metadata["extracted_by"] == "heuristic"
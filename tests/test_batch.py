@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import pytest
+
+from prompt_ast import parse_prompts
+from prompt_ast.parse.heuristic import parse_prompt_heuristic
+
+from .fixtures import FIXTURES
+
+PROMPTS = [f["prompt"] for f in FIXTURES]
+
+
+def test_parse_prompts_in_process_matches_single_parse():
+    results = list(parse_prompts(PROMPTS, workers=1, chunksize=3))
+    assert [r.to_dict() for r in results] == [
+        parse_prompt_heuristic(p.strip()).to_dict() for p in PROMPTS
+    ]
+
+
+def test_parse_prompts_process_pool_preserves_input_order():
+    results = list(parse_prompts(iter(PROMPTS), workers=2, chunksize=3))
+    assert [r.raw for r in results] == [p.strip() for p in PROMPTS]
+
+
+def test_parse_prompts_unordered_yields_indexed_results():
+    results = dict(parse_prompts(PROMPTS, workers=2, chunksize=4, ordered=False))
+    assert sorted(results) == list(range(len(PROMPTS)))
+    for i, ast in results.items():
+        assert ast.raw == PROMPTS[i].strip()
+
+
+def test_parse_prompts_empty_input():
+    assert list(parse_prompts([], workers=2)) == []
+
+
+@pytest.mark.parametrize("kwargs", [{"workers": 0}, {"chunksize": 0}])
+def test_parse_prompts_rejects_invalid_settings(kwargs):
+    with pytest.raises(ValueError):
+        parse_prompts(PROMPTS, **kwargs)
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import json
+
+from benchmarks.suite import compare, main
+
+
+def _results(ops: float) -> dict:
+    return {"meta": {}, "results": {"heuristic/100": {"ops_per_sec": ops}}}
+
+
+def test_compare_flags_regressions_past_threshold():
+    assert compare(_results(100), _results(90), threshold=0.15) == []
+    (message,) = compare(_results(100), _results(80), threshold=0.15)
+    assert message.startswith("heuristic/100")
+    assert compare(_results(100), {"meta": {}, "results": {}}, threshold=0.15) == []
+
+
+def test_run_and_compare_round_trip(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["--max-size", "100", "--budget", "0", "-k", "heuristic"]
+    assert main(["run", *args, "--output", str(baseline)]) == 0
+
+    data = json.loads(baseline.read_text())
+    assert set(data["results"]) == {"heuristic/100"}
+    assert data["results"]["heuristic/100"]["rounds"] >= 3
+
+    slower = _results(data["results"]["heuristic/100"]["ops_per_sec"] / 2)
+    current = tmp_path / "current.json"
+    current.write_text(json.dumps(slower))
+    assert main(["compare", str(baseline), "--current", str(current)]) == 1
+    assert "REGRESSION heuristic/100" in capsys.readouterr().err
@@ -0,0 +1,79 @@
+import json
+
+from typer.testing import CliRunner
+
+from prompt_ast.cli import app
+
+runner = CliRunner()
+
+
+def test_batch_reads_jsonl_from_stdin():
+    stdin = "\n".join(
+        [
+            json.dumps({"prompt": "Act as a tester. Be concise."}),
+            "",
+            json.dumps("Use JSON."),
+        ]
+    )
+    result = runner.invoke(app, ["batch"], input=stdin)
+
+    assert result.exit_code == 0
+    lines = result.stdout.splitlines()
+    assert len(lines) == 3
+    first, blank, second = (json.loads(line) for line in lines)
+    assert blank == {"line": 2, "error": "blank line"}
+    assert first["raw"] == "Act as a tester. Be concise."
+    assert "Be concise" in first["constraints"]
+    assert second["output_spec"]["format"] == "json"
+    assert "\n" not in lines[0] and "  " not in lines[0]
+
+
+def test_batch_reads_plain_lines_from_file(tmp_path):
+    prompt_file = tmp_path / "prompts.txt"
+    prompt_file.write_text("Be concise.\nUse YAML.\n")
+
+    result = runner.invoke(
+        app,
+        ["batch", "--file", str(prompt_file), "--input-format", "lines", "--workers", "2"],
+    )
+
+    assert result.exit_code == 0
+    raws = [json.loads(line)["raw"] for line in result.stdout.splitlines()]
+    assert raws == ["Be concise.", "Use YAML."]
+
+
+def test_batch_skips_malformed_lines_and_fails():
+    stdin = "\n".join(['{"text": "no prompt key"}', "not json", '"Be brief."'])
+    result = runner.invoke(app, ["batch"], input=stdin)
+
+    assert result.exit_code == 1
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r.get("line") for r in records] == [1, 2, None]
+    assert "'prompt'" in records[0]["error"]
+    assert "invalid JSON" in records[1]["error"]
+    assert records[2]["raw"] == "Be brief."
+
+
+def test_batch_custom_field():
+    result = runner.invoke(
+        app, ["batch", "--field", "text"], input=json.dumps({"text": "Be brief."})
+    )
+    assert result.exit_code == 0
+    assert json.loads(result.stdout)["raw"] == "Be brief."
+
+
+def test_batch_output_lines_match_input_lines_with_workers():
+    stdin = "\n".join(['"Be concise."', "", "not json", '"Use YAML."', "", ""]) + "\n"
+    result = runner.invoke(
+        app, ["batch", "--workers", "2", "--chunksize", "1"], input=stdin
+    )
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [r.get("line") for r in records] == [None, 2, 3, None, 5, 6]
+    assert [r.get("raw") for r in records[::3]] == ["Be concise.", "Use YAML."]
+
+
+def test_batch_rejects_non_positive_workers_and_chunksize():
+    for option in ("--workers", "--chunksize"):
+        result = runner.invoke(app, ["batch", option, "0"], input='"Be brief."')
+        assert result.exit_code == 2  # usage error, not a traceback
+        assert not isinstance(result.exception, ValueError)
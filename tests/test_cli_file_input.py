@@ -125,3 +125,62 @@ def test_normalize_file_too_large(tmp_path):
 
     assert result.exit_code == 1
     assert "too large" in result.stdout
+
+
+def test_normalize_file_max_size_option(tmp_path):
+    """Test that --max-size raises or lifts the size limit."""
+
+    prompt_file = tmp_path / "big.txt"
+    prompt_file.write_text("Be concise. " * (200 * 1024))
+
+    result = runner.invoke(
+        app, ["normalize", "--file", str(prompt_file), "--max-size", "1"]
+    )
+    assert result.exit_code == 1
+    assert "Maximum size is 1MB" in result.stdout
+
+    result = runner.invoke(
+        app, ["normalize", "--file", str(prompt_file), "--max-size", "0", "--no-raw"]
+    )
+    assert result.exit_code == 0
+    assert "Be concise" in result.stdout
+
+    result = runner.invoke(
+        app, ["normalize", "--file", str(prompt_file), "--max-size", "-1"]
+    )
+    assert result.exit_code == 2  # rejected, not read as "no limit"
+
+
+def test_normalize_file_no_raw(tmp_path):
+    """Test that --no-raw leaves the prompt text out of the AST."""
+
+    prompt_file = tmp_path / "prompt.txt"
+    prompt_file.write_text("Act as a chef.\nWrite a recipe in JSON.")
+
+    result = runner.invoke(app, ["normalize", "--file", str(prompt_file), "--no-raw"])
+
+    assert result.exit_code == 0
+    assert '"raw": ""' in result.stdout
+    assert '"role": "chef"' in result.stdout
+
+
+def test_normalize_file_invalid_utf8(tmp_path):
+    """Test error message when the file is not valid UTF-8."""
+
+    prompt_file = tmp_path / "binary.txt"
+    prompt_file.write_bytes(b"Write a poem \xff\xfe")
+
+    result = runner.invoke(app, ["normalize", "--file", str(prompt_file)])
+
+    assert result.exit_code == 1
+    assert "Error reading file" in result.stdout
+
+
+def test_normalize_compact_format():
+    """Test that --format compact prints one bare JSON line."""
+
+    result = runner.invoke(app, ["normalize", "Act as a chef.", "--format", "compact"])
+
+    assert result.exit_code == 0
+    assert result.stdout.count("\n") == 1
+    assert '"role":"chef"' in result.stdout
@@ -53,3 +53,19 @@ def test_cli_hybrid_mode_with_use_openai(monkeypatch):
         app, ["normalize", "hello", "--mode", "hybrid", "--use-openai"]
     )
     assert result.exit_code == 0
+
+
+def test_cli_hybrid_threshold_skips_llm(monkeypatch):
+    import prompt_ast.llm.openai_compat as oc
+
+    monkeypatch.setattr(oc, "OpenAICompatClient", _FakeOpenAICompatClient)
+    prompt = "Context: Internal API.\nTask: Review the auth flow.\nConstraints:\n- Be concise"
+    args = ["normalize", prompt, "--mode", "hybrid", "--use-openai", "--format", "compact"]
+
+    skipped = json.loads(runner.invoke(app, [*args, "--threshold", "0.7"]).stdout)
+    assert skipped["metadata"]["llm_consulted"] is False
+    assert skipped["task"] == "Review the auth flow."
+
+    refined = json.loads(runner.invoke(app, [*args, "--threshold", "0.95"]).stdout)
+    assert refined["metadata"]["llm_consulted"] is True
+    assert refined["task"] == "Do a thing"
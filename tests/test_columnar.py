@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import builtins
+import json
+
+import pytest
+
+from prompt_ast.columnar import read_columnar, write_columnar
+from prompt_ast.parse import parse_prompt_heuristic, parse_prompt_heuristic_lite
+
+from .fixtures import FIXTURES
+
+ASTS = [parse_prompt_heuristic(f["prompt"]) for f in FIXTURES]
+
+
+def test_columnar_jsonl_round_trip(tmp_path):
+    path = tmp_path / "asts.jsonl"
+
+    assert write_columnar(ASTS, path, fmt="jsonl", row_group_size=8) == len(ASTS)
+    assert list(read_columnar(path, fmt="jsonl")) == ASTS
+
+
+def test_columnar_jsonl_layout(tmp_path):
+    path = tmp_path / "asts.jsonl"
+    lites = [parse_prompt_heuristic_lite(f["prompt"]) for f in FIXTURES]
+    write_columnar(lites, path, fmt="jsonl", row_group_size=8)
+
+    header, *groups = [json.loads(line) for line in path.read_text().splitlines()]
+    assert header["format"] == "prompt-ast-columnar"
+    assert [g["rows"] for g in groups] == [8, 8, 4]
+
+    columns = groups[0]["columns"]
+    assert columns["constraints"] == [list(lite.constraints) for lite in lites[:8]]
+    role = columns["role"]
+    assert len(role["dictionary"]) == len(set(role["dictionary"]))
+    assert [None if i is None else role["dictionary"][i] for i in role["indices"]] == [
+        lite.role for lite in lites[:8]
+    ]
+    assert set(columns["output_spec"]) == {"format", "structure", "language"}
+    assert "dictionary" in columns["output_spec"]["format"]
+
+
+def test_columnar_jsonl_rejects_other_files(tmp_path):
+    path = tmp_path / "other.jsonl"
+    path.write_text('{"prompt": "hi"}\n')
+
+    with pytest.raises(ValueError):
+        list(read_columnar(path, fmt="jsonl"))
+
+
+def test_columnar_parquet_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "asts.parquet"
+    assert write_columnar(ASTS, path, row_group_size=8) == len(ASTS)
+    assert list(read_columnar(path)) == ASTS
+
+    schema = pq.read_schema(path)
+    assert str(schema.field("role").type).startswith("dictionary")
+    assert str(schema.field("constraints").type).startswith("list")
+    assert str(schema.field("output_spec").type).startswith("struct")
+
+
+def test_columnar_parquet_missing_dependency_raises(tmp_path, monkeypatch):
+    real_import = builtins.__import__
+
+    def fake_import(name, *args, **kwargs):
+        if name.startswith("pyarrow"):
+            raise ImportError("no pyarrow")
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "__import__", fake_import)
+    with pytest.raises(ImportError) as excinfo:
+        write_columnar(ASTS, tmp_path / "asts.parquet")
+    assert "Install Parquet support" in str(excinfo.value)
+
+
+def test_columnar_rejects_invalid_settings(tmp_path):
+    with pytest.raises(ValueError):
+        write_columnar(ASTS, tmp_path / "x", fmt="csv")  # type: ignore[arg-type]
+    with pytest.raises(ValueError):
+        write_columnar(ASTS, tmp_path / "x", row_group_size=0)
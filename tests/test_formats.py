@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import json
+
 import pytest
 
+from prompt_ast import formats
 from prompt_ast.ast import PromptAST
-from prompt_ast.formats import serialize
+from prompt_ast.formats import serialize, serialize_many
+from prompt_ast.parse import parse_prompt_heuristic, parse_prompt_heuristic_lite
+
+from .fixtures import FIXTURES
 
 
 def test_serialize_dict():
@@ -31,3 +37,37 @@ def test_serialize_unsupported_format():
     ast = PromptAST(raw="Hello", task="Say hello")
     with pytest.raises(ValueError):
         serialize(ast, fmt="xml")  # type: ignore[arg-type]
+
+
+def test_serialize_compact_matches_pretty_json():
+    ast = PromptAST(raw="Héllo", task="Say hello", constraints=["Be brief"])
+    out = serialize(ast, fmt="compact")
+    assert isinstance(out, str)
+    assert "\n" not in out and ": " not in out
+    assert json.loads(out) == json.loads(ast.to_json())
+
+
+def test_serialize_many_jsonl_and_array():
+    asts = [parse_prompt_heuristic(f["prompt"]) for f in FIXTURES[:5]]
+
+    lines = serialize_many(asts).splitlines()
+    assert [json.loads(line) for line in lines] == [a.to_dict() for a in asts]
+    assert json.loads(serialize_many(asts, fmt="json")) == [a.to_dict() for a in asts]
+    assert serialize_many([], fmt="json") == "[]"
+    with pytest.raises(ValueError):
+        serialize_many(asts, fmt="csv")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("use_orjson", [False, True])
+def test_compact_json_for_lite_matches_pydantic(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(formats, "_orjson", lambda: None)
+    prompts = [f["prompt"] for f in FIXTURES[:5]] + ["Écris un poème. Be concise."]
+    lites = [parse_prompt_heuristic_lite(p) for p in prompts]
+
+    assert serialize_many(lites) == serialize_many([lite.to_ast() for lite in lites])
+    assert serialize_many(lites, fmt="json") == serialize_many(
+        [lite.to_ast() for lite in lites], fmt="json"
+    )
@@ -1,3 +1,5 @@
+import pytest
+
 from prompt_ast.parse.heuristic import parse_prompt_heuristic
 
 
@@ -8,3 +10,95 @@ def test_heuristic_extracts_role_and_constraints():
     assert any("concise" in c.lower() for c in ast.constraints)
     assert any("bullet" in c.lower() for c in ast.constraints)
     assert ast.metadata.get("extracted_by") == "heuristic"
+
+
+def test_constraints_ordered_by_first_occurrence():
+    from prompt_ast.parse.heuristic import _infer_constraints
+
+    text = "Be brief. Explain step by step for beginners. Keep it concise and casual."
+    assert _infer_constraints(text) == [
+        "Be concise",
+        "Use step-by-step instructions",
+        "Casual tone",
+        "For beginners",
+    ]
+
+
+def test_constraints_respect_word_boundaries_and_sentence_starts():
+    from prompt_ast.parse.heuristic import _infer_constraints
+
+    assert "Use bullet points" not in _infer_constraints("Reuse bullet styles.")
+    assert _infer_constraints("Blacklist 5 domains.") == []
+    assert _infer_constraints("Plan a trip. List 3 Museums in Rome.") == [
+        "List 3 Museums in Rome"
+    ]
+
+
+def test_constraints_keep_original_casing_for_non_ascii_prompts():
+    from prompt_ast.parse.heuristic import _infer_constraints
+
+    assert _infer_constraints("Write a story set in İstanbul. Be concise.") == [
+        "Set in İstanbul",
+        "Be concise",
+    ]
+
+
+@pytest.mark.parametrize(
+    "prompt, expected",
+    [
+        ("Write a blogging guide about Python.", ["Missing target audience specification"]),
+        ("Summarize the posted articles.", ["Missing target audience specification"]),
+        ("Review our blogger's contents.", ["Missing target audience specification"]),
+        ("Write a post that explains closures.", []),
+        ("Teachers need a quiz.", ["Missing class duration and student prior knowledge level"]),
+        ("Teach closures, hourly sessions.", []),
+        ("Help our client pick a tool.", ["Missing context about which CLI tool and target platforms"]),
+        ("Improve retention strategy, rates are dropping.", [
+            "Missing specific retention metrics and churn reasons"
+        ]),
+    ],
+)
+def test_ambiguity_terms_match_inside_tokens(prompt, expected):
+    from prompt_ast.parse.heuristic import parse_prompt_heuristic as parse
+
+    # Terms match anywhere inside a word, as the original substring checks did;
+    # the retention suppressors alone need whole words.
+    assert parse(prompt).ambiguities == expected
+
+
+def test_ambiguity_rule_requires_every_trigger_group():
+    from prompt_ast.parse.heuristic import AmbiguityRule, _index_ambiguity_rules
+
+    rules = (
+        AmbiguityRule(message="a", triggers=(("cli",), ("tool", "tools"))),
+        AmbiguityRule(message="b", triggers=(("tools",),)),
+    )
+    index = _index_ambiguity_rules(rules)
+    assert index["cli"] == ((0, 0),)
+    assert index["tools"] == ((0, 1), (1, 0))
+
+
+def test_confidence_reflects_how_fields_were_found():
+    from prompt_ast.parse.heuristic import parse_prompt_heuristic as parse
+
+    sectioned = parse(
+        "Context: Internal API.\nTask: Review the auth flow.\nConstraints:\n- Be concise"
+    ).metadata
+    prose = parse("Tell me about databases").metadata
+
+    assert sectioned["field_confidence"]["task"] > prose["field_confidence"]["task"]
+    assert sectioned["field_confidence"]["context"] > prose["field_confidence"]["context"]
+    assert sectioned["confidence"] > prose["confidence"]
+    assert 0.0 <= prose["confidence"] <= 1.0
+
+
+def test_ambiguities_lower_overall_confidence():
+    from prompt_ast.parse.heuristic import overall_confidence
+
+    fields = {"role": 0.9, "context": 0.5, "task": 0.6, "constraints": 0.7, "output_spec": 0.6}
+    assert overall_confidence(fields, ambiguities=2) == round(
+        overall_confidence(fields) - 0.1, 2
+    )
+    assert overall_confidence(fields, ambiguities=100) == round(
+        overall_confidence(fields) - 0.2, 2
+    )
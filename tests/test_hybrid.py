@@ -48,3 +48,252 @@ def test_parse_prompt_hybrid_raises_on_invalid_json():
     llm = DummyLLM("{not json}")
     with pytest.raises(ParseError):
         parse_prompt_hybrid("Hello", llm=llm)
+
+
+def test_parse_prompt_hybrid_async_uses_llm_refinement():
+    import asyncio
+
+    from prompt_ast.parse.hybrid import parse_prompt_hybrid_async
+
+    class AsyncDummyLLM(DummyLLM):
+        async def complete(self, prompt: str) -> str:
+            return super().complete(prompt)
+
+    llm = AsyncDummyLLM(_llm_json({"role": "refined"}))
+    ast = asyncio.run(parse_prompt_hybrid_async("Act as a tester.", llm=llm))
+    assert ast.role == "refined"
+    assert "CURRENT AST JSON" in llm.prompts[0]
+
+
+SECTIONED = "Context: Internal API.\nTask: Review the auth flow.\nConstraints:\n- Be concise"
+
+
+def test_parse_prompt_hybrid_skips_llm_above_threshold():
+    llm = DummyLLM(_llm_json({"role": "refined"}))
+    ast = parse_prompt_hybrid(SECTIONED, llm=llm, threshold=0.7)
+    assert llm.prompts == []
+    assert ast.metadata["extracted_by"] == "heuristic"
+    assert ast.metadata["llm_consulted"] is False
+    assert ast.task == "Review the auth flow."
+
+
+def test_parse_prompt_hybrid_consults_llm_below_threshold():
+    llm = DummyLLM(_llm_json({"role": "refined"}))
+    ast = parse_prompt_hybrid("Tell me about databases", llm=llm, threshold=0.7)
+    assert len(llm.prompts) == 1
+    assert ast.role == "refined"
+    assert ast.metadata["llm_consulted"] is True
+    assert ast.metadata["heuristic_confidence"] < 0.7
+
+
+def test_parse_prompt_hybrid_rejects_out_of_range_threshold():
+    with pytest.raises(ValueError):
+        parse_prompt_hybrid(SECTIONED, llm=DummyLLM(_llm_json()), threshold=1.5)
+
+
+def test_parse_prompt_async_passes_threshold_to_hybrid():
+    import asyncio
+
+    from prompt_ast import parse_prompt_async
+
+    class AsyncDummyLLM(DummyLLM):
+        async def complete(self, prompt: str) -> str:
+            return super().complete(prompt)
+
+    llm = AsyncDummyLLM(_llm_json())
+    ast = asyncio.run(parse_prompt_async(SECTIONED, mode="hybrid", llm=llm, threshold=0.7))
+    assert llm.prompts == []
+    assert ast.metadata["llm_consulted"] is False
+
+
+def test_compact_refine_request_drops_raw_and_empty_fields():
+    from prompt_ast.parse.heuristic import parse_prompt_heuristic
+    from prompt_ast.parse.hybrid import build_refine_request
+
+    base = parse_prompt_heuristic(SECTIONED)
+    request = build_refine_request(SECTIONED, base)
+    ast_json = request.prompt.split("CURRENT AST JSON:\n", 1)[1].strip()
+    body = json.loads(ast_json)
+    assert set(body) == {"context", "task", "constraints"}
+    assert ast_json == json.dumps(body, separators=(",", ":"))
+    assert request.prompt.count("Review the auth flow.") == 2  # prompt + task
+    assert request.report["bytes"] == len(request.prompt.encode("utf-8"))
+    assert request.report["bytes_saved"] > 0
+    assert request.report["tokens_saved"] > 0
+
+
+def test_full_refine_request_reports_no_savings():
+    from prompt_ast.parse.heuristic import parse_prompt_heuristic
+    from prompt_ast.parse.hybrid import REFINE_PROMPT, build_refine_request
+
+    base = parse_prompt_heuristic(SECTIONED)
+    request = build_refine_request(SECTIONED, base, compact=False)
+    assert request.prompt == REFINE_PROMPT.format(raw=SECTIONED, ast_json=base.to_json())
+    assert request.report["bytes_saved"] == request.report["tokens_saved"] == 0
+    with pytest.raises(ValueError):
+        build_refine_request(SECTIONED, base, compact=False, focus_below=0.8)
+
+
+def test_parse_prompt_hybrid_focus_keeps_confident_fields():
+    llm = DummyLLM(
+        _llm_json({"role": "auditor", "task": "Something else", "constraints": []})
+    )
+    ast = parse_prompt_hybrid(SECTIONED, llm=llm, focus_below=0.8, report=True)
+    body = json.loads(llm.prompts[0].split("CURRENT AST JSON:\n", 1)[1])
+    assert body == {}  # context, task and constraints came from sections
+    assert "role" in llm.prompts[0] and '"task"' not in llm.prompts[0]
+    assert ast.role == "auditor"
+    assert ast.task == "Review the auth flow."
+    assert ast.constraints == ["Be concise"]
+    assert ast.metadata["heuristic_fields"] == ["context", "task", "constraints"]
+    assert ast.metadata["refine_request"]["tokens_saved"] > 0
+
+
+def test_parse_prompt_hybrid_keeps_fields_a_compact_reply_leaves_out():
+    ast = parse_prompt_hybrid(SECTIONED, llm=DummyLLM('{"role":"reviewer"}'))
+    assert ast.role == "reviewer"
+    assert ast.context == "Internal API."
+    assert ast.task == "Review the auth flow."
+    assert ast.constraints == ["Be concise"]
+
+
+def test_full_refine_takes_the_reply_as_is():
+    ast = parse_prompt_hybrid(SECTIONED, llm=DummyLLM('{"role":"reviewer"}'), compact=False)
+    assert ast.role == "reviewer"
+    assert ast.task is None
+
+
+def test_parse_prompt_hybrid_builds_size_report_only_on_request(monkeypatch):
+    from prompt_ast.parse import hybrid
+
+    built = []
+    monkeypatch.setattr(
+        hybrid, "_full_prompt", lambda raw, base: built.append(raw) or hybrid.REFINE_PROMPT
+    )
+    ast = parse_prompt_hybrid(SECTIONED, llm=DummyLLM(_llm_json()))
+    assert "refine_request" not in ast.metadata
+    assert built == []
+
+
+def test_parse_prompt_hybrid_rejects_out_of_range_focus():
+    with pytest.raises(ValueError):
+        parse_prompt_hybrid(SECTIONED, llm=DummyLLM(_llm_json()), focus_below=2)
+
+
+class ScriptedLLM:
+    """Replies with the scripted responses in order, recording each prompt."""
+
+    def __init__(self, *responses: str):
+        self.responses = list(responses)
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return self.responses.pop(0)
+
+
+SECTIONED_WITH_FORMAT = (
+    "Act as a security reviewer.\n" + SECTIONED + "\n- Return the answer as JSON"
+)
+
+
+def test_patch_request_asks_only_for_uncertain_fields():
+    from prompt_ast.parse.heuristic import parse_prompt_heuristic
+    from prompt_ast.parse.hybrid import build_patch_request
+
+    base = parse_prompt_heuristic(SECTIONED)
+    request = build_patch_request(SECTIONED, base)
+    # role and output_spec are missing (0.6); context/task/constraints came from sections
+    assert request.patch == ("role", "assumptions", "ambiguities", "output_spec")
+    assert request.kept == ("context", "task", "constraints")
+    assert "these fields: role, assumptions, ambiguities, output_spec." in request.prompt
+    assert request.report["tokens_saved"] > 0
+
+
+def test_parse_prompt_hybrid_patch_merges_into_heuristic_ast():
+    llm = ScriptedLLM(
+        json.dumps(
+            {
+                "role": "security reviewer",
+                "task": "Ignored: not requested",
+                "assumptions": ["Token-based auth"],
+                "output_spec": {"format": "markdown"},
+            }
+        )
+    )
+    ast = parse_prompt_hybrid(SECTIONED, llm=llm, patch=True, report=True)
+    assert len(llm.prompts) == 1
+    assert ast.role == "security reviewer"
+    assert ast.task == "Review the auth flow."
+    assert ast.context == "Internal API."
+    assert ast.constraints == ["Be concise"]
+    assert ast.assumptions == ["Token-based auth"]
+    assert ast.output_spec.format == "markdown"
+    assert ast.metadata["extracted_by"] == "hybrid"
+    assert ast.metadata["patched_fields"] == ["role", "assumptions", "output_spec"]
+    assert ast.metadata["llm_consulted"] is True
+    assert ast.metadata["refine_request"]["reply_tokens"] > 0
+
+
+def test_merge_patch_precedence_rules():
+    from prompt_ast.parse.heuristic import parse_prompt_heuristic
+    from prompt_ast.parse.hybrid import merge_patch
+
+    base = parse_prompt_heuristic(SECTIONED)
+    base.output_spec.structure = ["Findings", "Fixes"]
+    merged = merge_patch(
+        base,
+        {
+            "context": None,  # clears a requested field
+            "constraints": None,
+            "task": "Outside the requested fields",
+            "output_spec": {"format": "json", "language": None},
+        },
+        ["context", "constraints", "output_spec"],
+    )
+    assert merged.context is None
+    assert merged.constraints == []
+    assert merged.task == "Review the auth flow."
+    assert merged.output_spec.format == "json"
+    assert merged.output_spec.structure == ["Findings", "Fixes"]  # merged key by key
+    assert merged.metadata["patched_fields"] == ["context", "constraints", "output_spec"]
+    assert base.context == "Internal API."  # base is not modified
+
+
+def test_merge_patch_rejects_invalid_values():
+    from prompt_ast.parse.heuristic import parse_prompt_heuristic
+    from prompt_ast.parse.hybrid import merge_patch
+
+    base = parse_prompt_heuristic(SECTIONED)
+    with pytest.raises(ParseError):
+        merge_patch(base, {"constraints": "Be concise"}, ["constraints"])
+
+
+def test_parse_prompt_hybrid_patch_skips_llm_when_nothing_is_uncertain():
+    llm = ScriptedLLM()
+    ast = parse_prompt_hybrid(SECTIONED_WITH_FORMAT, llm=llm, patch=True)
+    assert llm.prompts == []
+    assert ast.metadata["llm_consulted"] is False
+    assert ast.metadata["extracted_by"] == "heuristic"
+
+
+def test_parse_prompt_hybrid_patch_rejects_non_object_reply():
+    with pytest.raises(ParseError):
+        parse_prompt_hybrid(SECTIONED, llm=ScriptedLLM('["role"]'), patch=True)
+    with pytest.raises(ValueError):
+        parse_prompt_hybrid(SECTIONED, llm=ScriptedLLM(), patch=True, compact=False)
+
+
+def test_parse_prompt_hybrid_async_patch():
+    import asyncio
+
+    from prompt_ast.parse.hybrid import parse_prompt_hybrid_async
+
+    class AsyncScriptedLLM(ScriptedLLM):
+        async def complete(self, prompt: str) -> str:
+            return super().complete(prompt)
+
+    llm = AsyncScriptedLLM('{"role":"auditor"}')
+    ast = asyncio.run(parse_prompt_hybrid_async(SECTIONED, llm=llm, patch=True))
+    assert ast.role == "auditor"
+    assert ast.task == "Review the auth flow."
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import pytest
+
+from benchmarks.import_time import SCENARIOS, loaded_modules, measure
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s.name)
+def test_entry_point_does_not_load_heavy_modules(scenario):
+    loaded = loaded_modules(scenario.statement)
+    assert not sorted(m for m in scenario.forbidden if m in loaded)
+
+
+@pytest.mark.parametrize("scenario", SCENARIOS, ids=lambda s: s.name)
+def test_entry_point_import_stays_within_budget(scenario):
+    # Budgets leave ~3x headroom; the best of three runs absorbs scheduler noise
+    ms = min(measure(scenario.statement)[0] for _ in range(3))
+    assert ms <= scenario.budget_ms, f"{scenario.name}: {ms:.1f} ms"
+
+
+def test_import_does_not_load_pydantic_httpx_or_rich():
+    loaded = loaded_modules("import prompt_ast")
+    assert "prompt_ast" in loaded
+    assert not {"pydantic", "httpx", "rich"} & loaded
+
+
+def test_lazy_attributes_still_resolve():
+    import prompt_ast
+
+    assert prompt_ast.PromptAST.__name__ == "PromptAST"
+    assert prompt_ast.parse_prompts.__module__ == "prompt_ast.batch"
+    assert "parse_prompt_hybrid" in dir(prompt_ast)
+    with pytest.raises(AttributeError):
+        prompt_ast.does_not_exist
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import json
+import re
+
 import pytest
 
 from prompt_ast.errors import ParseError
@@ -79,3 +81,187 @@ def test_parse_prompt_llm_raises_on_schema_validation_error():
     llm = DummyLLM(bad)
     with pytest.raises(ParseError):
         parse_prompt_llm("Input text", llm=llm)
+
+
+class AsyncDummyLLM(DummyLLM):
+    async def complete(self, prompt: str) -> str:
+        return super().complete(prompt)
+
+
+def test_parse_prompt_llm_async_uses_same_validation():
+    import asyncio
+
+    from prompt_ast.parse.llm import parse_prompt_llm_async
+
+    llm = AsyncDummyLLM(f"Sure:\n{_llm_json({'role': 'async'})}")
+    ast = asyncio.run(parse_prompt_llm_async("  Input text ", llm=llm))
+    assert ast.role == "async"
+    assert ast.raw == "Input text"
+    assert "USER PROMPT:\nInput text" in llm.prompts[0]
+
+    with pytest.raises(ParseError):
+        asyncio.run(parse_prompt_llm_async("Input text", llm=AsyncDummyLLM("nope")))
+
+
+class BatchDummyLLM:
+    """Answers batch prompts with `batch_reply(count)` and single prompts with JSON."""
+
+    def __init__(self, batch_reply):
+        self.batch_reply = batch_reply
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        if "USER PROMPTS:" in prompt:
+            return self.batch_reply(len(re.findall(r"<<<END \d+>>>", prompt)))
+        return _llm_json({"role": "single"})
+
+
+def _batch_json(count: int) -> str:
+    return json.dumps(
+        [{**json.loads(_llm_json({"role": f"batched {i}"})), "index": i} for i in range(count)]
+    )
+
+
+def test_parse_prompts_llm_packs_prompts_into_one_call():
+    from prompt_ast.parse.llm import EXTRACTION_PROMPT, parse_prompts_llm
+
+    llm = BatchDummyLLM(_batch_json)
+    texts = [f" prompt {i} " for i in range(5)]
+    asts = parse_prompts_llm(texts, llm=llm, batch_size=4)
+
+    assert [ast.role for ast in asts] == [f"batched {i}" for i in range(4)] + ["single"]
+    assert [ast.raw for ast in asts] == [t.strip() for t in texts]
+    assert len(llm.prompts) == 2
+    assert llm.prompts[0].count(EXTRACTION_PROMPT) == 1
+    assert "<<<PROMPT 3>>>\nprompt 3\n<<<END 3>>>" in llm.prompts[0]
+
+
+def test_parse_prompts_llm_orders_by_index_and_retries_failed_items():
+    from prompt_ast.parse.llm import parse_prompts_llm
+
+    def reply(count: int) -> str:
+        items = json.loads(_batch_json(count))
+        items[1]["constraints"] = "not-a-list"  # fails validation
+        del items[2]  # missing from the reply
+        return "Here you go:\n" + json.dumps(items[::-1])
+
+    llm = BatchDummyLLM(reply)
+    asts = parse_prompts_llm(["a", "b", "c", "d"], llm=llm, batch_size=4)
+    assert [ast.role for ast in asts] == ["batched 0", "single", "single", "batched 3"]
+    assert len(llm.prompts) == 3
+
+
+def test_parse_prompts_llm_falls_back_when_reply_is_not_an_array():
+    from prompt_ast.parse.llm import parse_prompts_llm
+
+    llm = BatchDummyLLM(lambda count: _llm_json())
+    asts = parse_prompts_llm(["a", "b"], llm=llm)
+    assert [ast.role for ast in asts] == ["single", "single"]
+    assert len(llm.prompts) == 3
+
+    with pytest.raises(ValueError):
+        parse_prompts_llm(["a"], llm=llm, batch_size=0)
+
+
+def test_parse_prompts_llm_async_batches_and_falls_back():
+    import asyncio
+
+    from prompt_ast.parse.llm import parse_prompts_llm_async
+
+    class AsyncBatchDummyLLM(BatchDummyLLM):
+        async def complete(self, prompt: str) -> str:
+            return super().complete(prompt)
+
+    def reply(count: int) -> str:
+        return json.dumps(json.loads(_batch_json(count))[:-1])
+
+    llm = AsyncBatchDummyLLM(reply)
+    asts = asyncio.run(parse_prompts_llm_async(["a", "b", "c"], llm=llm, batch_size=3))
+    assert [ast.role for ast in asts] == ["batched 0", "batched 1", "single"]
+    assert len(llm.prompts) == 2
+
+
+class StreamingDummyLLM:
+    """Streams `response` in small chunks and records how much was consumed."""
+
+    def __init__(self, response: str, chunk_size: int = 7):
+        self.chunks = [response[i : i + chunk_size] for i in range(0, len(response), chunk_size)]
+        self.consumed = 0
+        self.closed = False
+
+    def stream(self, prompt: str):
+        try:
+            for chunk in self.chunks:
+                self.consumed += 1
+                yield chunk
+        finally:
+            self.closed = True
+
+
+def test_parse_prompt_llm_stream_stops_after_the_object_closes():
+    from prompt_ast.parse.llm import parse_prompt_llm_stream
+
+    body = _llm_json({"role": "streamed"})
+    llm = StreamingDummyLLM("Here is the AST:\n" + body + "\nLet me explain each field. " * 20)
+    fields: list[tuple[str, object]] = []
+    ast = parse_prompt_llm_stream(" Input text ", llm=llm, on_field=lambda k, v: fields.append((k, v)))
+
+    assert ast.role == "streamed"
+    assert ast.raw == "Input text"
+    assert llm.closed
+    assert llm.consumed < len(llm.chunks) // 2
+    assert fields[:2] == [("version", "0.1"), ("raw", "ignored")]
+    assert ("role", "streamed") in fields
+    assert fields[-1] == ("metadata", {"confidence": 0.7, "extracted_by": "llm"})
+
+
+def test_parse_prompt_llm_stream_reports_incomplete_or_invalid_output():
+    from prompt_ast.parse.llm import parse_prompt_llm_stream
+
+    with pytest.raises(ParseError):
+        parse_prompt_llm_stream("Input", llm=StreamingDummyLLM(_llm_json()[:-10]))
+    with pytest.raises(ParseError):
+        parse_prompt_llm_stream("Input", llm=StreamingDummyLLM('{"role": nope}'))
+    bad = _llm_json({"constraints": "not-a-list"})
+    with pytest.raises(ParseError):
+        parse_prompt_llm_stream("Input", llm=StreamingDummyLLM(bad))
+
+
+def test_parse_prompt_llm_stream_async_closes_stream_early():
+    import asyncio
+
+    from prompt_ast.parse.llm import parse_prompt_llm_stream_async
+
+    class AsyncStreamingDummyLLM(StreamingDummyLLM):
+        async def stream(self, prompt: str):
+            try:
+                for chunk in self.chunks:
+                    self.consumed += 1
+                    yield chunk
+            finally:
+                self.closed = True
+
+    llm = AsyncStreamingDummyLLM(_llm_json({"task": "async"}) + " trailing" * 50)
+    tasks: list[object] = []
+    ast = asyncio.run(
+        parse_prompt_llm_stream_async(
+            "Input", llm=llm, on_field=lambda k, v: tasks.append(v) if k == "task" else None
+        )
+    )
+    assert ast.task == "async"
+    assert tasks == ["async"]
+    assert llm.closed and llm.consumed < len(llm.chunks)
+
+
+def test_incremental_json_object_handles_strings_and_nesting():
+    from prompt_ast.parse.incremental import IncrementalJSONObject
+
+    text = 'x {"a": "b \\" } {", "c": [1, {"d": "}"}], "e": null} {"ignored": 1}'
+    fields: dict[str, object] = {}
+    parser = IncrementalJSONObject(fields.__setitem__)
+    done = [parser.feed(ch) for ch in text]
+
+    assert done.index(True) == text.rindex("} {")
+    assert parser.value() == {"a": 'b " } {', "c": [1, {"d": "}"}], "e": None}
+    assert fields == parser.value()
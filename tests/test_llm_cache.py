@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+
+from prompt_ast.llm.cache import (
+    AsyncCachedLLMClient,
+    CachedLLMClient,
+    MemoryCache,
+    SQLiteCache,
+)
+from prompt_ast.parse.hybrid import parse_prompt_hybrid
+from prompt_ast.parse.llm import parse_prompt_llm
+
+
+def _llm_json() -> str:
+    return json.dumps(
+        {
+            "version": "0.1",
+            "raw": "ignored",
+            "role": "tester",
+            "task": "Do a thing",
+            "metadata": {"confidence": 0.7, "extracted_by": "llm"},
+        }
+    )
+
+
+class CountingLLM:
+    model = "stub-model"
+    temperature = 0.0
+
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, prompt: str) -> str:
+        self.calls += 1
+        return _llm_json()
+
+
+def test_cached_client_skips_repeated_llm_calls():
+    llm = CountingLLM()
+    cached = CachedLLMClient(llm)
+
+    first = parse_prompt_llm("Summarize this.", llm=cached)
+    second = parse_prompt_llm("Summarize this.", llm=cached)
+    parse_prompt_hybrid("Summarize this.", llm=cached)
+    parse_prompt_hybrid("Summarize this.", llm=cached)
+
+    assert first == second
+    assert llm.calls == 2
+    assert cached.stats() == {"hits": 2, "misses": 2, "hit_rate": 0.5}
+
+
+def test_cached_client_counts_every_lookup_across_threads():
+    from concurrent.futures import ThreadPoolExecutor
+
+    cached = CachedLLMClient(CountingLLM())
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(cached.complete, [f"p{i % 50}" for i in range(4000)]))
+    stats = cached.stats()
+    assert stats["hits"] + stats["misses"] == 4000
+
+
+def test_cache_key_covers_model_and_temperature():
+    llm = CountingLLM()
+    a = CachedLLMClient(llm, model="m1")
+    b = CachedLLMClient(llm, model="m2")
+    c = CachedLLMClient(llm, model="m1", temperature=0.7)
+    assert len({a.cache_key("p"), b.cache_key("p"), c.cache_key("p")}) == 3
+    assert a.cache_key("p") == CachedLLMClient(llm, model="m1").cache_key("p")
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert len(cache) == 2
+
+
+def test_memory_cache_expires_entries(monkeypatch):
+    import prompt_ast.llm.cache as cache_mod
+
+    now = [100.0]
+    monkeypatch.setattr(cache_mod.time, "monotonic", lambda: now[0])
+    cache = MemoryCache(ttl=10)
+    cache.set("a", "1")
+    now[0] += 5
+    assert cache.get("a") == "1"
+    now[0] += 6
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    path = tmp_path / "llm.sqlite"
+    llm = CountingLLM()
+
+    first = SQLiteCache(path)
+    CachedLLMClient(llm, cache=first).complete("prompt")
+    first.close()
+
+    second = SQLiteCache(path)
+    cached = CachedLLMClient(llm, cache=second)
+    assert cached.complete("prompt") == _llm_json()
+    assert llm.calls == 1
+    assert cached.hits == 1
+    second.close()
+
+
+def test_sqlite_cache_expires_entries(tmp_path, monkeypatch):
+    import prompt_ast.llm.cache as cache_mod
+
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now[0])
+    cache = SQLiteCache(tmp_path / "llm.sqlite", ttl=10)
+    cache.set("a", "1")
+    now[0] += 11
+    assert cache.get("a") is None
+    cache.close()
+
+
+def test_async_cached_client():
+    class AsyncCountingLLM(CountingLLM):
+        async def complete(self, prompt: str) -> str:
+            return super().complete(prompt)
+
+    llm = AsyncCountingLLM()
+    cached = AsyncCachedLLMClient(llm)
+
+    async def run() -> list[str]:
+        return [await cached.complete("p") for _ in range(3)]
+
+    assert asyncio.run(run()) == [_llm_json()] * 3
+    assert llm.calls == 1
+
+
+def test_memory_cache_rejects_invalid_size():
+    with pytest.raises(ValueError):
+        MemoryCache(max_entries=0)
+
+
+class FlakyLLM(CountingLLM):
+    """First reply is an overload message, every later one valid JSON."""
+
+    def complete(self, prompt: str) -> str:
+        self.calls += 1
+        return "sorry, overloaded" if self.calls == 1 else _llm_json()
+
+
+def test_invalid_reply_is_not_cached():
+    from prompt_ast.errors import ParseError
+
+    llm = FlakyLLM()
+    cached = CachedLLMClient(llm)
+    with pytest.raises(ParseError):
+        parse_prompt_llm("Summarize this.", llm=cached)
+    assert parse_prompt_llm("Summarize this.", llm=cached).role == "tester"
+    assert parse_prompt_llm("Summarize this.", llm=cached).role == "tester"
+    assert llm.calls == 2
+    assert cached.stats()["hits"] == 1
+
+
+def test_invalid_reply_is_not_persisted(tmp_path):
+    cache = SQLiteCache(tmp_path / "llm.sqlite")
+    llm = FlakyLLM()
+    cached = CachedLLMClient(llm, cache=cache)
+    assert cached.complete("prompt") == "sorry, overloaded"
+    assert cache.get(cached.cache_key("prompt")) is None
+    assert cached.complete("prompt") == _llm_json()
+    assert cache.get(cached.cache_key("prompt")) == _llm_json()
+    cache.close()
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import pytest
+
+from prompt_ast import parse_prompt_file
+from prompt_ast.parse.heuristic import parse_prompt_heuristic
+from prompt_ast.parse.mapped import iter_mapped_text
+
+from .fixtures import FIXTURES
+
+
+@pytest.mark.parametrize("fixture", FIXTURES[:5], ids=lambda f: f["description"])
+def test_parse_prompt_file_matches_heuristic(tmp_path, fixture):
+    path = tmp_path / "prompt.txt"
+    path.write_text(fixture["prompt"], encoding="utf-8")
+    expected = parse_prompt_heuristic(path.read_text(encoding="utf-8").strip())
+
+    assert parse_prompt_file(path, keep_raw=True) == expected
+    assert parse_prompt_file(path).raw == ""
+
+
+def test_iter_mapped_text_decodes_across_chunk_boundaries(tmp_path):
+    text = "Größe: ünïcödé ✓ — 🚀\n" * 50
+    path = tmp_path / "prompt.txt"
+    path.write_bytes(text.encode("utf-8"))
+
+    chunks = list(iter_mapped_text(path, chunk_bytes=3))
+    assert "".join(chunks) == text
+
+
+def test_iter_mapped_text_translates_newlines(tmp_path):
+    path = tmp_path / "prompt.txt"
+    path.write_bytes(b"Context: a\r\nTask: b\rOutput: c\r")
+
+    assert "".join(iter_mapped_text(path, chunk_bytes=4)) == path.read_text()
+
+
+def test_iter_mapped_text_empty_file(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_bytes(b"")
+
+    assert list(iter_mapped_text(path)) == []
+    assert parse_prompt_file(path) == parse_prompt_heuristic("")
@@ -21,8 +21,9 @@ class _FakeResponse:
 class _FakeHttpxClient:
     last_instance = None
 
-    def __init__(self, timeout: float | None = None):
+    def __init__(self, timeout: float | None = None, **kwargs):
         self.timeout = timeout
+        self.kwargs = kwargs
         self.post_args: tuple | None = None
         self.response = _FakeResponse(
             {"choices": [{"message": {"content": "ok"}}]}
@@ -76,3 +77,81 @@ def test_openai_client_complete_makes_request(monkeypatch):
     assert payload["messages"][0]["role"] == "system"
     assert payload["messages"][1]["content"] == "Hello"
     assert fake_client.response.raise_called is True
+
+
+class _FakeAsyncHttpxClient:
+    instances: list["_FakeAsyncHttpxClient"] = []
+
+    def __init__(self, timeout: float | None = None, limits=None):
+        self.timeout = timeout
+        self.limits = limits
+        self.in_flight = 0
+        self.peak = 0
+        self.closed = False
+        _FakeAsyncHttpxClient.instances.append(self)
+
+    async def post(self, url: str, headers: dict | None = None, json: dict | None = None):
+        import asyncio
+
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return _FakeResponse({"choices": [{"message": {"content": json["messages"][1]["content"]}}]})
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def test_async_openai_client_bounds_concurrency_and_reuses_client(monkeypatch):
+    import asyncio
+
+    import prompt_ast.llm.openai_compat as oc
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(oc.httpx, "AsyncClient", _FakeAsyncHttpxClient)
+    _FakeAsyncHttpxClient.instances = []
+
+    async def run() -> list[str]:
+        async with oc.AsyncOpenAICompatClient(max_concurrency=3) as client:
+            return await asyncio.gather(*(client.complete(f"p{i}") for i in range(10)))
+
+    results = asyncio.run(run())
+
+    assert results == [f"p{i}" for i in range(10)]
+    assert len(_FakeAsyncHttpxClient.instances) == 1
+    fake = _FakeAsyncHttpxClient.instances[0]
+    assert fake.peak == 3
+    assert fake.closed is True
+
+
+def test_openai_client_reuses_one_connection_across_calls(chat_server):
+    server = chat_server()
+    with OpenAICompatClient(base_url=server.base_url) as client:
+        results = [client.complete(f"p{i}") for i in range(5)]
+
+    assert results == ["ok"] * 5
+    assert server.connections == 1
+
+
+def test_openai_client_http2_without_h2_explains_extra(monkeypatch):
+    import prompt_ast.llm.openai_compat as oc
+
+    def _no_h2(**kwargs):
+        raise ImportError("h2 missing")
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(oc.httpx, "Client", _no_h2)
+    with pytest.raises(ImportError) as excinfo:
+        OpenAICompatClient(http2=True)
+    assert "prompt-ast[http2]" in str(excinfo.value)
+
+
+def test_openai_client_stream_reads_server_sent_events(chat_server):
+    server = chat_server(chunks=['{"a"', ": 1}"])
+    with OpenAICompatClient(base_url=server.base_url) as client:
+        chunks = list(client.stream("Hello"))
+
+    assert chunks == ['{"a"', ": 1}"]
+    assert server.requests[0]["stream"] is True
+    assert server.requests[0]["messages"][1]["content"] == "Hello"
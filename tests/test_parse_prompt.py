@@ -60,3 +60,55 @@ def test_parse_prompt_unknown_mode_raises_value_error():
     llm = DummyLLM(_llm_json())
     with pytest.raises(ValueError):
         parse_prompt("Hello", mode="unknown", llm=llm)
+
+
+class AsyncDummyLLM(DummyLLM):
+    async def complete(self, prompt: str) -> str:
+        return super().complete(prompt)
+
+
+def test_parse_prompt_async_modes():
+    import asyncio
+
+    from prompt_ast import parse_prompt_async
+
+    ast = asyncio.run(parse_prompt_async("Act as a tester.", mode="heuristic"))
+    assert ast.metadata.get("extracted_by") == "heuristic"
+
+    llm = AsyncDummyLLM(_llm_json({"role": "from-llm"}))
+    ast = asyncio.run(parse_prompt_async("Hello", mode="llm", llm=llm))
+    assert ast.role == "from-llm"
+
+    with pytest.raises(LLMNotConfiguredError):
+        asyncio.run(parse_prompt_async("Hello", mode="hybrid"))
+    with pytest.raises(ValueError):
+        asyncio.run(parse_prompt_async("Hello", mode="unknown", llm=llm))
+
+
+def test_parse_prompt_heuristic_cache_returns_isolated_copies():
+    from prompt_ast import HeuristicParseCache
+
+    cache = HeuristicParseCache(maxsize=8)
+    first = parse_prompt("Act as a tester. Be concise.", mode="heuristic", cache=cache)
+    first.constraints.append("mutated")
+    first.output_spec.structure.append("mutated")
+
+    second = parse_prompt("  Act as a tester. Be concise.\n", mode="heuristic", cache=cache)
+    assert "mutated" not in second.constraints
+    assert second.output_spec.structure == []
+    assert second == parse_prompt("Act as a tester. Be concise.", mode="heuristic")
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 1}
+
+
+def test_heuristic_cache_is_bounded():
+    from prompt_ast import HeuristicParseCache
+
+    cache = HeuristicParseCache(maxsize=2)
+    for text in ("one", "two", "one", "three"):
+        cache.parse(text)
+    assert len(cache) == 2
+    cache.parse("two")
+    assert cache.stats()["misses"] == 4
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.stats()["hit_rate"] == 0.0
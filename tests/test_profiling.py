@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+from prompt_ast import parse_prompt
+from prompt_ast.parse import heuristic
+from prompt_ast.profiling import StageTimings, profile_stages
+
+SECTIONED = "Act as a reviewer.\nContext: Internal API.\nTask: Review the auth flow.\nConstraints:\n- Be concise"
+
+
+class DummyLLM:
+    def complete(self, prompt: str) -> str:
+        return json.dumps({"version": "0.1", "raw": "x", "task": "Do a thing"})
+
+
+def test_profile_records_heuristic_stages_and_restores_functions():
+    original = heuristic._infer_role
+    with profile_stages() as profile:
+        assert heuristic._infer_role is not original
+        for _ in range(3):
+            parse_prompt(SECTIONED, mode="heuristic")
+    assert heuristic._infer_role is original
+
+    summary = profile.summary()
+    for stage in ("role", "sections", "format", "constraints", "structure", "ambiguities"):
+        assert summary[f"heuristic.{stage}"]["calls"] == 3
+    # Explicit Task: section, so no task inference ran
+    assert "heuristic.task" not in summary
+    total = summary["heuristic"]
+    assert total["calls"] == 3
+    assert total["min_us"] <= total["p50_us"] <= total["max_us"]
+    assert sum(count for _, count in total["histogram"]) == 3
+    assert "heuristic.role" in profile.format_table()
+
+    parse_prompt(SECTIONED, mode="heuristic")
+    assert profile.summary()["heuristic"]["calls"] == 3
+
+
+def test_profile_times_llm_round_trips_sync_and_async():
+    class AsyncDummyLLM:
+        async def complete(self, prompt: str) -> str:
+            return DummyLLM().complete(prompt)
+
+    samples: list[str] = []
+    with profile_stages(hook=lambda stage, seconds: samples.append(stage)) as profile:
+        parse_prompt("Tell me about databases", mode="hybrid", llm=DummyLLM())
+        parse_prompt("Tell me about databases", mode="llm", llm=DummyLLM())
+        from prompt_ast import parse_prompt_async
+
+        asyncio.run(parse_prompt_async("Hi", mode="hybrid", llm=AsyncDummyLLM()))
+
+    summary = profile.summary()
+    assert summary["llm.complete"]["calls"] == 3
+    assert summary["hybrid"]["calls"] == 2
+    assert summary["llm"]["calls"] == 1
+    assert summary["heuristic"]["calls"] == 2
+    assert samples.count("llm.complete") == 3
+
+
+def test_nested_profiles_share_samples_across_threads():
+    with profile_stages() as outer:
+        with profile_stages() as inner:
+            thread = threading.Thread(target=parse_prompt, args=(SECTIONED, "heuristic"))
+            thread.start()
+            thread.join()
+        parse_prompt(SECTIONED, mode="heuristic")
+    assert inner.summary()["heuristic"]["calls"] == 1
+    assert outer.summary()["heuristic"]["calls"] == 2
+
+
+def test_stage_timings_percentiles_come_from_buckets():
+    timings = StageTimings()
+    for seconds in [0.000004] * 90 + [0.0003] * 10:
+        timings.add(seconds)
+    summary = timings.summary()
+    assert summary["p50_us"] == 5.0
+    assert summary["p99_us"] == 300.0
+    assert summary["histogram"] == [[5.0, 90], [500.0, 10]]
+
+
+def test_no_wrapper_survives_in_cached_or_imported_aliases():
+    import importlib
+    import sys
+
+    import prompt_ast
+    import prompt_ast.parse
+
+    # Drop lazily cached attributes so they are first resolved inside the block
+    for package, name in (
+        (prompt_ast.parse, "parse_prompt_heuristic_lite"),
+        (prompt_ast, "parse_prompt_llm"),
+    ):
+        vars(package).pop(name, None)
+    saved_stream = sys.modules.pop("prompt_ast.parse.stream", None)
+    try:
+        with profile_stages():
+            assert hasattr(prompt_ast.parse.parse_prompt_heuristic_lite, "__wrapped__")
+            assert hasattr(prompt_ast.parse_prompt_llm, "__wrapped__")
+            stream = importlib.import_module("prompt_ast.parse.stream")
+            assert hasattr(stream._infer_output_format, "__wrapped__")
+        assert not hasattr(prompt_ast.parse.parse_prompt_heuristic_lite, "__wrapped__")
+        assert not hasattr(prompt_ast.parse_prompt_llm, "__wrapped__")
+        assert stream._infer_output_format is heuristic._infer_output_format
+    finally:
+        if saved_stream is not None:
+            sys.modules["prompt_ast.parse.stream"] = saved_stream
+            prompt_ast.parse.stream = saved_stream
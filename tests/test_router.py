@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+from prompt_ast.errors import NoBackendAvailableError, ParseError
+from prompt_ast.llm.openai_compat import OpenAICompatClient
+from prompt_ast.llm.router import (
+    HEDGE_MIN_SAMPLES,
+    AsyncLLMRouter,
+    Backend,
+    CircuitBreaker,
+    LLMRouter,
+    json_reply,
+)
+from prompt_ast.parse.llm import parse_prompt_llm
+
+AST_REPLY = json.dumps({"role": "tester", "task": "Do a thing", "constraints": []})
+
+
+class StubLLM:
+    def __init__(self, reply: str = AST_REPLY, error: Exception | None = None):
+        self.reply = reply
+        self.error = error
+        self.calls = 0
+
+    def complete(self, prompt: str) -> str:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return self.reply
+
+
+def test_router_hedges_slow_backend_against_stand_in_servers(chat_server):
+    slow, fast = chat_server(AST_REPLY, held=True), chat_server(AST_REPLY)
+    with LLMRouter(
+        [OpenAICompatClient(base_url=slow.base_url), OpenAICompatClient(base_url=fast.base_url)],
+        initial_hedge_delay=0.05,
+    ) as router:
+        ast = parse_prompt_llm("Act as a tester.", llm=router)  # slow never answers
+        stats = router.stats()
+
+    assert ast.role == "tester"
+    assert len(slow.requests) == len(fast.requests) == 1
+    assert stats["hedged"] == stats["hedge_wins"] == 1
+    assert [b["wins"] for b in stats["backends"]] == [0, 1]
+    assert stats["backends"][1]["name"] == f"{fast.base_url} gpt-4o-mini"
+
+
+def test_router_does_not_hedge_a_fast_primary(chat_server):
+    first, second = chat_server(AST_REPLY), chat_server(AST_REPLY)
+    with LLMRouter(
+        [OpenAICompatClient(base_url=first.base_url), OpenAICompatClient(base_url=second.base_url)],
+        initial_hedge_delay=5.0,
+    ) as router:
+        router.complete("hello")
+    assert len(first.requests) == 1
+    assert second.requests == []
+    assert router.stats()["hedged"] == 0
+
+
+def test_router_circuit_opens_on_failing_server_and_recovers(chat_server):
+    now = [0.0]
+    broken = chat_server(AST_REPLY, failures=[(500, {})] * 2)
+    healthy = chat_server(AST_REPLY)
+    with LLMRouter(
+        [OpenAICompatClient(base_url=broken.base_url), OpenAICompatClient(base_url=healthy.base_url)],
+        hedge=False,
+        failure_threshold=2,
+        reset_timeout=10.0,
+        clock=lambda: now[0],
+    ) as router:
+        for _ in range(6):
+            assert json_reply(router.complete("hello"))
+        # Two failures (failed over to the healthy backend) opened the circuit
+        assert len(broken.requests) == 2
+        assert router.stats()["failovers"] == 2
+        assert router.stats()["backends"][0]["state"] == "open"
+
+        now[0] = 10.0  # half open: one trial request, which closes the circuit
+        for _ in range(4):
+            router.complete("hello")
+        assert router.stats()["backends"][0]["state"] == "closed"
+        assert len(broken.requests) == 4
+
+
+def test_router_weighted_round_robin_is_smooth():
+    a, b = StubLLM(), StubLLM()
+    router = LLMRouter([Backend(a, weight=3, name="a"), Backend(b, weight=1, name="b")], hedge=False)
+    picks = []
+    for _ in range(8):
+        router.complete("hello")
+        picks.append("a" if a.calls > picks.count("a") else "b")
+    router.close()
+    assert picks == ["a", "a", "b", "a"] * 2
+
+
+def test_router_fails_over_on_errors_and_invalid_replies():
+    broken = StubLLM(error=httpx.ConnectError("refused"))
+    chatty = StubLLM(reply="Sure! Here is no JSON at all.")
+    good = StubLLM()
+    router = LLMRouter([broken, chatty, good], hedge=False)
+    assert router.complete("hello") == AST_REPLY
+    router.close()
+    assert (broken.calls, chatty.calls, good.calls) == (1, 1, 1)
+    assert [b["failures"] for b in router.stats()["backends"]] == [1, 1, 0]
+
+
+def test_router_raises_last_error_when_every_backend_fails():
+    router = LLMRouter([StubLLM(reply="nope"), StubLLM(reply="still nope")], hedge=False)
+    with pytest.raises(ParseError):
+        router.complete("hello")
+    router.close()
+
+
+def test_router_raises_when_every_circuit_is_open():
+    router = LLMRouter(
+        [StubLLM(error=RuntimeError("down"))], hedge=False, failure_threshold=1
+    )
+    with pytest.raises(RuntimeError):
+        router.complete("hello")
+    with pytest.raises(NoBackendAvailableError):
+        router.complete("hello")
+    router.close()
+
+
+def test_hedge_delay_follows_recent_p95():
+    router = LLMRouter([StubLLM(), StubLLM()], initial_hedge_delay=2.0)
+    backend = router.backends[0]
+    assert router.hedge_delay(backend) == 2.0
+    backend.latencies.extend(i / 100 for i in range(1, HEDGE_MIN_SAMPLES * 5 + 1))
+    assert router.hedge_delay(backend) == pytest.approx(0.96)
+    router.close()
+
+
+def test_circuit_breaker_allows_a_single_half_open_trial():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=lambda: now[0])
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.available()
+    now[0] = 5.0
+    assert breaker.state == "half_open"
+    assert breaker.acquire()
+    assert not breaker.acquire()  # the trial is taken
+    breaker.record_failure()
+    assert breaker.state == "open"
+    now[0] = 10.0
+    assert breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == "closed"
+
+
+def test_router_keeps_a_caller_provided_breaker():
+    breaker = CircuitBreaker(failure_threshold=9)
+    router = LLMRouter([Backend(StubLLM(), breaker=breaker), StubLLM()], failure_threshold=2)
+    assert router.backends[0].breaker is breaker
+    assert router.backends[1].breaker.failure_threshold == 2
+    router.close()
+
+
+def test_router_hedge_clock_starts_when_the_call_does():
+    gate, hedged = threading.Event(), threading.Event()
+
+    class WatchedBreaker(CircuitBreaker):
+        def acquire(self):
+            hedged.set()
+            return super().acquire()
+
+    router = LLMRouter(
+        [Backend(StubLLM(), weight=2), Backend(StubLLM(), breaker=WatchedBreaker())],
+        initial_hedge_delay=0.0,
+        max_workers=1,
+    )
+    router._pool.submit(gate.wait)  # the only worker is busy: the primary call queues
+    caller = threading.Thread(target=router.complete, args=("hello",))
+    caller.start()
+    assert not hedged.wait(0.2)  # no hedge while the primary has not started
+    gate.set()
+    caller.join()
+    router.close()
+
+
+def test_async_cancellation_keeps_a_trial_it_does_not_own():
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=5.0, clock=lambda: now[0])
+
+    class Hanging:
+        def __init__(self):
+            self.entered = asyncio.Event()
+
+        async def complete(self, prompt: str) -> str:
+            self.entered.set()
+            await asyncio.Event().wait()
+            return AST_REPLY
+
+    async def main() -> None:
+        llm = Hanging()
+        router = AsyncLLMRouter([Backend(llm, breaker=breaker)], hedge=False)
+        request = asyncio.ensure_future(router.complete("hello"))  # sent while closed
+        await llm.entered.wait()
+        breaker.record_failure()
+        now[0] = 5.0
+        assert breaker.acquire() == "half_open"  # another request owns the trial
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+
+    asyncio.run(main())
+    assert not breaker.available()
+
+
+def test_async_router_hedges_and_cancels_the_loser():
+    class AsyncStub:
+        def __init__(self, answers: bool):
+            self.answers = answers
+            self.cancelled = False
+
+        async def complete(self, prompt: str) -> str:
+            try:
+                if not self.answers:
+                    await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                self.cancelled = True
+                raise
+            return AST_REPLY
+
+    slow, fast = AsyncStub(answers=False), AsyncStub(answers=True)
+
+    async def main() -> str:
+        router = AsyncLLMRouter([slow, fast], initial_hedge_delay=0.05)
+        reply = await router.complete("hello")
+        await asyncio.sleep(0)  # let the cancellation land
+        assert router.stats()["hedge_wins"] == 1
+        return reply
+
+    assert asyncio.run(main()) == AST_REPLY
+    assert slow.cancelled
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from prompt_ast.llm.openai_compat import OpenAICompatClient
+from prompt_ast.llm.scheduler import (
+    AsyncScheduledLLMClient,
+    ScheduledLLMClient,
+    TokenBucket,
+    retry_after_seconds,
+)
+
+
+def test_scheduler_retries_throttled_requests_against_fake_server(chat_server):
+    failures = [(429, {"Retry-After": "2"}), (503, {}), (502, {})]
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(delay: float) -> None:
+        sleeps.append(delay)
+        now[0] += delay
+
+    server = chat_server(failures=failures)
+    with OpenAICompatClient(base_url=server.base_url) as llm:
+        client = ScheduledLLMClient(
+            llm, base_delay=0.25, jitter=False, clock=lambda: now[0], sleep=sleep
+        )
+        assert client.complete("hello") == "ok"
+
+    assert len(server.requests) == 4
+    # Retry-After wins over the backoff; 503 and 502 back off exponentially
+    assert sleeps == [2.0, 0.5, 1.0]
+    stats = client.stats()
+    assert stats["retries"] == 3
+    assert stats["throttled"] == 2
+    assert stats["requests"] == 4
+    assert stats["failures"] == 0
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+
+
+def test_scheduler_gives_up_after_max_retries(chat_server):
+    server = chat_server(failures=[(429, {})] * 3)
+    with OpenAICompatClient(base_url=server.base_url) as llm:
+        client = ScheduledLLMClient(llm, max_retries=2, sleep=lambda _: None)
+        with pytest.raises(httpx.HTTPStatusError):
+            client.complete("hello")
+    assert len(server.requests) == 3
+    assert client.stats()["failures"] == 1
+
+
+def test_scheduler_does_not_retry_client_errors(chat_server):
+    server = chat_server(failures=[(400, {})])
+    with OpenAICompatClient(base_url=server.base_url) as llm:
+        client = ScheduledLLMClient(llm, sleep=lambda _: None)
+        with pytest.raises(httpx.HTTPStatusError):
+            client.complete("hello")
+    assert len(server.requests) == 1
+    assert client.stats()["retries"] == 0
+
+
+def test_token_bucket_delays_reservations_past_capacity():
+    now = [0.0]
+    bucket = TokenBucket(60, capacity=2, clock=lambda: now[0])
+    assert [bucket.reserve() for _ in range(4)] == [0.0, 0.0, 1.0, 2.0]
+    now[0] = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_scheduler_paces_requests_and_tokens_per_minute():
+    class EchoLLM:
+        def complete(self, prompt: str) -> str:
+            return prompt
+
+    now = [0.0]
+    sleeps: list[float] = []
+    client = ScheduledLLMClient(
+        EchoLLM(),
+        requests_per_minute=120,
+        tokens_per_minute=600,
+        clock=lambda: now[0],
+        sleep=sleeps.append,
+    )
+    client.request_bucket = TokenBucket(120, capacity=1, clock=lambda: now[0])
+    client.complete("a")
+    client.complete("b")
+    assert sleeps == [0.5]
+    # A 3000-character word ~ 500 tokens; the token bucket (600/min) now has ~98 left
+    client.complete("x" * 3000)
+    client.complete("x" * 3000)
+    assert sleeps[-1] == pytest.approx(40.2, abs=0.1)
+    assert client.stats()["wait_seconds"] == pytest.approx(sum(sleeps))
+
+
+def test_retry_after_accepts_http_dates():
+    class Response:
+        headers = {"retry-after": format_datetime(datetime(2030, 1, 1, tzinfo=timezone.utc), usegmt=True)}
+
+    now = (datetime(2030, 1, 1, tzinfo=timezone.utc) - timedelta(seconds=5)).timestamp()
+    assert retry_after_seconds(Response(), now=now) == 5.0
+    Response.headers = {"retry-after": "soon"}
+    assert retry_after_seconds(Response()) is None
+
+
+def test_async_scheduler_retries_transport_errors():
+    class FlakyLLM:
+        def __init__(self):
+            self.calls = 0
+
+        async def complete(self, prompt: str) -> str:
+            self.calls += 1
+            if self.calls < 3:
+                raise httpx.ConnectError("refused")
+            return prompt
+
+    sleeps: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        sleeps.append(delay)
+
+    llm = FlakyLLM()
+    client = AsyncScheduledLLMClient(llm, base_delay=1.0, jitter=False, sleep=sleep)
+    assert asyncio.run(client.complete("hi")) == "hi"
+    assert sleeps == [1.0, 2.0]
+    assert client.stats()["retries"] == 2
+    assert client.stats()["throttled"] == 0
+
+
+def test_throttle_pauses_other_callers_and_reports_queue_depth():
+    request = httpx.Request("POST", "http://test/v1/chat/completions")
+    response = httpx.Response(429, headers={"Retry-After": "3"}, request=request)
+    throttled = httpx.HTTPStatusError("throttled", request=request, response=response)
+
+    class ThrottledOnceLLM:
+        def __init__(self):
+            self.calls = 0
+
+        def complete(self, prompt: str) -> str:
+            self.calls += 1
+            if self.calls == 1:
+                raise throttled
+            return prompt
+
+    now = [0.0]
+    depths: list[float] = []
+
+    def sleep(delay: float) -> None:
+        depths.append(client.stats()["queue_depth"])
+        now[0] += delay
+
+    client = ScheduledLLMClient(ThrottledOnceLLM(), clock=lambda: now[0], sleep=sleep)
+    assert client.complete("a") == "a"
+    assert depths == [1]
+    assert now[0] == 3.0
+
+    # A 429 seen by one caller delays admission of every other caller
+    assert client.retry_delay(throttled, 0) == 3.0
+    assert client.admission_delay("b") == 3.0
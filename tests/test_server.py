@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.client import HTTPConnection
+
+import pytest
+
+from prompt_ast.server import ParseService, create_server
+
+
+def _llm_json(role: str) -> str:
+    return json.dumps(
+        {
+            "version": "0.1",
+            "raw": "ignored",
+            "role": role,
+            "task": "Do a thing",
+            "metadata": {"confidence": 0.7, "extracted_by": "llm"},
+        }
+    )
+
+
+class DummyLLM:
+    def __init__(self):
+        self.prompts: list[str] = []
+
+    def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        return _llm_json("from llm")
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def start(service: ParseService | None = None, **kwargs) -> HTTPConnection:
+        server = create_server("127.0.0.1", 0, service=service, **kwargs)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return HTTPConnection("127.0.0.1", server.server_address[1], timeout=5)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(conn: HTTPConnection, method: str, path: str, body=None) -> tuple[int, dict]:
+    payload = json.dumps(body).encode() if body is not None else None
+    conn.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+    response = conn.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def test_parse_and_batch_over_one_keepalive_connection(serve):
+    conn = serve(workers=2)
+
+    status, ast = _request(conn, "POST", "/parse", {"prompt": "Act as a tester. Use JSON."})
+    assert status == 200
+    assert ast["role"] == "tester"
+    assert ast["output_spec"]["format"] == "json"
+
+    status, body = _request(conn, "POST", "/parse/batch", {"prompts": ["Be concise.", "Use YAML."]})
+    assert status == 200
+    assert [r["raw"] for r in body["results"]] == ["Be concise.", "Use YAML."]
+
+    status, health = _request(conn, "GET", "/healthz")
+    assert (status, health) == (200, {"status": "ok"})
+
+    status, metrics = _request(conn, "GET", "/metrics")
+    assert status == 200
+    assert metrics["requests"] == {"/parse": 1, "/parse/batch": 1, "/healthz": 1, "/metrics": 1}
+    assert metrics["errors"] == 0
+    assert metrics["latency_ms"]["count"] == 3
+    assert metrics["cache"]["misses"] == 3
+
+
+def test_errors_are_reported_as_json(serve):
+    conn = serve(max_body_bytes=64)
+
+    assert _request(conn, "GET", "/nope")[0] == 404
+    assert _request(conn, "POST", "/parse", {"text": "x"})[0] == 400
+    assert _request(conn, "POST", "/parse/batch", {"prompts": [1]})[0] == 400
+    status, body = _request(conn, "POST", "/parse", {"prompt": "hi", "mode": "llm"})
+    assert status == 400 and "LLM" in body["error"]
+    status, body = _request(conn, "POST", "/parse", {"prompt": "x" * 100})
+    assert status == 413
+
+    conn.close()
+    status, metrics = _request(conn, "GET", "/metrics")
+    assert metrics["errors"] == 5
+
+
+def test_hybrid_service_uses_threshold_and_batches_llm_mode(serve):
+    llm = DummyLLM()
+    service = ParseService(mode="hybrid", llm=llm, threshold=0.7)
+    conn = serve(service)
+
+    sectioned = "Context: Internal API.\nTask: Review the auth flow.\nConstraints:\n- Be concise"
+    status, ast = _request(conn, "POST", "/parse", {"prompt": sectioned})
+    assert status == 200 and ast["metadata"]["llm_consulted"] is False
+    status, ast = _request(conn, "POST", "/parse", {"prompt": "Tell me about databases"})
+    assert status == 200 and ast["role"] == "from llm"
+    assert len(llm.prompts) == 1
+
+    status, body = _request(conn, "POST", "/parse/batch", {"prompts": ["a"], "mode": "llm"})
+    assert status == 200 and body["results"][0]["role"] == "from llm"
+
+
+def test_service_requires_llm_for_llm_modes():
+    from prompt_ast.errors import LLMNotConfiguredError
+
+    with pytest.raises(LLMNotConfiguredError):
+        ParseService(mode="llm")
+
+
+def test_cli_serve_requires_use_openai_for_llm_modes():
+    from typer.testing import CliRunner
+
+    from prompt_ast.cli import app
+    from prompt_ast.errors import LLMNotConfiguredError
+
+    result = CliRunner().invoke(app, ["serve", "--mode", "hybrid", "--port", "0"])
+    assert result.exit_code == 1
+    assert isinstance(result.exception, LLMNotConfiguredError)
+
+
+def test_idle_keepalive_connections_do_not_block_other_clients(serve):
+    import time
+
+    idle = [serve(workers=2)]
+    port = idle[0].port
+    idle.append(HTTPConnection("127.0.0.1", port, timeout=5))
+    for conn in idle:  # both stay open (keep-alive) after their request
+        assert _request(conn, "POST", "/parse", {"prompt": "Be concise."})[0] == 200
+
+    started = time.perf_counter()
+    status, _ = _request(HTTPConnection("127.0.0.1", port, timeout=5), "GET", "/healthz")
+    assert status == 200
+    assert time.perf_counter() - started < 1.0
+    for conn in idle:
+        conn.close()
+
+
+def test_negative_content_length_is_rejected(serve):
+    conn = serve()
+    conn.putrequest("POST", "/parse")
+    conn.putheader("Content-Length", "-1")
+    conn.endheaders()
+    response = conn.getresponse()
+    assert response.status == 400
+    assert "Content-Length" in json.loads(response.read())["error"]
+
+
+def test_unexpected_errors_return_a_generic_message(serve, caplog):
+    class BrokenService(ParseService):
+        def parse(self, prompt, mode=None):
+            raise RuntimeError("secret internal detail")
+
+    conn = serve(BrokenService())
+    with caplog.at_level("ERROR", logger="prompt_ast.server"):
+        status, body = _request(conn, "POST", "/parse", {"prompt": "hi"})
+    assert (status, body) == (500, {"error": "Internal server error"})
+    assert "secret internal detail" in caplog.text
+
+
+def test_error_status_follows_the_mode_the_request_used(serve, caplog):
+    class BrokenLLM:
+        def complete(self, prompt: str) -> str:
+            raise RuntimeError("gateway down")
+
+    class BrokenHeuristic(ParseService):
+        def parse(self, prompt, mode=None):
+            if self.resolve_mode(mode) == "heuristic":
+                raise RuntimeError("parser bug")
+            return super().parse(prompt, mode)
+
+    conn = serve(BrokenHeuristic(mode="llm", llm=BrokenLLM()))
+    with caplog.at_level("ERROR", logger="prompt_ast.server"):
+        assert _request(conn, "POST", "/parse", {"prompt": "hi"}) == (
+            502,
+            {"error": "LLM request failed"},
+        )
+        assert _request(conn, "POST", "/parse", {"prompt": "hi", "mode": "heuristic"}) == (
+            500,
+            {"error": "Internal server error"},
+        )
+
+
+def test_zero_max_body_bytes_means_no_limit(serve):
+    conn = serve(max_body_bytes=0)
+    status, body = _request(conn, "POST", "/parse", {"prompt": "Be concise. " * 1000})
+    assert status == 200 and body["constraints"] == ["Be concise"]
+    with pytest.raises(ValueError):
+        create_server("127.0.0.1", 0, max_body_bytes=-1, warm=False)
+
+
+def test_cli_serve_rejects_negative_max_size():
+    from typer.testing import CliRunner
+
+    from prompt_ast.cli import app
+
+    result = CliRunner().invoke(app, ["serve", "--max-size", "-1", "--port", "0"])
+    assert result.exit_code == 2
+
+
+def test_workers_limit_concurrent_parses(serve):
+    release = threading.Event()
+    lock = threading.Lock()
+    active, peak = [0], [0]
+
+    class SlowService(ParseService):
+        def parse(self, prompt, mode=None):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            release.wait(5)
+            with lock:
+                active[0] -= 1
+            return super().parse(prompt, mode)
+
+    first = serve(SlowService(), workers=1)
+    second = HTTPConnection("127.0.0.1", first.port, timeout=5)
+    results: list[int] = []
+    threads = [
+        threading.Thread(
+            target=lambda c=c: results.append(_request(c, "POST", "/parse", {"prompt": "hi"})[0])
+        )
+        for c in (first, second)
+    ]
+    for thread in threads:
+        thread.start()
+    # Health checks are not parses and answer while both requests are pending
+    health = HTTPConnection("127.0.0.1", first.port, timeout=5)
+    assert _request(health, "GET", "/healthz")[0] == 200
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert results == [200, 200]
+    assert peak[0] == 1
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from prompt_ast import parse_prompt_stream
+from prompt_ast.parse.heuristic import parse_prompt_heuristic
+
+from .fixtures import FIXTURES
+
+PROMPTS = [f["prompt"] for f in FIXTURES]
+
+
+def _expected(text: str) -> dict:
+    data = parse_prompt_heuristic(text.strip()).to_dict()
+    data["raw"] = ""
+    return data
+
+
+@pytest.mark.parametrize("prompt", PROMPTS)
+def test_stream_matches_heuristic_on_fixture_lines(prompt):
+    lines = prompt.splitlines(keepends=True)
+    assert parse_prompt_stream(lines).to_dict() == _expected(prompt)
+
+
+@pytest.mark.parametrize("prompt", PROMPTS)
+def test_stream_matches_heuristic_on_bare_lines(prompt):
+    ast = parse_prompt_stream(prompt.splitlines(), lines=True)
+    assert ast.to_dict() == _expected(prompt)
+
+
+def test_stream_bare_lines_keep_their_breaks():
+    lines = ["Context: internal API", "Task: review the auth flow", "Constraints:", "- Be concise"]
+    ast = parse_prompt_stream((line for line in lines), lines=True)
+    assert ast.context == "internal API"
+    assert ast.task == "review the auth flow"
+    assert ast.to_dict() == _expected("\n".join(lines))
+
+
+@pytest.mark.parametrize("prompt", PROMPTS)
+def test_stream_matches_heuristic_with_tiny_windows(prompt):
+    chunks = [prompt[i : i + 7] for i in range(0, len(prompt), 7)]
+    ast = parse_prompt_stream(chunks, window_chars=40, overlap_chars=16)
+    assert ast.to_dict() == _expected(prompt)
+
+
+def test_stream_keeps_first_match_across_windows():
+    text = (
+        "You are a travel writer.\n"
+        + "Some filler sentence about nothing.\n" * 200
+        + "Write in 200 words. Set in Lisbon.\n"
+        + "Filler again.\n" * 200
+        + "Write in 50 words. Format it as JSON.\n"
+    )
+    ast = parse_prompt_stream(io.StringIO(text), window_chars=256, overlap_chars=64)
+    assert ast.to_dict() == _expected(text)
+    assert ast.role == "travel writer"
+    assert ast.constraints == ["200 words", "Set in Lisbon"]
+    assert ast.output_spec.format == "json"
+
+
+def test_stream_list_directive_after_window_boundary():
+    text = "Intro sentence.\n" * 50 + "\nList 3 risks of the plan.\n"
+    ast = parse_prompt_stream(io.StringIO(text), window_chars=64, overlap_chars=0)
+    assert "List 3 risks of the plan" in ast.constraints
+
+
+def test_stream_sections_span_windows():
+    text = "Context:\n" + "line of background\n" * 100 + "Task: Summarize it"
+    ast = parse_prompt_stream(io.StringIO(text), window_chars=128)
+    assert ast.task == "Summarize it"
+    assert ast.context is not None and ast.context.count("\n") == 99
+
+
+def test_stream_keep_raw():
+    text = "\n\n  Act as a chef.\nCook dinner.  \n\n"
+    assert parse_prompt_stream([text]).raw == ""
+    assert parse_prompt_stream([text], keep_raw=True).raw == text.strip()
+
+
+def test_stream_empty_input():
+    assert parse_prompt_stream([]).to_dict() == _expected("")
+    assert parse_prompt_stream(["  \n", "\n"]).to_dict() == _expected("")
+
+
+@pytest.mark.parametrize("kwargs", [{"window_chars": 0}, {"overlap_chars": -1}])
+def test_stream_rejects_invalid_settings(kwargs):
+    with pytest.raises(ValueError):
+        parse_prompt_stream(["x"], **kwargs)
@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from prompt_ast.tokens import estimate_tokens
+
+
+def test_estimate_tokens_counts_words_numbers_and_punctuation():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Hello world") == 2
+    assert estimate_tokens("2024") == 2  # digits are grouped by three
+    assert estimate_tokens('{"a":1}') == 5
+
+
+def test_minified_json_estimates_fewer_tokens_than_indented():
+    import json
+
+    data = {"task": "Review the auth flow.", "constraints": ["Be concise", "Use bullets"]}
+    assert estimate_tokens(json.dumps(data, separators=(",", ":"))) < estimate_tokens(
+        json.dumps(data, indent=2)
+    )